@@ -2,3 +2,5 @@
 UPLOAD_DIR = "frontend/static/uploads"
 MAX_DATASETS = 5          # limit per instance
 PREVIEW_ROWS = 10         # default rows for preview
+PLOT_CACHE_MAX_MB = 200   # disk quota for cached plot artifacts (LRU-evicted)
+STORE_DIR = "data"        # server-side caches (profiles, scores); kept out of the served static tree
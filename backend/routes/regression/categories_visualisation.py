@@ -7,7 +7,8 @@ import os
 from backend.utils.regression.categories_visualisation_utils import load_data 
 
 
-from backend.utils.regression.categories_visualisation_utils import generate_comparison_histograms
+from backend.utils.regression.categories_visualisation_utils import rank_and_plot, ranking_table_html
+from backend.utils.regression.group_ranking import RANK_METRICS
 from backend.utils.regression.session_state import get_active_dataset_path, get_active_dataset
 from backend.utils.regression.context import get_sidebar_context
 from backend.utils.regression.outliers import get_numeric_columns_for_outliers
@@ -33,6 +34,7 @@ async def category_visualisation_get(request: Request):
         "request": request,
         "columns": all_columns,
         "numeric_columns": numeric_cols,
+        "rank_metrics": RANK_METRICS,
         "page": "categories",
         **get_sidebar_context(active_file=active_file, step=3),
     })
@@ -41,9 +43,11 @@ async def category_visualisation_get(request: Request):
 async def category_visualisation_post(
     request: Request,
     target_column: str = Form(...),
-    selected_features: List[str] = Form(...),
+    selected_features: List[str] = Form([]),
     lower_percentile: float = Form(25),
-    upper_percentile: float = Form(75)
+    upper_percentile: float = Form(75),
+    top_k: int = Form(6),
+    sort_by: str = Form("effect_size")
 ):
     dataset_path = get_active_dataset_path()
     if not dataset_path or not os.path.exists(dataset_path):
@@ -55,14 +59,24 @@ async def category_visualisation_post(
     active_file = get_active_dataset()
 
     try:
-        plots = generate_comparison_histograms(df, target_column, selected_features, lower_percentile, upper_percentile)
+        ranking, plots = rank_and_plot(df, target_column, selected_features, lower_percentile,
+                                       upper_percentile, top_k, sort_by)
+        scope = "selected" if selected_features else f"top {len(plots)} of {len(ranking)}"
         return templates.TemplateResponse("regression/categories_visualisation.html", {
             "request": request,
             "columns": df.columns.tolist(),
             "numeric_columns": df.select_dtypes(include='number').columns.tolist(),
+            "rank_metrics": RANK_METRICS,
+            "selected_target": target_column,
+            "selected_features": selected_features,
+            "lower_percentile": lower_percentile,
+            "upper_percentile": upper_percentile,
+            "top_k": top_k,
+            "sort_by": sort_by,
+            "ranking_html": ranking_table_html(ranking),
             "plots": plots,
             "page": "categories",
-            "success": f"{len(plots)} plot(s) generated successfully.",
+            "success": f"Ranked {len(ranking)} feature(s); {len(plots)} plot(s) generated ({scope}).",
             **get_sidebar_context(active_file=active_file, step=3),
         })
     except Exception as e:
@@ -72,5 +86,6 @@ async def category_visualisation_post(
             "page": "categories",
             "columns": df.columns.tolist(),
             "numeric_columns": df.select_dtypes(include='number').columns.tolist(),
+            "rank_metrics": RANK_METRICS,
             **get_sidebar_context(active_file=active_file, step=3),
         })
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 import pandas as pd
 import os
 
 from backend.utils.regression.session_state import (
     get_active_dataset,
-    get_active_dataset_path,
+    get_processing_dataset_path,
     set_active_dataset
 )
 from backend.utils.regression.context import get_sidebar_context
@@ -17,6 +17,8 @@ from backend.utils.regression.eda_utils import (
     generate_multivariate_plots,
     visualize_target_distribution,
 )
+from backend.utils.regression.correlation import top_pairs
+from backend.utils.regression.plot_cache import cache_stats
 
 router = APIRouter()
 templates = Jinja2Templates(directory="frontend/templates")
@@ -27,7 +29,7 @@ templates = Jinja2Templates(directory="frontend/templates")
 @router.get("/regression/eda", response_class=HTMLResponse)
 async def eda_dashboard(request: Request):
     active_file = get_active_dataset()
-    full_path = get_active_dataset_path()
+    full_path = get_processing_dataset_path()     # edits from cleaning stages; the upload otherwise
 
     if not active_file or not os.path.exists(full_path):
         return templates.TemplateResponse("regression/eda_dashboard.html", {
@@ -59,7 +61,8 @@ async def eda_dashboard(request: Request):
 @router.post("/regression/eda", response_class=HTMLResponse)
 async def describe_eda(request: Request):
     active_file = get_active_dataset()
-    full_path = get_active_dataset_path()
+    full_path = get_processing_dataset_path()     # edits from cleaning stages; the upload otherwise
+    dataset_name = os.path.basename(full_path or "")
 
     if not active_file or not os.path.exists(full_path):
         return templates.TemplateResponse("regression/eda_dashboard.html", {
@@ -71,10 +74,10 @@ async def describe_eda(request: Request):
 
     df = pd.read_csv(full_path)
     overview = dataset_overview(df)
-    desc_stats, missing_info = describe_data(df)
+    desc_stats, missing_info = describe_data(df, dataset_name)
 
-    univariate_plots = generate_univariate_plots(df, active_file)
-    multivariate_plots = generate_multivariate_plots(df, active_file)
+    univariate_plots = generate_univariate_plots(df, dataset_name)
+    multivariate_plots = generate_multivariate_plots(df, dataset_name)
 
     return templates.TemplateResponse("regression/eda_dashboard.html", {
         "request": request,
@@ -82,6 +85,8 @@ async def describe_eda(request: Request):
         "describe": {
             "summary": desc_stats.to_html(classes='table table-striped', border=0),
             "missing": missing_info.to_html(classes='table table-bordered', border=0),
+            "pairs": top_pairs(df, k=20).to_html(classes='table table-bordered', border=0, index=False,
+                                                 float_format=lambda v: f"{v:.3f}"),
         },
         "univariate": univariate_plots,
         "multivariate": multivariate_plots,
@@ -104,7 +109,8 @@ async def apply_target_filter(
     upper_percentile: str = Form(...),
 ):
     active_file = get_active_dataset()
-    full_path = get_active_dataset_path()
+    full_path = get_processing_dataset_path()     # edits from cleaning stages; the upload otherwise
+    dataset_name = os.path.basename(full_path or "")
 
     if not active_file or not os.path.exists(full_path):
         return templates.TemplateResponse("regression/eda_dashboard.html", {
@@ -119,7 +125,7 @@ async def apply_target_filter(
         upper = float(upper_percentile)
 
         df = pd.read_csv(full_path)
-        plot_path = visualize_target_distribution(df, target_column, lower, upper)
+        plot_path = visualize_target_distribution(df, target_column, lower, upper, dataset_name)
 
         return templates.TemplateResponse("regression/eda_dashboard.html", {
             "request": request,
@@ -143,3 +149,10 @@ async def apply_target_filter(
             "page": "eda",
             **get_sidebar_context(active_file=active_file, step=2),
         })
+
+# ─────────────────────────────────────────────
+# GET: Plot cache metrics
+# ─────────────────────────────────────────────
+@router.get("/regression/eda/cache_stats", response_class=JSONResponse)
+async def plot_cache_stats():
+    return cache_stats()
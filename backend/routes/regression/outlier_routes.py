@@ -2,19 +2,25 @@ from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 import os
+from urllib.parse import quote
 
 from backend.utils.regression.context import get_sidebar_context
 from backend.utils.regression.session_state import get_active_dataset
 from backend.utils.regression.outliers import (
     get_numeric_columns_for_outliers,
     handle_outliers,
-    generate_outlier_plot
+    outlier_suggestion
 )
 
 router = APIRouter()
+
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "../../../frontend/templates")
 templates = Jinja2Templates(directory=TEMPLATE_DIR)
 
+def _plot_url(column: str, suggestion) -> str | None:
+    """Plot API URL of the boxplot (None when the column could not be analysed)."""
+    return f"/api/plots/outliers/{quote(column)}" if suggestion else None
+
 # ---------- GET ----------
 @router.get("/regression/outliers", response_class=HTMLResponse)
 async def outlier_get(request: Request):
@@ -42,14 +48,14 @@ async def outlier_get(request: Request):
 async def outlier_visualize(request: Request, column_name: str = Form(...)):
     filename = get_active_dataset()
     numeric_columns = get_numeric_columns_for_outliers()
-    plot_html, suggestion = generate_outlier_plot(column_name)
+    suggestion = outlier_suggestion(column_name)
 
     return templates.TemplateResponse("regression/regression_outliers.html", {
         "request": request,
         "page": "outliers",
         "numeric_columns": numeric_columns,
         "selected_column": column_name,
-        "plot_html": plot_html,
+        "plot_url": _plot_url(column_name, suggestion),
         "suggested_method": suggestion,
         **get_sidebar_context(active_file=filename)
     })
@@ -63,14 +69,14 @@ async def outlier_clean(request: Request,
     before, after, msg = handle_outliers(column_name, method)
     success = before is not None and after is not None
     numeric_columns = get_numeric_columns_for_outliers()
-    plot_html, suggestion = generate_outlier_plot(column_name)
+    suggestion = outlier_suggestion(column_name)
 
     return templates.TemplateResponse("regression/regression_outliers.html", {
         "request": request,
         "page": "outliers",
         "numeric_columns": numeric_columns,
         "selected_column": column_name,
-        "plot_html": plot_html,
+        "plot_url": _plot_url(column_name, suggestion),
         "suggested_method": suggestion,
         "summary_before": before,
         "summary_after": after,
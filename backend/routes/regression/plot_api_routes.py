@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, RedirectResponse, Response
+from plotly.offline import get_plotlyjs_version
+
+from backend.utils.regression.visualize import DEFAULT_SAMPLING, visualization_json
+from backend.utils.regression.feature_selection import correlation_bar_json
+from backend.utils.regression.outliers import outlier_plot_json
+from backend.utils.regression.density import DEFAULT_GRID
+from backend.utils.regression.sampling import DEFAULT_POINT_BUDGET
+
+router = APIRouter(prefix="/api/plots")
+
+PLOTLYJS_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+
+def _figure_response(request: Request, produce) -> Response:
+    """
+    Serve ``(etag, figure JSON)`` from ``produce`` with conditional-GET support.
+
+    The ETag is the plot-cache key, so a browser revalidating an unchanged
+    figure gets an empty 304 instead of the JSON.
+    """
+    try:
+        etag, body = produce()
+    except (KeyError, ValueError, FileNotFoundError) as e:
+        return JSONResponse({"error": str(e.args[0] if e.args else e)}, status_code=404)
+
+    etag = f'"{etag}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # always revalidate; 304 is cheap
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@router.get("/plotly.js")
+async def plotly_js():
+    """Redirect to the plotly.js build matching the server's Plotly version."""
+    return RedirectResponse(PLOTLYJS_URL, status_code=307)
+
+
+@router.get("/visualize/{plot_type}")
+async def visualize_plot(request: Request, plot_type: str,
+                         cols: list[str] = Query(...),
+                         limit: int = DEFAULT_POINT_BUDGET,
+                         sampling: str | None = None,
+                         seed: int = 42,
+                         bins: int | None = None,
+                         log: bool = True,
+                         dark: bool = True,
+                         binary: bool = True):
+    if plot_type == "histogram":
+        params = {"bins": bins or 20}
+    elif plot_type == "density":
+        params = {"bins": bins or DEFAULT_GRID, "log": log}
+    else:
+        params = {"limit": limit, "sampling": sampling or DEFAULT_SAMPLING.get(plot_type, "uniform"), "seed": seed}
+    return _figure_response(request, lambda: visualization_json(plot_type, cols, params, dark, binary))
+
+
+@router.get("/correlation_bar")
+async def correlation_bar_plot(request: Request, target: str, scorer: str = "pearson", binary: bool = True):
+    return _figure_response(request, lambda: correlation_bar_json(target, binary, scorer))
+
+
+@router.get("/outliers/{column:path}")
+async def outlier_plot(request: Request, column: str, binary: bool = True):
+    return _figure_response(request, lambda: outlier_plot_json(column, binary))
@@ -2,9 +2,13 @@ from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 import os
+from urllib.parse import urlencode
 from backend.utils.regression.context import get_sidebar_context
 from backend.utils.regression import feature_selection as fs
+from backend.utils.regression.feature_scoring import SCORERS, rank_by, scores_table_html
 from backend.utils.regression.selection_state import load_xy, save_xy
+from backend.utils.regression.model_selection import available_models
+from backend.utils.regression.wrapper_selection import WRAPPER_METHODS, DEFAULT_TIME_BUDGET
 from backend.services import dataset_service
 from backend.config import MAX_DATASETS
 from backend.utils.regression.session_state import get_active_dataset
@@ -13,6 +17,16 @@ router = APIRouter()
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "../../../frontend/templates")
 templates = Jinja2Templates(directory=TEMPLATE_DIR)
 
+WRAPPER_LABELS = {"forward": "Forward selection", "backward": "Backward elimination", "rfe": "Recursive elimination (RFE)"}
+
+
+def _wrapper_context() -> dict:
+    return {
+        "wrapper_methods": {m: WRAPPER_LABELS[m] for m in WRAPPER_METHODS},
+        "wrapper_models": {key: label for key, (label, _) in available_models().items()},
+        "default_time_budget": DEFAULT_TIME_BUDGET,
+    }
+
 # ---------- GET ----------
 @router.get("/regression/select_features", response_class=HTMLResponse)
 async def select_features_page(request: Request):
@@ -20,12 +34,26 @@ async def select_features_page(request: Request):
     files = dataset_service.list_files()
     xy_state = load_xy()
 
+    # show whatever scores are already cached for the saved target; never compute here
+    scores_html = None
+    if xy_state.get("y"):
+        try:
+            table = fs.feature_scores(xy_state["y"], compute=False)
+            if not table.empty and len(table.columns):
+                scores_html = scores_table_html(table, table.columns[0])
+        except Exception:
+            scores_html = None
+
     return templates.TemplateResponse(
         "regression/feature_selection.html",
         {
             "request": request,
             "page": "select_features",
             "numeric_columns": fs.numeric_columns(),
+            "scorers": SCORERS,
+            **_wrapper_context(),
+            "scores_html": scores_html,
+            "target_col": xy_state.get("y"),
             "xy_state": xy_state,
             "files": files,
             "active_file": active,
@@ -40,17 +68,30 @@ async def run_feature_selection(
     request: Request,
     target_col: str = Form(...),
     top_k: int = Form(10),
+    scorers: list[str] = Form(list(SCORERS)),
+    rank_scorer: str = Form("pearson"),
+    strategy: str = Form("top_k"),
 ):
     files = dataset_service.list_files()
     active = get_active_dataset()
+    if rank_scorer not in scorers:
+        scorers = [rank_scorer, *scorers]
 
     try:
-        series = fs.correlation_with_target(target_col)
-        plot_html = fs.correlation_bar_html(series, f"Correlation vs {target_col}")
-        selected = fs.top_features(series, int(top_k))
-        message = f"✅ Top {top_k} features pre-selected based on correlation."
+        table = fs.feature_scores(target_col, scorers)
+        scores_html = scores_table_html(table, rank_scorer)
+        plot_url = f"/api/plots/correlation_bar?{urlencode({'target': target_col, 'scorer': rank_scorer})}"
+        if strategy == "mrmr":
+            picks = fs.mrmr_features(target_col, int(top_k))
+            selected = picks["feature"].tolist()
+            mrmr_html = picks.to_html(classes="table table-dark table-sm table-bordered", index=False,
+                                      float_format=lambda v: f"{v:.4g}")
+            message = f"✅ {len(selected)} features pre-selected by mRMR (relevant, low redundancy)."
+        else:
+            selected, mrmr_html = fs.top_features(rank_by(table, rank_scorer), int(top_k)), None
+            message = f"✅ Top {top_k} features pre-selected by {SCORERS[rank_scorer]}."
     except Exception as e:
-        plot_html, selected = None, []
+        plot_url, scores_html, mrmr_html, selected = None, None, None, []
         message = f"❌ Error: {e}"
 
     return templates.TemplateResponse(
@@ -59,7 +100,14 @@ async def run_feature_selection(
             "request": request,
             "page": "select_features",
             "numeric_columns": fs.numeric_columns(),
-            "plot_html": plot_html,
+            "plot_url": plot_url,
+            "scorers": SCORERS,
+            **_wrapper_context(),
+            "selected_scorers": scorers,
+            "rank_scorer": rank_scorer,
+            "scores_html": scores_html,
+            "mrmr_html": mrmr_html,
+            "strategy": strategy,
             "selected_features": selected,
             "target_col": target_col,
             "top_k": top_k,
@@ -91,6 +139,61 @@ async def save_xy_selection(
             "request": request,
             "page": "select_features",
             "numeric_columns": fs.numeric_columns(),
+            "scorers": SCORERS,
+            **_wrapper_context(),
+            "xy_state": load_xy(),
+            "message": message,
+            "files": files,
+            "active_file": active,
+            "max_datasets": MAX_DATASETS,
+            **get_sidebar_context(active_file=active),
+        },
+    )
+
+# ---------- POST 3: wrapper selection (forward / backward / RFE) ----------
+@router.post("/regression/select_features/wrapper", response_class=HTMLResponse)
+async def run_wrapper_selection(
+    request: Request,
+    target_col: str = Form(...),
+    method: str = Form("forward"),
+    model_key: str = Form("linear"),
+    n_features: int = Form(0),
+    cv: int = Form(5),
+    time_budget: float = Form(DEFAULT_TIME_BUDGET),
+    patience: int = Form(3),
+):
+    files = dataset_service.list_files()
+    active = get_active_dataset()
+
+    try:
+        result = fs.wrapper_selection(
+            target_col, method, model_key,
+            n_features=n_features or None, cv=cv, time_budget=time_budget, patience=patience,
+        )
+        selected = result["selected"]
+        save_xy(selected, target_col)
+        wrapper_html = result["history"].to_html(classes="table table-dark table-sm table-bordered",
+                                                 index=False, float_format=lambda v: f"{v:.4g}")
+        message = (f"✅ {WRAPPER_LABELS[method]} kept {len(selected)} features "
+                   f"(CV score {result['score']:.4g}, stopped: {result['stopped']}, "
+                   f"{result['elapsed']:.1f}s) and saved them as X.")
+    except Exception as e:
+        selected, wrapper_html = [], None
+        message = f"❌ Error: {e}"
+
+    return templates.TemplateResponse(
+        "regression/feature_selection.html",
+        {
+            "request": request,
+            "page": "select_features",
+            "numeric_columns": fs.numeric_columns(),
+            "scorers": SCORERS,
+            **_wrapper_context(),
+            "wrapper_method": method,
+            "wrapper_model": model_key,
+            "wrapper_html": wrapper_html,
+            "selected_features": selected,
+            "target_col": target_col,
             "xy_state": load_xy(),
             "message": message,
             "files": files,
@@ -6,7 +6,11 @@ import os
 import pandas as pd
 
 from backend.utils.regression.context import get_sidebar_context
-from backend.utils.regression.model_selection import available_models, train_and_evaluate
+from backend.utils.regression.model_selection import (SVR_APPROXIMATIONS, SVR_COMPONENTS, SVR_MAX_ROWS,
+                                                      available_models, train_and_evaluate)
+from backend.utils.regression.hyperparam_search import DEFAULT_TIME_BUDGET, N_CANDIDATES, tune_and_evaluate
+from backend.utils.regression.incremental import (CHUNK_ROWS, DEFAULT_EPOCHS, INCREMENTAL_MODELS, incremental_models,
+                                                  train_incremental)
 from backend.utils.regression.session_state import get_active_dataset
 from backend.services import dataset_service
 from backend.config import MAX_DATASETS
@@ -16,6 +20,21 @@ TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "../../../frontend/templa
 templates = Jinja2Templates(directory=TEMPLATE_DIR)
 
 
+def _training_context() -> dict:
+    return {
+        "models": available_models(),
+        "default_time_budget": DEFAULT_TIME_BUDGET,
+        "default_candidates": N_CANDIDATES,
+        "incremental_models": {key: available_models()[key][0] for key in INCREMENTAL_MODELS},
+        "warm_start_models": incremental_models(),
+        "default_epochs": DEFAULT_EPOCHS,
+        "default_chunk_rows": CHUNK_ROWS,
+        "svr_approximations": SVR_APPROXIMATIONS,
+        "default_svr_max_rows": SVR_MAX_ROWS,
+        "default_svr_components": SVR_COMPONENTS,
+    }
+
+
 # ── GET: Model selection page ──────────────────────────────
 @router.get("/regression/model", response_class=HTMLResponse)
 async def model_page(request: Request):
@@ -27,7 +46,7 @@ async def model_page(request: Request):
         {
             "request": request,
             "page": "model",
-            "models": available_models(),
+            **_training_context(),
             "files": files,
             "active_file": active,
             "max_datasets": MAX_DATASETS,
@@ -41,6 +60,14 @@ async def model_page(request: Request):
 async def train_models(
     request: Request,
     selected_models: Optional[list[str]] = Form(None),
+    evaluation: str = Form("holdout"),
+    time_budget: float = Form(DEFAULT_TIME_BUDGET),
+    cpu_budget: float = Form(0),
+    n_candidates: int = Form(N_CANDIDATES),
+    svr_max_rows: int = Form(SVR_MAX_ROWS),
+    svr_components: int = Form(SVR_COMPONENTS),
+    svr_approximation: str = Form("nystroem"),
+    force_retrain: bool = Form(False),
 ):
     active = get_active_dataset()
     files = dataset_service.list_files()
@@ -52,7 +79,7 @@ async def train_models(
             {
                 "request": request,
                 "page": "model",
-                "models": available_models(),
+                **_training_context(),
                 "message": message,
                 "files": files,
                 "active_file": active,
@@ -61,10 +88,27 @@ async def train_models(
             },
         )
 
+    search_html = None
     try:
-        results_df = train_and_evaluate(selected_models, dataset_name=active)
+        if evaluation == "tune":
+            results_df, history = tune_and_evaluate(selected_models, dataset_name=active, time_budget=time_budget,
+                                                    cpu_budget=cpu_budget, n_candidates=n_candidates)
+            search_html = history.to_html(classes="table table-dark table-sm table-bordered", index=False,
+                                          float_format=lambda v: f"{v:.4g}")
+            message = "✅ Tuning finished. Tuned models saved in static/models/; search history saved as CSV."
+        else:
+            svr_options = {"max_rows": svr_max_rows, "components": svr_components,
+                           "approximation": svr_approximation}
+            results_df = train_and_evaluate(selected_models, dataset_name=active, evaluation=evaluation,
+                                            svr_options=svr_options, force_retrain=force_retrain)
+            if evaluation == "cv":
+                message = "✅ Cross-validation finished (mean ± std over folds)."
+            else:
+                reused = int((results_df["Source"] == "cache").sum())
+                message = "✅ Training finished. Models saved in static/models/ with dataset-linked names."
+                if reused:
+                    message += f" {reused} unchanged model(s) reused from the training cache."
         table_html = results_df.to_html(classes="table table-dark table-sm", index=False)
-        message = "✅ Training finished. Models saved in static/models/ with dataset-linked names."
     except Exception as e:
         table_html, message = None, f"❌ Error during training: {e}"
 
@@ -73,13 +117,66 @@ async def train_models(
         {
             "request": request,
             "page": "model",
-            "models": available_models(),
+            **_training_context(),
             "selected": selected_models,
+            "evaluation": evaluation,
+            "time_budget": time_budget,
+            "cpu_budget": cpu_budget,
+            "n_candidates": n_candidates,
+            "svr_max_rows": svr_max_rows,
+            "svr_components": svr_components,
+            "svr_approximation": svr_approximation,
+            "force_retrain": force_retrain,
+            "results_table": table_html,
+            "search_table": search_html,
+            "message": message,
+            "files": files,
+            "active_file": active,
+            "max_datasets": MAX_DATASETS,
+            **get_sidebar_context(active_file=active),
+        },
+    )
+
+
+# ── POST: Incremental (out-of-core) training ────────────────
+@router.post("/regression/model/incremental", response_class=HTMLResponse)
+async def train_model_incremental(
+    request: Request,
+    model_key: str = Form(...),
+    epochs: int = Form(DEFAULT_EPOCHS),
+    chunk_rows: int = Form(CHUNK_ROWS),
+    warm_start: str = Form(""),
+):
+    active = get_active_dataset()
+    files = dataset_service.list_files()
+
+    table_html = epochs_html = None
+    try:
+        result, history = train_incremental(model_key, dataset_name=active, epochs=epochs,
+                                            chunk_rows=chunk_rows, warm_start=warm_start or None)
+        table_html = result.to_html(classes="table table-dark table-sm", index=False)
+        epochs_html = history.to_html(classes="table table-dark table-sm table-bordered", index=False,
+                                      float_format=lambda v: f"{v:.4g}")
+        message = ("✅ Warm start finished: the model learned from the new training rows only." if warm_start else
+                   "✅ Incremental training finished. Model saved in static/models/.")
+    except Exception as e:
+        message = f"❌ Error during training: {e}"
+
+    return templates.TemplateResponse(
+        "regression/model_selection.html",
+        {
+            "request": request,
+            "page": "model",
+            **_training_context(),
+            "incremental_key": model_key,
+            "epochs": epochs,
+            "chunk_rows": chunk_rows,
             "results_table": table_html,
+            "epochs_table": epochs_html,
             "message": message,
             "files": files,
             "active_file": active,
             "max_datasets": MAX_DATASETS,
             **get_sidebar_context(active_file=active),
         },
-    )
\ No newline at end of file
+    )
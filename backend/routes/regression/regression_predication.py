@@ -50,10 +50,9 @@ async def perform_prediction(
 
     try:
         if data_source == "x_test":
-            df = pred_utils._load_split("X_test_scaled")
-            df.attrs["source_name"] = "X_test_scaled"
+            df = pred_utils.test_inputs(model_key)
             need_metrics = True
-            data_name = "X_test_scaled"
+            data_name = "X_test"
         else:
             if not upload_file:
                 raise ValueError("❌ Please upload a CSV file.")
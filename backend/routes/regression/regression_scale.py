@@ -21,6 +21,7 @@ async def scale_page(request: Request):
         {
             "request": request,
             "page": "scale",
+            "scalers": scaler_utils.SCALERS,
             "files": files,
             "active_file": active,
             "max_datasets": MAX_DATASETS,
@@ -32,14 +33,14 @@ async def scale_page(request: Request):
 @router.post("/regression/scale", response_class=HTMLResponse)
 async def perform_scaling(
     request: Request,
-    scaler_type: str = Form(...),   # 'standard' or 'minmax'
+    scaler_type: str = Form(...),   # key of scale.SCALERS
 ):
     files = dataset_service.list_files()
     active = files[-1] if files else None
 
     try:
         preview = scaler_utils.apply_scaler(scaler_type)
-        message = f"✅ Scaling complete. Files saved as X_train_scaled.csv / X_test_scaled.csv."
+        message = "✅ Scaler fitted on X_train; scaled train / test features stored as float32 arrays."
     except Exception as e:
         preview = None
         message = f"❌ Error: {e}"
@@ -49,6 +50,8 @@ async def perform_scaling(
         {
             "request": request,
             "page": "scale",
+            "scalers": scaler_utils.SCALERS,
+            "scaler_type": scaler_type,
             "preview": preview,
             "message": message,
             "files": files,
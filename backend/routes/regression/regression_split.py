@@ -7,6 +7,7 @@ from typing import Optional
 from backend.utils.regression.context import get_sidebar_context
 from backend.utils.regression import train_test_split as tts
 from backend.utils.regression.selection_state import load_xy
+from backend.utils.regression.split_store import dataset_columns
 from backend.services import dataset_service
 from backend.config import MAX_DATASETS
 
@@ -26,6 +27,7 @@ async def split_page(request: Request):
             "request": request,
             "page": "split",
             "xy_state": xy_state,
+            "columns": dataset_columns(),
             "files": files,
             "active_file": active,
             "max_datasets": MAX_DATASETS,
@@ -41,20 +43,24 @@ async def do_split(
     test_size_manual: Optional[str] = Form(None),
     seq_test_size_predefined: Optional[str] = Form(None),
     seq_test_size_manual: Optional[str] = Form(None),
-    random_state: int = Form(42)
+    random_state: int = Form(42),
+    n_splits: int = Form(5),
+    n_repeats: int = Form(3),
+    n_bins: int = Form(10),
+    group_col: Optional[str] = Form(None),
 ):
     files = dataset_service.list_files()
     active = files[-1] if files else None
     xy_state = load_xy()
 
     try:
-        if split_method == "random":
-            test_size = 0.2
-            if test_size_manual and test_size_manual.strip():
-                test_size = float(test_size_manual)
-            elif test_size_predefined and test_size_predefined.strip():
-                test_size = float(test_size_predefined)
+        test_size = 0.2
+        if test_size_manual and test_size_manual.strip():
+            test_size = float(test_size_manual)
+        elif test_size_predefined and test_size_predefined.strip():
+            test_size = float(test_size_predefined)
 
+        if split_method == "random":
             preview = tts.perform_split(
                 test_size=test_size,
                 random_state=random_state,
@@ -62,6 +68,26 @@ async def do_split(
             )
             message = f"✅ Random split complete — Test size: {test_size}"
 
+        elif split_method == "stratified":
+            preview = tts.perform_stratified_split(
+                test_size=test_size,
+                random_state=random_state,
+                n_bins=n_bins,
+                preview_rows=5
+            )
+            message = f"✅ Stratified split complete — Test size: {test_size}, {n_bins} target quantile bins"
+
+        elif split_method == "grouped":
+            if not group_col:
+                raise ValueError("Please choose a group column.")
+            preview = tts.perform_grouped_split(
+                test_size=test_size,
+                random_state=random_state,
+                group_col=group_col,
+                preview_rows=5
+            )
+            message = f"✅ Grouped split complete — no '{group_col}' value appears in both sets"
+
         elif split_method == "seq":
             test_size = 0.2
             if seq_test_size_manual and seq_test_size_manual.strip():
@@ -75,6 +101,16 @@ async def do_split(
             )
             message = f"✅ Sequential split complete — Test size: {test_size}"
 
+        elif split_method in tts.CV_MODES:
+            preview = tts.perform_kfold_split(
+                mode=split_method,
+                n_splits=n_splits,
+                n_repeats=n_repeats,
+                random_state=random_state,
+            )
+            message = (f"✅ {len(preview['folds'])} cross-validation folds stored — "
+                       f"choose “Cross-validation” on the Model page to use them.")
+
         else:
             raise ValueError("Invalid split method selected.")
 
@@ -87,6 +123,7 @@ async def do_split(
             "request": request,
             "page": "split",
             "xy_state": xy_state,
+            "columns": dataset_columns(),
             "preview": preview,
             "message": message,
             "files": files,
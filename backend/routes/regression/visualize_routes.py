@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 import os
 
 from backend.utils.regression.context import get_sidebar_context
-from backend.utils.regression.visualize import get_numeric_columns, generate_visualizations
+from backend.utils.regression.visualize import get_numeric_columns, plot_specs, plot_url, density_window
+from backend.utils.regression.density import DEFAULT_GRID, grid_to_json
+from backend.utils.regression.sampling import DEFAULT_POINT_BUDGET, SAMPLING_METHODS
 
 router = APIRouter()
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "../../../frontend/templates")
@@ -17,6 +19,7 @@ async def visualize_get(request: Request):
         "request": request,
         "page": "visualize",
         "numeric_columns": numeric_cols,
+        "sampling_methods": SAMPLING_METHODS,
         **get_sidebar_context()
     })
 
@@ -24,8 +27,15 @@ async def visualize_get(request: Request):
 async def visualize_post(request: Request,
                          selected_columns: list[str] = Form(...),
                          plot_types: list[str] = Form(...),
-                         scatter_limit: int = Form(100)):
-    plots = generate_visualizations(selected_columns, plot_types, scatter_limit)
+                         scatter_limit: int = Form(DEFAULT_POINT_BUDGET),
+                         sampling: str = Form(""),
+                         seed: int = Form(42),
+                         density_bins: int = Form(DEFAULT_GRID),
+                         density_log: bool = Form(False)):
+    # figures are fetched lazily from the plot API after the page has painted
+    plots = [{**spec, "url": plot_url(spec)}
+             for spec in plot_specs(selected_columns, plot_types, scatter_limit, sampling or None, seed,
+                                    density_bins, density_log)]
 
     return templates.TemplateResponse("regression/regression_visualize.html", {
         "request": request,
@@ -34,8 +44,30 @@ async def visualize_post(request: Request,
         "selected_columns": selected_columns,
         "plot_types": plot_types,
         "scatter_limit": scatter_limit,
+        "sampling": sampling,
+        "sampling_methods": SAMPLING_METHODS,
+        "seed": seed,
+        "density_bins": density_bins,
+        "density_log": density_log,
         "plots": plots,
         "message": f"✅ Generated {len(plots)} plot(s) based on selection.",
         "message_type": "success",
         **get_sidebar_context()
-    })
\ No newline at end of file
+    })
+
+@router.get("/regression/visualize/density")
+async def visualize_density(x: str, y: str,
+                            bins: int = DEFAULT_GRID,
+                            log: bool = True,
+                            x0: float | None = None, x1: float | None = None,
+                            y0: float | None = None, y1: float | None = None):
+    """Re-bin a density plot for the current zoom window (omit a range to use the full extent)."""
+    try:
+        grid = density_window(
+            x, y, bins, log,
+            x_range=(x0, x1) if x0 is not None and x1 is not None else None,
+            y_range=(y0, y1) if y0 is not None and y1 is not None else None,
+        )
+    except (KeyError, ValueError, FileNotFoundError) as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse(grid_to_json(grid))
@@ -0,0 +1,257 @@
+# backend/utils/compression.py
+"""
+Response optimisation layer.
+
+* ``CompressionMiddleware`` negotiates brotli (when the ``brotli`` package is
+  installed) or gzip from ``Accept-Encoding`` and compresses text-like
+  responses, streaming ones chunk by chunk.
+* ``ConditionalGetMiddleware`` answers ``If-None-Match`` / ``If-Modified-Since``
+  with 304 for GET/HEAD responses and gives buffered responses without a
+  validator (template pages, JSON) a content-hash ETag.
+* ``PrecompressedStaticFiles`` serves ``<file>.br`` / ``<file>.gz`` sidecars
+  written by :func:`write_sidecars` instead of compressing static plots on
+  every request.
+"""
+
+import gzip
+import hashlib
+import os
+import zlib
+from email.utils import parsedate_to_datetime
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+MIN_SIZE = 1024            # smaller bodies are not worth compressing
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5         # on-the-fly; sidecars use the maximum
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+SIDECAR_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def _accepted(headers: Headers) -> list[str]:
+    """Supported encodings the client accepts, best first."""
+    offered = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        name, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0                          # malformed weight: do not use the encoding
+        if name and q > 0:
+            offered.add(name.lower())
+    order = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return [enc for enc in order if enc in offered]
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.compress, self._finish = self._c.process, self._c.finish
+        else:
+            self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.compress, self._finish = self._c.compress, self._c.flush
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+# ── Middleware ───────────────────────────────────────────────────
+class CompressionMiddleware:
+    """Compress text-like responses with the best encoding the client accepts."""
+
+    def __init__(self, app, minimum_size: int = MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encodings = _accepted(Headers(scope=scope))
+        if not encodings:
+            return await self.app(scope, receive, send)
+
+        start = None
+        compressor = None
+
+        async def wrapped_send(message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                start = message                      # held until the first body chunk
+                return
+            if message["type"] != "http.response.body":
+                return await send(message)
+
+            body, more = message.get("body", b""), message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                small = not more and len(body) < self.minimum_size
+                # byte ranges refer to the identity body; compressing them breaks the range
+                partial = start["status"] == 206 or "content-range" in headers
+                if small or partial or start["status"] in (204, 304) or not _compressible(headers):
+                    await send(start)
+                    start = None
+                    return await send(message)
+
+                compressor = _Compressor(encodings[0])
+                headers["Content-Encoding"] = encodings[0]
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    headers["ETag"] = f"W/{headers['etag']}"   # body differs from the identity one
+                del headers["content-length"]
+                if not more:
+                    payload = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(payload))
+                    await send(start)
+                    start = None
+                    return await send({"type": "http.response.body", "body": payload})
+                await send(start)
+                start = None
+
+            if compressor is None:
+                return await send(message)
+            payload = compressor.compress(body)
+            if not more:
+                payload += compressor.finish()
+            await send({"type": "http.response.body", "body": payload, "more_body": more})
+
+        await self.app(scope, receive, wrapped_send)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 prescribes for If-None-Match."""
+    if if_none_match.strip() == "*":
+        return True
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def _not_modified(request_headers: Headers, response_headers: Headers) -> bool:
+    etag = response_headers.get("etag")
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    last_modified = response_headers.get("last-modified")
+    if_modified_since = request_headers.get("if-modified-since")
+    if last_modified and if_modified_since:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ConditionalGetMiddleware:
+    """304 handling for GET/HEAD plus content-hash ETags for buffered responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        request_headers = Headers(scope=scope)
+        start = None
+        passthrough = False
+        swallow = False
+
+        async def wrapped_send(message):
+            nonlocal start, passthrough, swallow
+            if swallow:                              # rest of a body already answered with 304
+                return
+            if passthrough:
+                return await send(message)
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    passthrough = True
+                    return await send(message)
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                return await send(message)
+
+            headers = MutableHeaders(raw=start["headers"])
+            body, more = message.get("body", b""), message.get("more_body", False)
+            if "etag" not in headers and not more and "last-modified" not in headers:
+                headers["ETag"] = f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+            passthrough = True
+            if _not_modified(request_headers, headers):
+                keep = {k: v for k, v in headers.items()
+                        if k in ("etag", "last-modified", "cache-control", "vary")}
+                await send({"type": "http.response.start", "status": 304,
+                            "headers": MutableHeaders(keep).raw})
+                swallow = more
+                return await send({"type": "http.response.body", "body": b""})
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, wrapped_send)
+
+
+# ── Pre-compressed static files ──────────────────────────────────
+def write_sidecars(path: str, data: bytes) -> None:
+    """Write ``path.gz`` (and ``path.br`` when brotli is installed) next to ``path``."""
+    variants = {".gz": lambda: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = lambda: brotli.compress(data, quality=11)
+    for suffix, make in variants.items():
+        tmp = f"{path}{suffix}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(make())
+        os.replace(tmp, f"{path}{suffix}")
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that prefers an up-to-date ``.br`` / ``.gz`` sidecar when the
+    client accepts it.  Files under one of ``immutable_prefixes`` (content-
+    addressed names) are marked cacheable forever.
+    """
+
+    def __init__(self, *args, immutable_prefixes: tuple = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = immutable_prefixes
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code != 200 or not hasattr(response, "path"):
+            return response
+        if path.replace(os.sep, "/").startswith(self.immutable_prefixes):
+            response.headers["cache-control"] = "public, max-age=31536000, immutable"
+
+        for encoding in _accepted(Headers(scope=scope)):
+            sidecar = response.path + SIDECAR_SUFFIXES[encoding]
+            try:
+                st = os.stat(sidecar)
+            except OSError:
+                continue
+            if st.st_mtime < os.stat(response.path).st_mtime:
+                continue                              # stale: original rewritten since
+            compressed = self.file_response(sidecar, st, scope)
+            compressed.media_type = response.media_type
+            compressed.headers["content-type"] = response.headers["content-type"]
+            compressed.headers["content-encoding"] = encoding
+            compressed.headers["etag"] = f"W/{response.headers['etag']}"
+            if "cache-control" in response.headers:
+                compressed.headers["cache-control"] = response.headers["cache-control"]
+            compressed.headers.add_vary_header("Accept-Encoding")
+            return compressed
+        return response
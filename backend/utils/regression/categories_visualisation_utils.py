@@ -1,13 +1,14 @@
 import pandas as pd
-import plotly.graph_objects as go
 import os
 from .cleaning import load_data as _load_data
 from backend.utils.regression.session_state import get_processing_dataset_path
+from backend.utils.regression.fingerprint import dataset_version
+from backend.utils.regression.plot_cache import cached_plot_file
+from backend.utils.regression.histogram import grouped_histogram_figure
+from backend.utils.regression.group_ranking import quantile_groups, rank_features
 
-PLOT_PATH = "frontend/static/plots"
-os.makedirs(PLOT_PATH, exist_ok=True)
-
-def generate_comparison_histograms(df, target_col, feature_cols, lower_percentile=25, upper_percentile=75):
+def generate_comparison_histograms(df, target_col, feature_cols, lower_percentile=25, upper_percentile=75,
+                                   dataset_name=""):
     if target_col not in df.columns:
         raise ValueError(f"Target column '{target_col}' not found.")
 
@@ -15,31 +16,25 @@ def generate_comparison_histograms(df, target_col, feature_cols, lower_percentil
         if col not in df.columns:
             raise ValueError(f"Feature column '{col}' not found.")
 
-    q1 = df[target_col].quantile(lower_percentile / 100)
-    q3 = df[target_col].quantile(upper_percentile / 100)
-
-    lower_group = df[df[target_col] <= q1]
-    upper_group = df[df[target_col] >= q3]
+    lower_mask, upper_mask, _, _ = quantile_groups(df[target_col], lower_percentile, upper_percentile)
+    lower_group = df[lower_mask]
+    upper_group = df[upper_mask]
 
+    dataset_name = dataset_name or os.path.basename(get_processing_dataset_path())
+    version = dataset_version(df)
     plot_paths = []
 
-    for feature in feature_cols:
-        fig = go.Figure()
-
-        # Add histogram traces
-        fig.add_trace(go.Histogram(
-            x=lower_group[feature],
-            name=f"Lower {lower_percentile}%",
-            marker_color="blue",
-            opacity=0.6
-        ))
+    def build(feature):
+        lower_name = f"Lower {lower_percentile}%"
+        upper_name = f"Upper {upper_percentile}%"
 
-        fig.add_trace(go.Histogram(
-            x=upper_group[feature],
-            name=f"Upper {upper_percentile}%",
-            marker_color="red",
-            opacity=0.6
-        ))
+        # Add pre-binned histogram traces (shared bin edges)
+        fig = grouped_histogram_figure(
+            {lower_name: lower_group[feature], upper_name: upper_group[feature]},
+            colors={lower_name: "blue", upper_name: "red"},
+            barmode="overlay",
+            opacity=0.6,
+        )
 
         # Add mean lines
         lower_avg = lower_group[feature].mean()
@@ -68,14 +63,49 @@ def generate_comparison_histograms(df, target_col, feature_cols, lower_percentil
             yaxis_title="Count",
             template="plotly_white"
         )
+        return fig
 
-        filename = f"compare_{feature}.html"
-        filepath = os.path.join(PLOT_PATH, filename)
-        fig.write_html(filepath)
-        plot_paths.append(filepath.replace("frontend", ""))
+    for feature in feature_cols:
+        plot_paths.append(cached_plot_file(
+            dataset_name, version, "compare", [target_col, feature],
+            {"lower": lower_percentile, "upper": upper_percentile},
+            lambda feature=feature: build(feature),
+        ))
 
     return plot_paths
 
+def ranking_table_html(ranking: pd.DataFrame) -> str:
+    """Render a :func:`rank_features` table for the categories page."""
+    shown = ranking.rename(columns={
+        "feature": "Feature", "n_lower": "n (lower)", "n_upper": "n (upper)",
+        "lower_mean": "Lower mean", "upper_mean": "Upper mean", "mean_diff": "Mean diff",
+        "effect_size": "Effect size (d)", "ks": "KS",
+    })
+    return shown.to_html(classes="table table-dark table-sm table-bordered", index=False,
+                         float_format=lambda v: f"{v:.4g}", na_rep="–")
+
+def rank_and_plot(df, target_col, selected_features=None, lower_percentile=25, upper_percentile=75,
+                  top_k=6, sort_by="effect_size"):
+    """
+    Rank features by how well they separate the target groups and plot the best ones.
+
+    With no ``selected_features`` every numeric feature is ranked and only the
+    ``top_k`` strongest are plotted; otherwise just the selection is ranked
+    and plotted.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, list[str]]
+        The ranking table and the URLs of the comparison plots.
+    """
+    ranking = rank_features(df, target_col, lower_percentile, upper_percentile,
+                            features=selected_features or None, sort_by=sort_by)
+    to_plot = ranking["feature"].tolist()
+    if not selected_features:
+        to_plot = to_plot[:top_k]
+    plots = generate_comparison_histograms(df, target_col, to_plot, lower_percentile, upper_percentile)
+    return ranking, plots
+
 def load_data():
     path = get_processing_dataset_path()
     if os.path.exists(path):
@@ -0,0 +1,148 @@
+"""
+Correlation engine for wide numeric data.
+
+Columns are mean-imputed, standardised once into a float32 matrix (optionally
+on a seeded row sample) and correlated block by block, so memory stays at
+O(n·p) float32 plus one p×b block.  Spearman is Pearson on ranks.  Besides the
+full matrix the engine answers the two questions the UI actually asks:
+``corr_with_target`` (one O(n·p) matrix-vector product) and ``top_pairs``
+(strongest absolute pairs without keeping the whole matrix around).
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+BLOCK_SIZE = 256            # columns per block in the p×p product
+MAX_HEATMAP_COLS = 40       # wider matrices are truncated to the most correlated columns
+TEXT_LABEL_MAX_COLS = 15    # only annotate cells while they are readable
+
+
+# ── Preparation ──────────────────────────────────────────────────
+def _standardize(df: pd.DataFrame, cols: list, method: str = "pearson",
+                 sample_rows: int | None = None, seed: int = 42) -> np.ndarray:
+    """Return an n×p float32 matrix with zero-mean, unit-norm columns (NaN for constant ones)."""
+    data = df[cols]
+    if sample_rows and len(data) > sample_rows:
+        data = data.sample(n=sample_rows, random_state=seed)
+    if method == "spearman":
+        data = data.rank()
+    elif method != "pearson":
+        raise ValueError("method must be 'pearson' or 'spearman'.")
+
+    x = data.to_numpy(dtype=np.float32, na_value=np.nan)
+    means = np.nanmean(x, axis=0) if len(x) else np.zeros(x.shape[1], dtype=np.float32)
+    x = np.where(np.isnan(x), means, x)          # mean imputation
+    x -= means
+    norms = np.sqrt((x * x).sum(axis=0, dtype=np.float64)).astype(np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x /= np.where(norms > 0, norms, np.nan)
+    return x
+
+
+def _numeric_cols(df: pd.DataFrame, cols: list | None) -> list:
+    return cols if cols is not None else df.select_dtypes(include="number").columns.tolist()
+
+
+# ── Queries ──────────────────────────────────────────────────────
+def correlation_matrix(df: pd.DataFrame, cols: list | None = None, method: str = "pearson",
+                       sample_rows: int | None = None, block: int = BLOCK_SIZE) -> pd.DataFrame:
+    """Full p×p correlation matrix computed in float32 column blocks."""
+    cols = _numeric_cols(df, cols)
+    z = _standardize(df, cols, method, sample_rows)
+    p = len(cols)
+    out = np.empty((p, p), dtype=np.float32)
+    for i in range(0, p, block):
+        out[i:i + block] = z[:, i:i + block].T @ z
+    np.clip(out, -1.0, 1.0, out=out)
+    return pd.DataFrame(out, index=cols, columns=cols)
+
+
+def corr_with_target(df: pd.DataFrame, target: str, cols: list | None = None,
+                     method: str = "pearson", sample_rows: int | None = None) -> pd.Series:
+    """Correlation of every numeric column with ``target`` as one matrix-vector product."""
+    cols = [c for c in _numeric_cols(df, cols) if c != target]
+    z = _standardize(df, cols + [target], method, sample_rows)
+    r = np.clip(z[:, :-1].T @ z[:, -1], -1.0, 1.0)
+    return pd.Series(r.astype(np.float64), index=cols, name=target)
+
+
+def top_pairs(df: pd.DataFrame, k: int = 20, cols: list | None = None, method: str = "pearson",
+              sample_rows: int | None = None, block: int = BLOCK_SIZE) -> pd.DataFrame:
+    """The ``k`` most strongly correlated (by absolute value) distinct column pairs."""
+    cols = _numeric_cols(df, cols)
+    z = _standardize(df, cols, method, sample_rows)
+    p = len(cols)
+    best_i, best_j, best_r = [], [], []
+    for i in range(0, p, block):
+        c = z[:, i:i + block].T @ z                      # (b × p)
+        rows, colidx = np.nonzero(np.triu(np.ones_like(c, dtype=bool), k=i + 1))
+        vals = c[rows, colidx]
+        keep = ~np.isnan(vals)
+        rows, colidx, vals = rows[keep] + i, colidx[keep], vals[keep]
+        if vals.size > k:
+            sel = np.argpartition(-np.abs(vals), k)[:k]
+            rows, colidx, vals = rows[sel], colidx[sel], vals[sel]
+        best_i.append(rows)
+        best_j.append(colidx)
+        best_r.append(vals)
+
+    if not best_r:
+        return pd.DataFrame(columns=["feature_a", "feature_b", "corr"])
+    r = np.concatenate(best_r)
+    ii, jj = np.concatenate(best_i), np.concatenate(best_j)
+    order = np.argsort(-np.abs(r))[:k]
+    return pd.DataFrame({
+        "feature_a": [cols[a] for a in ii[order]],
+        "feature_b": [cols[b] for b in jj[order]],
+        "corr": np.clip(r[order], -1.0, 1.0).astype(np.float64),
+    })
+
+
+# ── Heatmap ──────────────────────────────────────────────────────
+def _cluster_order(corr: np.ndarray) -> np.ndarray:
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    dist = 1.0 - np.abs(np.nan_to_num(corr, nan=0.0))
+    np.fill_diagonal(dist, 0.0)
+    dist = (dist + dist.T) / 2
+    return leaves_list(linkage(squareform(dist, checks=False), method="average"))
+
+
+def correlation_heatmap(df: pd.DataFrame, cols: list | None = None, method: str = "pearson",
+                        sample_rows: int | None = None, max_cols: int = MAX_HEATMAP_COLS,
+                        title: str = "Correlation Heatmap") -> go.Figure:
+    """
+    Clustered correlation heatmap.
+
+    When there are more than ``max_cols`` columns only the ones with the
+    strongest off-diagonal correlation are shown; cell text is only drawn for
+    small matrices.
+    """
+    corr = correlation_matrix(df, cols, method, sample_rows)
+    values = corr.to_numpy()
+    labels = corr.columns.to_numpy()
+    shown = len(labels)
+
+    if shown > max_cols:
+        strength = np.abs(np.nan_to_num(values, nan=0.0))
+        np.fill_diagonal(strength, 0.0)
+        keep = np.sort(np.argsort(-strength.max(axis=0))[:max_cols])
+        values, labels = values[np.ix_(keep, keep)], labels[keep]
+        title = f"{title} (top {max_cols} of {shown} columns)"
+
+    if len(labels) > 2:
+        order = _cluster_order(values)
+        values, labels = values[np.ix_(order, order)], labels[order]
+
+    text_kwargs = {}
+    if len(labels) <= TEXT_LABEL_MAX_COLS:
+        text_kwargs = {"text": np.round(values, 2), "texttemplate": "%{text}"}
+
+    fig = go.Figure(go.Heatmap(
+        z=values, x=labels.tolist(), y=labels.tolist(),
+        zmin=-1, zmax=1, colorscale="RdBu_r", **text_kwargs,
+    ))
+    fig.update_layout(title=title, yaxis_autorange="reversed")
+    return fig
@@ -6,6 +6,13 @@ import plotly.io as pio
 from pathlib import Path
 import re
 from backend.utils.regression.session_state import set_active_dataset, get_active_dataset
+from backend.utils.regression.fingerprint import dataset_version
+from backend.utils.regression.plot_cache import cached_plot_file
+from backend.utils.regression.histogram import histogram_figure
+from backend.utils.regression.profiling import profile_dataframe, profiles_to_frames
+from backend.utils.regression.profile_store import column_profiles, value_fingerprint
+from backend.utils.regression.correlation import correlation_heatmap
+from backend.utils.regression.target_ranges import TargetRange
 
 pio.templates.default = "plotly_white"
 
@@ -42,43 +49,39 @@ def dataset_overview(df: pd.DataFrame) -> dict:
         "n_cols": df.shape[1],
     }
 
-def describe_data(df: pd.DataFrame):
-    summary          = df.describe().T
-    summary["median"] = df.median(numeric_only=True)
-    try:
-        summary["mode"] = df.mode(numeric_only=True).iloc[0]
-    except IndexError:
-        summary["mode"] = np.nan
-
-    missing = pd.DataFrame({
-        "missing_count"   : df.isna().sum(),
-        "missing_percent" : df.isna().mean().mul(100)
-    })
+def describe_data(df: pd.DataFrame, dataset_name: str = ""):
+    """
+    Summary and missing-value tables from one chunked pass per column.
+    With a ``dataset_name`` only columns that changed since the last call are re-profiled.
+    """
+    profiles = column_profiles(df, dataset_name) if dataset_name else profile_dataframe(df)
+    summary, missing = profiles_to_frames(profiles)
     return summary.round(2), missing.round(2)
 
 # ────────────────────────────────────────────────────────────────
 # 📉  Univariate plots
 # ────────────────────────────────────────────────────────────────
+def _univariate_figure(df: pd.DataFrame, col: str):
+    if pd.api.types.is_numeric_dtype(df[col]):
+        return histogram_figure(df[col], nbins=30, marginal_box=True,
+                                title=f"Distribution of {col}")
+    vc  = df[col].value_counts().reset_index()
+    vc.columns = [col, "count"]
+    return px.bar(vc, x=col, y="count", title=f"Count plot of {col}")
+
 def generate_univariate_plots(df: pd.DataFrame, dataset_name: str) -> list[str]:
     plots = []
-    base  = Path(dataset_name).stem
 
     for col in df.columns:
-        if pd.api.types.is_numeric_dtype(df[col]):
-            fig = px.histogram(df, x=col, marginal="box", nbins=30,
-                               title=f"Distribution of {col}")
-        elif pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_categorical_dtype(df[col]):
-            vc  = df[col].value_counts().reset_index()
-            vc.columns = [col, "count"]
-            fig = px.bar(vc, x=col, y="count", title=f"Count plot of {col}")
-        else:
+        if not (pd.api.types.is_numeric_dtype(df[col])
+                or pd.api.types.is_object_dtype(df[col])
+                or isinstance(df[col].dtype, pd.CategoricalDtype)):
             continue
-
-        safe_col  = safe_filename(col)
-        file_name = f"{base}_univariate_{safe_col}.html"
-        file_path = os.path.join(PLOT_PATH, file_name)
-        fig.write_html(file_path)
-        plots.append(file_path.replace("frontend", ""))
+        # keyed by this column's values only, so edits elsewhere keep the plot
+        plots.append(cached_plot_file(
+            dataset_name, value_fingerprint(df[col]), "univariate", [col], None,
+            lambda col=col: _univariate_figure(df, col), scope=col,
+        ))
     return plots
 
 # ────────────────────────────────────────────────────────────────
@@ -86,21 +89,20 @@ def generate_univariate_plots(df: pd.DataFrame, dataset_name: str) -> list[str]:
 # ────────────────────────────────────────────────────────────────
 def generate_multivariate_plots(df: pd.DataFrame, dataset_name: str) -> list[str]:
     plots    = []
-    base     = Path(dataset_name).stem
+    version  = dataset_version(df)
     num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
 
     if len(num_cols) >= 2:
-        corr = df[num_cols].corr()
-        fig  = px.imshow(corr, text_auto=True, title="Correlation Heatmap")
-        path = os.path.join(PLOT_PATH, f"{base}_correlation.html")
-        fig.write_html(path)
-        plots.append(path.replace("frontend", ""))
+        plots.append(cached_plot_file(
+            dataset_name, version, "correlation", num_cols, None,
+            lambda: correlation_heatmap(df, num_cols),
+        ))
 
     if 2 <= len(num_cols) <= 6:
-        fig  = px.scatter_matrix(df, dimensions=num_cols, title="Pairplot Matrix")
-        path = os.path.join(PLOT_PATH, f"{base}_pairplot.html")
-        fig.write_html(path)
-        plots.append(path.replace("frontend", ""))
+        plots.append(cached_plot_file(
+            dataset_name, version, "pairplot", num_cols, None,
+            lambda: px.scatter_matrix(df, dimensions=num_cols, title="Pairplot Matrix"),
+        ))
 
     return plots
 
@@ -112,15 +114,23 @@ def filter_dataset_by_target(
     target_col: str,
     lower_percentile: float,
     upper_percentile: float,
+    persist: bool = True,
+    chunksize: int = 100_000,
 ):
-    if not (0 <= lower_percentile <= 100 and 0 <= upper_percentile <= 100):
-        raise ValueError("Percentiles must be between 0 and 100.")
+    """
+    Keep rows whose target lies between two percentiles.
+
+    Returns ``(mask, shape_str, file_name)``: a boolean row mask (use
+    ``df[mask]`` when the rows are actually needed) and, when ``persist`` is
+    set, the "<base>_cleaned.csv" the rows were streamed to in chunks.
+    """
     if target_col not in df.columns:
         raise KeyError(f"Target column '{target_col}' not found.")
 
-    lower = df[target_col].quantile(lower_percentile / 100)
-    upper = df[target_col].quantile(upper_percentile / 100)
-    filtered_df = df[df[target_col].between(lower, upper)].copy()
+    mask = TargetRange(df[target_col], lower_percentile, upper_percentile).mask()
+    shape_str = f"{int(mask.sum())} rows × {df.shape[1]} columns"
+    if not persist:
+        return mask, shape_str, None
 
     # ✅ Always save to "<base>_cleaned.csv"
     current_active = Path(get_active_dataset()).stem
@@ -128,49 +138,42 @@ def filter_dataset_by_target(
     file_name = f"{base_name}_cleaned.csv"
     cleaned_path = os.path.join(CLEANED_DIR, file_name)
 
-    filtered_df.to_csv(cleaned_path, index=False)
+    for start in range(0, max(len(df), 1), chunksize):
+        part = df.iloc[start:start + chunksize][mask[start:start + chunksize]]
+        part.to_csv(cleaned_path, index=False, mode="w" if start == 0 else "a", header=start == 0)
 
     # ✅ Do NOT set cleaned file as active dataset anymore
     # set_active_dataset(file_name) ← REMOVED
 
-    shape_str = f"{filtered_df.shape[0]} rows × {filtered_df.shape[1]} columns"
-    return filtered_df, shape_str, file_name
+    return mask, shape_str, file_name
 
 def visualize_target_distribution(
     df: pd.DataFrame,
     target_col: str,
     lower_percentile: float,
     upper_percentile: float,
+    dataset_name: str = "",
 ) -> str:
-    if not (0 <= lower_percentile <= 100 and 0 <= upper_percentile <= 100):
-        raise ValueError("Percentiles must be between 0 and 100.")
     if target_col not in df.columns:
         raise KeyError(f"Target column '{target_col}' not found.")
 
-    lower = df[target_col].quantile(lower_percentile / 100)
-    upper = df[target_col].quantile(upper_percentile / 100)
-
-    def classify(val):
-        if val < lower:
-            return f"< {lower_percentile}th percentile"
-        elif val > upper:
-            return f"> {upper_percentile}th percentile"
-        else:
-            return f"{lower_percentile}–{upper_percentile}% Range"
-
-    df_plot = df[[target_col]].copy()
-    df_plot["Range"] = df_plot[target_col].apply(classify)
-
-    fig = px.histogram(
-        df_plot,
-        x=target_col,
-        color="Range",
-        nbins=30,
-        title=f"Target Distribution by Percentile: {target_col}",
-        marginal="box"
-    )
-
-    filename = f"{safe_filename(target_col)}_{lower_percentile}_{upper_percentile}_dist.html"
-    filepath = os.path.join(PLOTS_DIR, filename)
-    fig.write_html(filepath)
-    return filepath.replace("frontend", "")  # relative path for iframe
+    bands = TargetRange(df[target_col], lower_percentile, upper_percentile)
+
+    def build():
+        counts = bands.counts()
+        labels = bands.labels(index=df.index).cat.rename_categories(
+            lambda name: f"{name} (n={counts[name]})"
+        )
+        return histogram_figure(
+            df[target_col],
+            color=labels,
+            nbins=30,
+            title=f"Target Distribution by Percentile: {target_col}",
+            marginal_box=True
+        )
+
+    return cached_plot_file(
+        dataset_name or get_active_dataset(), dataset_version(df),
+        "target_distribution", [target_col],
+        {"lower": lower_percentile, "upper": upper_percentile}, build,
+    )  # relative path for iframe
@@ -0,0 +1,200 @@
+"""
+Multi-scorer feature ranking.
+
+Each scorer rates every numeric feature against the target:
+
+* ``pearson`` / ``spearman`` – correlation (signed) from the block engine
+* ``f_regression``           – univariate F statistic
+* ``mutual_info``            – k-NN mutual information estimate
+* ``tree``                   – impurity importance of an extra-trees forest
+
+Scorers run in parallel threads on a seeded row sample when the data is
+large, and results are persisted per (dataset version, target, scorer), so
+revisiting the feature-selection page or switching scorers costs nothing.
+"""
+
+import os
+import pickle
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.config import STORE_DIR as STORE_ROOT
+
+from .correlation import corr_with_target
+from .fingerprint import dataset_version
+
+SCORERS = {
+    "pearson": "Pearson r",
+    "spearman": "Spearman ρ",
+    "f_regression": "F statistic",
+    "mutual_info": "Mutual info",
+    "tree": "Tree importance",
+}
+SAMPLE_ROWS = 50_000        # scorers see at most this many rows
+MAX_WORKERS = min(len(SCORERS), os.cpu_count() or 1)
+
+# ── Paths ────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../..", STORE_ROOT, "feature_scores"))
+os.makedirs(STORE_DIR, exist_ok=True)
+
+_lock = threading.Lock()
+
+
+# ── Scorers ──────────────────────────────────────────────────────
+def _matrix(df: pd.DataFrame, features: list, target: str) -> tuple[np.ndarray, np.ndarray]:
+    """Mean-imputed float32 X and float64 y for rows with a target value."""
+    data = df[features + [target]].dropna(subset=[target])
+    x = data[features].to_numpy(dtype=np.float32, na_value=np.nan)
+    means = np.nan_to_num(np.nanmean(x, axis=0)) if len(x) else np.zeros(x.shape[1], np.float32)
+    x = np.where(np.isnan(x), means, x)
+    return x, data[target].to_numpy(dtype=np.float64)
+
+
+def _score_corr(method):
+    def score(df, features, target):
+        rows = df.dropna(subset=[target])
+        return corr_with_target(rows, target, features, method=method).to_numpy()
+    return score
+
+
+def _score_f(df, features, target):
+    from sklearn.feature_selection import f_regression
+    x, y = _matrix(df, features, target)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_stat, _ = f_regression(x, y)
+    return f_stat
+
+
+def _score_mi(df, features, target):
+    from sklearn.feature_selection import mutual_info_regression
+    x, y = _matrix(df, features, target)
+    return mutual_info_regression(x, y, random_state=42)
+
+
+def _score_tree(df, features, target):
+    from sklearn.ensemble import ExtraTreesRegressor
+    x, y = _matrix(df, features, target)
+    # one thread: the scorers already run side by side in MAX_WORKERS threads
+    forest = ExtraTreesRegressor(n_estimators=100, min_samples_leaf=5, n_jobs=1, random_state=42)
+    return forest.fit(x, y).feature_importances_
+
+
+_SCORE_FUNCS = {
+    "pearson": _score_corr("pearson"),
+    "spearman": _score_corr("spearman"),
+    "f_regression": _score_f,
+    "mutual_info": _score_mi,
+    "tree": _score_tree,
+}
+
+
+# ── Store ────────────────────────────────────────────────────────
+def _store_path(dataset_name: str) -> str:
+    stem = re.sub(r"[^\w\-]", "_", Path(dataset_name or "dataset").stem)
+    return os.path.join(STORE_DIR, f"{stem}.pkl")
+
+
+def _load(dataset_name: str) -> dict:
+    path = _store_path(dataset_name)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return {}
+
+
+def _save(dataset_name: str, store: dict) -> None:
+    path = _store_path(dataset_name)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(store, f)
+    os.replace(tmp, path)
+
+
+# ── Public API ───────────────────────────────────────────────────
+def score_features(df: pd.DataFrame, target: str, scorers: list | None = None, dataset_name: str = "",
+                   sample_rows: int = SAMPLE_ROWS, compute: bool = True) -> pd.DataFrame:
+    """
+    Score every numeric feature against ``target`` with several scorers.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset.
+    target : str
+        Numeric target column.
+    scorers : list, optional
+        Keys of ``SCORERS``; defaults to all of them.
+    dataset_name : str
+        Dataset file name; results are stored per dataset.
+    sample_rows : int
+        Row sample size used by the scorers on large data.
+    compute : bool
+        When False only stored results are returned (missing scorers are absent).
+
+    Returns
+    -------
+    pd.DataFrame
+        One column per scorer, indexed by feature.
+    """
+    if target not in df.columns:
+        raise ValueError(f"Target '{target}' not found.")
+    scorers = list(scorers or SCORERS)
+    unknown = [s for s in scorers if s not in SCORERS]
+    if unknown:
+        raise ValueError(f"Unknown scorer(s): {', '.join(unknown)}")
+
+    features = [c for c in df.select_dtypes(include="number").columns if c != target]
+    version = dataset_version(df)
+    key = lambda scorer: (version, target, scorer, sample_rows)
+
+    with _lock:
+        store = _load(dataset_name)
+    results = {s: store[key(s)] for s in scorers if key(s) in store}
+    todo = [s for s in scorers if s not in results]
+
+    if todo and compute and features:
+        sample = df[features + [target]]
+        if len(sample) > sample_rows:
+            sample = sample.sample(n=sample_rows, random_state=42)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            scores = pool.map(lambda s: _SCORE_FUNCS[s](sample, features, target), todo)
+            for scorer, values in zip(todo, scores):
+                results[scorer] = pd.Series(np.asarray(values, dtype=np.float64), index=features)
+
+        with _lock:
+            store = {k: v for k, v in _load(dataset_name).items() if k[0] == version}  # one live version
+            store.update({key(s): results[s] for s in todo})
+            _save(dataset_name, store)
+
+    table = pd.DataFrame({s: results[s] for s in scorers if s in results}, index=features)
+    table.index.name = "feature"
+    return table
+
+
+def rank_by(table: pd.DataFrame, scorer: str) -> pd.Series:
+    """Scores of one scorer sorted strongest first (correlations by absolute value)."""
+    return table[scorer].sort_values(key=abs, ascending=False, na_position="last")
+
+
+def scores_table_html(table: pd.DataFrame, sort_scorer: str) -> str:
+    """Side-by-side scorer table, sorted by ``sort_scorer``, for the feature-selection page."""
+    shown = table.loc[rank_by(table, sort_scorer).index].rename(columns=SCORERS).reset_index()
+    return shown.to_html(classes="table table-dark table-sm table-bordered", index=False,
+                         float_format=lambda v: f"{v:.4g}", na_rep="–")
+
+
+def drop_store(dataset_name: str) -> None:
+    """Forget every stored score of a dataset (raw or cleaned)."""
+    for name in (dataset_name, dataset_name.replace(".csv", "_cleaned.csv")):
+        path = _store_path(name)
+        if os.path.exists(path):
+            os.remove(path)
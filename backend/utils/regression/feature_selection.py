@@ -1,7 +1,14 @@
+import os
 import pandas as pd
 import plotly.express as px
-from plotly.io import to_html
 from .cleaning import load_data
+from .correlation import corr_with_target
+from .feature_scoring import SCORERS, rank_by, score_features
+from .fingerprint import dataset_version
+from .mrmr import mrmr_select
+from .plot_cache import cached_plot_json
+from .session_state import get_processing_dataset_path
+from .wrapper_selection import wrapper_select
 
 # ---------- Core Utilities ----------
 
@@ -19,7 +26,8 @@ def correlation_with_target(target: str, fillna: bool = True) -> pd.Series:
     target : str
         The target variable name.
     fillna : bool
-        Whether to fill missing values with mean before computing correlation.
+        Whether to fill missing values with mean before computing correlation
+        (otherwise rows with any missing value are dropped).
 
     Returns
     -------
@@ -30,12 +38,12 @@ def correlation_with_target(target: str, fillna: bool = True) -> pd.Series:
     if target not in df.columns:
         raise ValueError(f"Target '{target}' not found.")
     df = df.select_dtypes(include="number")
-    if fillna:
-        df = df.fillna(df.mean())
-    corr = df.corr(numeric_only=True)
-    return corr[target].drop(labels=[target]).sort_values(key=abs, ascending=False)
+    if not fillna:
+        df = df.dropna()
+    corr = corr_with_target(df, target)
+    return corr.sort_values(key=abs, ascending=False)
 
-def correlation_bar_html(series: pd.Series, title: str = "") -> str:
+def correlation_bar_figure(series: pd.Series, title: str = ""):
     """
     Creates an interactive horizontal bar chart for correlations.
 
@@ -48,8 +56,8 @@ def correlation_bar_html(series: pd.Series, title: str = "") -> str:
 
     Returns
     -------
-    str
-        HTML of the Plotly chart.
+    plotly.graph_objects.Figure
+        The bar chart.
     """
     fig = px.bar(
         series[::-1],  # reverse for descending order
@@ -61,7 +69,42 @@ def correlation_bar_html(series: pd.Series, title: str = "") -> str:
     )
     fig.update_traces(text=series[::-1].round(3).values, textposition='auto')
     fig.update_layout(height=400, margin=dict(l=80, r=20, t=60, b=40))
-    return to_html(fig, full_html=False)
+    return fig
+
+def feature_scores(target: str, scorers: list | None = None, compute: bool = True) -> pd.DataFrame:
+    """
+    Side-by-side scores of every numeric feature against ``target`` (see ``feature_scoring``).
+
+    Results are cached per (dataset version, target, scorer); with
+    ``compute=False`` only already cached scorers are returned.
+    """
+    df = load_data()
+    dataset_name = os.path.basename(get_processing_dataset_path())
+    return score_features(df, target, scorers, dataset_name=dataset_name, compute=compute)
+
+def correlation_bar_json(target: str, binary: bool = True, scorer: str = "pearson") -> tuple[str, str]:
+    """
+    Figure JSON of the ``scorer`` chart for ``target``, served from the plot cache.
+
+    Returns
+    -------
+    tuple[str, str]
+        ``(etag, figure JSON)``.
+    """
+    df = load_data()
+    if target not in df.columns:
+        raise ValueError(f"Target '{target}' not found.")
+    dataset_name = os.path.basename(get_processing_dataset_path())
+
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown scorer '{scorer}'.")
+
+    def build():
+        table = score_features(df, target, [scorer], dataset_name=dataset_name)
+        return correlation_bar_figure(rank_by(table, scorer), f"{SCORERS[scorer]} vs {target}")
+
+    return cached_plot_json(dataset_name, dataset_version(df), "correlation_bar", [target],
+                            {"scorer": scorer}, build, binary=binary)
 
 def top_features(series: pd.Series, k: int) -> list[str]:
     """
@@ -80,3 +123,23 @@ def top_features(series: pd.Series, k: int) -> list[str]:
         List of top-k feature names.
     """
     return series.head(k).index.tolist()
+
+def mrmr_features(target: str, k: int, scheme: str = "difference") -> pd.DataFrame:
+    """
+    Redundancy-aware top-k: mRMR picks on the processing dataset (see ``mrmr``).
+
+    Returns
+    -------
+    pd.DataFrame
+        Picked features in order with relevance, redundancy and score.
+    """
+    return mrmr_select(load_data(), target, k, scheme=scheme)
+
+def wrapper_selection(target: str, method: str = "forward", model_key: str = "linear", **options) -> dict:
+    """
+    Wrapper-based selection (forward / backward / RFE) on the processing dataset.
+
+    ``options`` are passed to :func:`wrapper_selection.wrapper_select`
+    (``n_features``, ``cv``, ``time_budget``, ``patience``, ...).
+    """
+    return wrapper_select(load_data(), target, method=method, model_key=model_key, **options)
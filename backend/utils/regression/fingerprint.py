@@ -0,0 +1,40 @@
+"""
+Content fingerprints for datasets and columns.
+
+A fingerprint only changes when the data changes, so it can be used as the
+"dataset version" part of any cache key (plots, profiles, scores, models).
+"""
+
+import hashlib
+import os
+
+import pandas as pd
+
+
+def column_fingerprint(series: pd.Series) -> str:
+    """Return a short hash of a column's name, dtype and values (index ignored)."""
+    h = hashlib.sha1()
+    h.update(str(series.name).encode("utf-8"))
+    h.update(str(series.dtype).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """Return a short hash of the whole DataFrame (columns, dtypes and values)."""
+    h = hashlib.sha1()
+    h.update(repr(df.shape).encode("utf-8"))
+    for col in df.columns:
+        h.update(column_fingerprint(df[col]).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def file_version(path: str) -> str:
+    """
+    Return a short hash of a file's size and modification time.
+
+    Much cheaper than :func:`dataset_version` (nothing is parsed), at the cost
+    of changing when the file is rewritten with identical contents.
+    """
+    stat = os.stat(path)
+    return hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8")).hexdigest()[:16]
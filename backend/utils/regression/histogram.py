@@ -0,0 +1,154 @@
+"""
+Server-side histogram engine.
+
+Bin edges, counts and box statistics are computed with NumPy and emitted as
+pre-aggregated Plotly traces, so a figure carries O(bins) numbers instead of
+every raw value of the column.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+DEFAULT_COLORS = ["#636efa", "#ef553b", "#00cc96", "#ab63fa", "#ffa15a",
+                  "#19d3f3", "#ff6692", "#b6e880", "#ff97ff", "#fecb52"]
+
+
+# ── Core numerics ────────────────────────────────────────────────
+def _finite(values) -> np.ndarray:
+    arr = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype="float64")
+    return arr[np.isfinite(arr)]
+
+
+def bin_edges(values, nbins: int = 30) -> np.ndarray:
+    """Equal-width bin edges spanning the finite values."""
+    arr = _finite(values)
+    if arr.size == 0:
+        return np.array([0.0, 1.0])
+    return np.histogram_bin_edges(arr, bins=nbins)
+
+
+def bin_counts(values, edges: np.ndarray) -> np.ndarray:
+    """Counts of the finite values falling into each bin."""
+    counts, _ = np.histogram(_finite(values), bins=edges)
+    return counts
+
+
+def box_stats(values) -> dict:
+    """Quartiles, Tukey fences and mean — everything a box trace needs."""
+    arr = _finite(values)
+    if arr.size == 0:
+        return {}
+    q1, median, q3 = np.percentile(arr, [25, 50, 75])
+    iqr = q3 - q1
+    inside = arr[(arr >= q1 - 1.5 * iqr) & (arr <= q3 + 1.5 * iqr)]
+    return {
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "lowerfence": float(inside.min()),
+        "upperfence": float(inside.max()),
+        "mean": float(arr.mean()),
+    }
+
+
+# ── Figures ──────────────────────────────────────────────────────
+def grouped_histogram_figure(
+    groups: dict,
+    nbins: int = 30,
+    marginal_box: bool = False,
+    title: str = "",
+    xaxis_title: str = "",
+    template: str | None = None,
+    colors: dict | None = None,
+    barmode: str = "stack",
+    opacity: float | None = None,
+) -> go.Figure:
+    """
+    Histogram of several value groups sharing one set of bin edges.
+
+    Parameters
+    ----------
+    groups : dict
+        Trace name -> values (Series, array or list).
+    nbins : int
+        Number of equal-width bins over the union of all groups.
+    marginal_box : bool
+        Add a box strip per group above the bars (precomputed stats only).
+    colors : dict, optional
+        Trace name -> colour; defaults to the Plotly palette.
+    barmode : str
+        "stack" or "overlay".
+
+    Returns
+    -------
+    go.Figure
+        Bar-trace figure whose size depends only on ``nbins`` and group count.
+    """
+    all_values = np.concatenate([_finite(v) for v in groups.values()]) if groups else np.array([])
+    edges = bin_edges(all_values, nbins)
+    widths = np.diff(edges)
+    show_legend = len(groups) > 1
+
+    if marginal_box:
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                            row_heights=[0.2, 0.8], vertical_spacing=0.03)
+        bar_pos = dict(row=2, col=1)
+    else:
+        fig = go.Figure()
+        bar_pos = {}
+
+    for i, (name, values) in enumerate(groups.items()):
+        color = (colors or {}).get(name, DEFAULT_COLORS[i % len(DEFAULT_COLORS)])
+        fig.add_trace(go.Bar(
+            x=edges[:-1], y=bin_counts(values, edges), width=widths, offset=0,
+            name=str(name), legendgroup=str(name), showlegend=show_legend,
+            marker_color=color, opacity=opacity,
+            hovertemplate="[%{x:.4g}, %{customdata:.4g}): %{y}<extra>" + str(name) + "</extra>",
+            customdata=edges[1:],
+        ), **bar_pos)
+
+        if marginal_box:
+            stats = box_stats(values)
+            if stats:
+                fig.add_trace(go.Box(
+                    y=[str(name)], orientation="h", name=str(name),
+                    q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]],
+                    lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+                    mean=[stats["mean"]], marker_color=color,
+                    legendgroup=str(name), showlegend=False,
+                ), row=1, col=1)
+
+    fig.update_layout(title=title, barmode=barmode, bargap=0)
+    if template:
+        fig.update_layout(template=template)
+    fig.update_xaxes(title_text=xaxis_title, **({"row": 2, "col": 1} if marginal_box else {}))
+    fig.update_yaxes(title_text="count", **({"row": 2, "col": 1} if marginal_box else {}))
+    if marginal_box:
+        fig.update_yaxes(showticklabels=False, row=1, col=1)
+    return fig
+
+
+def histogram_figure(
+    series: pd.Series,
+    nbins: int = 30,
+    color: pd.Series | None = None,
+    marginal_box: bool = False,
+    title: str = "",
+    template: str | None = None,
+) -> go.Figure:
+    """
+    Pre-binned replacement for ``px.histogram(df, x=col, color=..., marginal="box")``.
+
+    ``color`` is an optional Series aligned with ``series`` whose values split the
+    rows into coloured groups.
+    """
+    if color is None:
+        groups = {series.name: series}
+    else:
+        groups = {key: grp for key, grp in series.groupby(color, sort=True, observed=True)}
+    return grouped_histogram_figure(
+        groups, nbins=nbins, marginal_box=marginal_box, title=title,
+        xaxis_title=str(series.name), template=template,
+    )
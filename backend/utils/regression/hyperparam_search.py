@@ -0,0 +1,244 @@
+"""
+Budgeted hyperparameter search by successive halving.
+
+Each selected model gets ``n_candidates`` random configurations from its
+``PARAM_SPACES`` entry.  They are cross-validated on a small row subsample of
+the scaled training split.  The best ``1 / factor`` go on to the next round,
+which uses ``factor`` times more rows, and the last round uses every training
+row.  Poor configurations are therefore dropped after cheap low-fidelity fits.
+
+Every (candidate × fold) fit is an independent joblib task.  The tasks run in
+waves on ``n_jobs`` workers, and the budgets are checked between waves:
+
+* ``time_budget`` – wall-clock seconds for the whole search
+* ``cpu_budget``  – CPU seconds summed over all fits (0 = no cap)
+
+Both budgets are shared out among the models still to search.  When a budget
+runs out, the best configuration at the highest fidelity reached so far wins.
+The winner is refitted on the full training split, scored on the test split
+and saved like any other trained model.  The search history is written next
+to the models as CSV.
+"""
+
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy.stats import loguniform, randint
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler
+
+from .model_selection import (MODEL_DIR, available_models, fit_predict, regression_metrics, save_model,
+                              single_threaded, with_preprocessing)
+from .split_store import load_scaler, load_split
+
+PARAM_SPACES = {
+    "linear": {"fit_intercept": [True, False]},
+    "ridge": {"alpha": loguniform(1e-3, 1e3)},
+    "sgd": {
+        "alpha": loguniform(1e-6, 1e-1),
+        "penalty": ["l2", "l1", "elasticnet"],
+        "loss": ["squared_error", "huber"],
+    },
+    "dtr": {
+        "max_depth": [None, 4, 6, 8, 12, 16, 24],
+        "min_samples_leaf": randint(1, 50),
+        "max_features": [None, "sqrt", 0.5],
+    },
+    "rf": {
+        "n_estimators": randint(50, 400),
+        "max_depth": [None, 8, 16, 32],
+        "min_samples_leaf": randint(1, 20),
+        "max_features": ["sqrt", 0.5, 1.0],
+    },
+    "hgb": {
+        "learning_rate": loguniform(1e-2, 3e-1),
+        "max_leaf_nodes": randint(15, 128),
+        "min_samples_leaf": randint(5, 100),
+        "l2_regularization": loguniform(1e-4, 1e1),
+    },
+    "svr": {
+        "C": loguniform(1e-2, 1e3),
+        "gamma": loguniform(1e-4, 1e0),
+        "epsilon": loguniform(1e-3, 1e0),
+    },
+}
+N_JOBS = -1                 # joblib workers for CV fits (-1 = all cores)
+N_CANDIDATES = 27
+FACTOR = 3                  # keep 1 / FACTOR of the candidates, grow rows by FACTOR
+MIN_ROWS = 500              # rows in the first (cheapest) round
+DEFAULT_TIME_BUDGET = 120   # seconds
+WAVE_SECONDS = 0.5          # target duration of one parallel wave of fits
+
+
+def _fit_score(key: str, params: dict, X, y, train: np.ndarray, test: np.ndarray) -> tuple[float, float]:
+    """R² of model ``key`` with ``params`` on one fold, and the CPU seconds the fit took."""
+    began = time.process_time()
+    model = single_threaded(available_models()[key][1])     # fits already run one per worker
+    y_pred, _ = fit_predict(key, model.set_params(**params), X[train], y[train], X[test])
+    return r2_score(y[test], y_pred), time.process_time() - began
+
+
+def _candidates(key: str, n_candidates: int) -> list[dict]:
+    space = PARAM_SPACES.get(key, {})
+    if all(isinstance(values, list) for values in space.values()):     # finite grid: no repeats
+        n_candidates = min(n_candidates, len(ParameterGrid(space)))
+    return list(ParameterSampler(space, n_iter=n_candidates, random_state=42))
+
+
+def _schedule(n_rows: int, n_candidates: int, factor: int) -> list[int]:
+    """Training rows per round; the last round uses all of them."""
+    rounds = int(np.floor(np.log(max(n_candidates, 1)) / np.log(factor))) + 1
+    return [min(n_rows, max(MIN_ROWS, n_rows // factor ** (rounds - 1 - r))) for r in range(rounds)]
+
+
+class _Halving:
+    """Successive halving of one model's candidates under a time and CPU budget."""
+
+    def __init__(self, key, X, y, cv, parallel, wave, time_budget, cpu_budget):
+        self.key, self.X, self.y, self.cv = key, X, y, cv
+        self.parallel, self.wave = parallel, max(wave, cv)      # a wave scores at least one candidate
+        self.deadline = time.monotonic() + time_budget
+        self.cpu_budget, self.cpu_used = cpu_budget, 0.0
+        self.waves = 0
+        self.history = []
+        self.stopped = "completed"
+
+    def out_of_budget(self) -> bool:
+        if time.monotonic() >= self.deadline:
+            self.stopped = "time budget"
+        elif self.cpu_budget and self.cpu_used >= self.cpu_budget:
+            self.stopped = "CPU budget"
+        else:
+            return False
+        return True
+
+    def evaluate(self, candidates: list[dict], rows: np.ndarray) -> np.ndarray:
+        """Mean CV R² per candidate on ``rows``; NaN for candidates the budget cut off."""
+        folds = [(rows[tr], rows[te]) for tr, te in
+                 KFold(n_splits=self.cv, shuffle=True, random_state=42).split(rows)]
+        tasks = [(i, train, test) for i in range(len(candidates)) for train, test in folds]
+        results = []
+        start = 0
+        while start < len(tasks):                           # budgets are checked between waves
+            if self.waves and self.out_of_budget():    # the first wave always runs
+                break
+            began = time.monotonic()
+            wave = self.parallel(
+                delayed(_fit_score)(self.key, candidates[i], self.X, self.y, train, test)
+                for i, train, test in tasks[start:start + self.wave]
+            )
+            self.cpu_used += sum(cpu for _, cpu in wave)    # so the next check sees this wave
+            results += wave
+            start += self.wave
+            self.waves += 1
+            if time.monotonic() - began < WAVE_SECONDS:     # cheap fits: dispatch bigger waves
+                self.wave *= 2
+
+        scores = np.full(len(candidates), np.nan)
+        done = len(results) // len(folds)                   # candidates with every fold scored
+        if done:
+            fold_scores = np.asarray(results[:done * len(folds)])
+            scores[:done] = fold_scores[:, 0].reshape(done, len(folds)).mean(axis=1)
+        return scores
+
+    def run(self, candidates: list[dict], schedule: list[int], factor: int) -> tuple[dict, float]:
+        """Best candidate at the highest fidelity reached (catalogue defaults if none), and its CV score."""
+        order = np.random.default_rng(42).permutation(len(self.y))
+        best, best_score = {}, np.nan
+        for round_no, n_rows in enumerate(schedule, start=1):
+            scores = self.evaluate(candidates, np.sort(order[:n_rows]))
+            for params, score in zip(candidates, scores):
+                self.history.append({"round": round_no, "rows": n_rows, "params": params, "cv_r2": score})
+            scored = np.flatnonzero(~np.isnan(scores))
+            if not len(scored):
+                break
+            ranked = scored[np.argsort(-scores[scored])]
+            best, best_score = candidates[ranked[0]], float(scores[ranked[0]])
+            if self.stopped != "completed" or len(candidates) == 1:
+                break
+            candidates = [candidates[i] for i in ranked[:max(1, int(np.ceil(len(candidates) / factor)))]]
+        return best, best_score
+
+
+def tune_and_evaluate(model_keys: list[str], dataset_name: str, time_budget: float = DEFAULT_TIME_BUDGET,
+                      cpu_budget: float = 0, n_candidates: int = N_CANDIDATES, factor: int = FACTOR,
+                      cv: int = 3, n_jobs: int = N_JOBS) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Tune each model by successive halving, then train, evaluate and save the winners.
+
+    Parameters
+    ----------
+    model_keys : list of str
+        Keys from ``available_models``.
+    dataset_name : str
+        Original dataset filename to use in model file prefix.
+    time_budget : float
+        Wall-clock seconds for the whole search (the final refits come on top).
+    cpu_budget : float
+        CPU seconds summed over all search fits; 0 means no cap.
+    n_candidates : int
+        Random configurations per model.
+    factor : int
+        Halving rate: candidates kept per round shrink, and rows grow, by this factor.
+    cv : int
+        CV folds per candidate and round.
+    n_jobs : int
+        Parallel workers for (candidate × fold) fits.
+
+    Returns
+    -------
+    tuple of pd.DataFrame
+        Evaluation results (one row per model) and the search history.
+    """
+    if factor < 2:
+        raise ValueError("The halving factor must be at least 2.")
+    X_train = load_split("X_train_scaled").to_numpy()
+    X_test = load_split("X_test_scaled").to_numpy()
+    y_train = load_split("y_train").squeeze()
+    y_test = load_split("y_test").squeeze()
+    X_raw = load_split("X_train")                        # raw: column order and dtypes for the bundle
+    scaler = load_scaler()
+    y = y_train.to_numpy(dtype=np.float64)
+
+    parallel = Parallel(n_jobs=n_jobs)
+    deadline = time.monotonic() + time_budget
+    cpu_left = cpu_budget
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    base_name = os.path.splitext(dataset_name)[0]
+    results, history = [], []
+
+    for i, key in enumerate(model_keys):
+        label, _ = available_models()[key]
+        share = len(model_keys) - i                 # budget left is split among the models to go
+        search = _Halving(key, X_train, y, cv, parallel, 2 * effective_n_jobs(n_jobs),
+                          max(0.0, deadline - time.monotonic()) / share, cpu_left / share if cpu_budget else 0)
+        candidates = _candidates(key, n_candidates)
+        params, cv_score = search.run(candidates, _schedule(len(y), len(candidates), factor), factor)
+        cpu_left = max(cpu_left - search.cpu_used, 1e-9)
+        history += [{"Model": label, **row} for row in search.history]
+
+        _, model = available_models()[key]
+        y_pred, model_bundle = fit_predict(key, model.set_params(**params), X_train, y, X_test)
+        model_bundle = with_preprocessing(model_bundle, scaler, X_raw, y_train.name)
+        model_bundle["search"] = {"params": params, "cv_r2": cv_score, "stopped": search.stopped}
+        fname = f"{base_name}_{key}_tuned_{timestamp}.pkl"
+        save_model(model_bundle, fname)
+
+        results.append({
+            "Model": label,
+            "Filename": fname,
+            "Best params": ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}"
+                                     for k, v in params.items()) or "defaults",
+            "Search CV R²": round(cv_score, 3),
+            "Stopped": search.stopped,
+            **{name: round(value, 3) for name, value in regression_metrics(y_test, y_pred).items()},
+        })
+
+    history = pd.DataFrame(history, columns=["Model", "round", "rows", "params", "cv_r2"])
+    history["params"] = history["params"].map(str)
+    history.to_csv(os.path.join(MODEL_DIR, f"{base_name}_search_{timestamp}.csv"), index=False)
+    return pd.DataFrame(results), history
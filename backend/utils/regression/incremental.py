@@ -0,0 +1,218 @@
+"""
+Out-of-core incremental training.
+
+Models whose estimator has ``partial_fit`` (``INCREMENTAL_MODELS``) can be
+trained without holding the training data in memory.  The float32 scaled
+training features written by the scaling stage are memory-mapped and fed to
+``partial_fit`` in chunks of ``chunk_rows`` rows:
+
+* every epoch visits the chunks in a fresh random order and shuffles the rows
+  inside each chunk
+* each chunk is scored before it is learned from (progressive validation),
+  which gives a per-epoch RMSE without a separate pass
+
+Only the target column is parsed in full.
+
+A saved incremental model can be warm-started when rows are appended to the
+dataset.  This is only sound on sequential splits: the bundle records the end
+of the training range it learned, every test row of the new split must lie
+past it (otherwise the model would be scored on rows it was trained on), and
+only the training rows past it are scaled, with the bundle's own scaler, and
+learned from.  Retraining therefore costs only the delta.
+"""
+
+import logging
+import os
+import pickle
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .model_selection import MODEL_DIR, available_models, regression_metrics, save_model
+from .scale import csv_chunks
+from .split_store import (check_version, dataset_column, load_indices, load_manifest, load_scaled_array,
+                          load_scaler)
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_MODELS = [key for key, (_, model) in available_models().items() if hasattr(model, "partial_fit")]
+CHUNK_ROWS = 50_000
+DEFAULT_EPOCHS = 5
+
+
+def _load_bundle(model_file: str) -> dict:
+    path = os.path.join(MODEL_DIR, model_file if model_file.endswith(".pkl") else f"{model_file}.pkl")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model '{model_file}' not found.")
+    with open(path, "rb") as f:
+        bundle = pickle.load(f)
+    if "incremental" not in bundle:
+        raise ValueError(f"'{model_file}' was not trained incrementally and cannot be warm-started.")
+    return bundle
+
+
+def _scaled_rows(scaler, columns: list, rows: np.ndarray, n_rows: int, chunk_rows: int, path: str) -> np.ndarray:
+    """Scale dataset ``rows`` (ascending positions) chunk by chunk into a float32 memmap at ``path``."""
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(len(rows), len(columns)))
+    done = 0
+    for start, block in csv_chunks(columns, chunk_rows, n_rows):
+        lo, hi = np.searchsorted(rows, [start, start + len(block)])
+        if hi > lo:
+            out[done:done + hi - lo] = scaler.transform(block[rows[lo:hi] - start])
+            done += hi - lo
+    out.flush()
+    return out
+
+
+def _epochs(model, X: np.ndarray, y: np.ndarray, epochs: int, chunk_rows: int, y_scaler, progress) -> list:
+    """Run ``epochs`` shuffled passes of ``partial_fit`` over ``X`` / ``y``; returns per-epoch stats."""
+    rng = np.random.default_rng(42)
+    starts = np.arange(0, len(y), chunk_rows)
+    history = []
+    for epoch in range(1, epochs + 1):
+        began = time.monotonic()
+        squared_error, scored = 0.0, 0
+        for start in rng.permutation(starts):
+            order = rng.permutation(min(chunk_rows, len(y) - start))
+            x_chunk = np.asarray(X[start:start + len(order)])[order]     # one sequential read per chunk
+            y_chunk = y[start + order]
+            if hasattr(model, "coef_"):                     # progressive validation: score, then learn
+                pred = y_scaler.inverse_transform(model.predict(x_chunk).reshape(-1, 1)).ravel()
+                squared_error += float(np.sum((pred - y_chunk) ** 2))
+                scored += len(order)
+            model.partial_fit(x_chunk, y_scaler.transform(y_chunk.reshape(-1, 1)).ravel())
+        history.append({
+            "Epoch": epoch,
+            "Rows": len(y),
+            "Progressive RMSE": np.sqrt(squared_error / scored) if scored else np.nan,
+            "Seconds": round(time.monotonic() - began, 2),
+        })
+        logger.info("incremental epoch %d/%d: %s", epoch, epochs, history[-1])
+        if progress:
+            progress(history[-1])
+    return history
+
+
+def _evaluate(pipeline, y_scaler, columns: list, y: pd.Series, chunk_rows: int) -> dict:
+    """Stream the raw test rows through the fitted pipeline and score them."""
+    test_idx = np.sort(np.asarray(load_indices("test")))
+    preds = np.empty(len(test_idx))
+    done = 0
+    for start, block in csv_chunks(columns, chunk_rows, int(test_idx[-1]) + 1):
+        lo, hi = np.searchsorted(test_idx, [start, start + len(block)])
+        if hi > lo:
+            pred = pipeline.predict(block[test_idx[lo:hi] - start]).reshape(-1, 1)
+            preds[done:done + hi - lo] = y_scaler.inverse_transform(pred).ravel()
+            done += hi - lo
+    return regression_metrics(y[test_idx], preds)
+
+
+def train_incremental(model_key: str, dataset_name: str, epochs: int = DEFAULT_EPOCHS,
+                      chunk_rows: int = CHUNK_ROWS, warm_start: str | None = None,
+                      progress=None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Train (or continue training) a ``partial_fit`` model chunk by chunk and save it.
+
+    Parameters
+    ----------
+    model_key : str
+        One of ``INCREMENTAL_MODELS``; ignored when warm-starting.
+    dataset_name : str
+        Original dataset filename to use in model file prefix.
+    epochs : int
+        Passes over the training rows (over the new rows only when warm-starting).
+    chunk_rows : int
+        Rows per ``partial_fit`` call; bounds the memory used.
+    warm_start : str, optional
+        Filename of a saved incremental model to continue from.  Both its split
+        and the current one must be sequential; only training rows past the
+        ones it learned are learned from.
+    progress : callable, optional
+        Called with each epoch's stats (they are also logged).
+
+    Returns
+    -------
+    tuple of pd.DataFrame
+        Evaluation result (one row) and the per-epoch history.
+    """
+    manifest = load_manifest()
+    check_version(manifest)                          # stored row positions must still match the file
+    columns, target = manifest["X"], manifest["y"]
+    train_idx, test_idx = np.asarray(load_indices("train")), np.asarray(load_indices("test"))
+    n_rows = int(max(train_idx.max(initial=-1), test_idx.max(initial=-1))) + 1
+    y_all = dataset_column(target).to_numpy(dtype=np.float64)
+
+    tmp_path = None
+    if warm_start:
+        bundle = _load_bundle(warm_start)
+        if bundle["columns"] != columns or bundle["target"] != target:
+            raise ValueError("The current X / y selection differs from the one the model was trained on.")
+        if bundle["incremental"].get("split") != "sequential" or manifest.get("method") != "sequential":
+            raise ValueError("Warm starts need a sequential split, both for the saved model and now.")
+        train_end = bundle["incremental"]["train_end"]
+        if test_idx.min(initial=n_rows) < train_end:
+            raise ValueError("The current test rows include rows this model was trained on — "
+                             "split with a smaller test size or train from scratch.")
+        key = bundle["incremental"]["model_key"]
+        pipeline = bundle["model"]
+        scaler, model, y_scaler = pipeline["scaler"], pipeline["model"], bundle["y_scaler"]
+        rows = np.sort(train_idx[train_idx >= train_end])
+        if not len(rows):
+            raise ValueError("No new training rows since this model was saved.")
+        tmp_path = os.path.join(MODEL_DIR, f".{os.getpid()}_delta.npy")
+        X = _scaled_rows(scaler, columns, rows, n_rows, chunk_rows, tmp_path)
+        y = y_all[rows]
+        rows_seen = bundle["incremental"]["rows_seen"]
+    else:
+        if model_key not in INCREMENTAL_MODELS:
+            raise ValueError(f"Incremental training supports: {', '.join(INCREMENTAL_MODELS)}.")
+        key = model_key
+        scaler = load_scaler()
+        model = available_models()[key][1]
+        if "early_stopping" in model.get_params():
+            model.set_params(early_stopping=False)          # not available with partial_fit
+        X = load_scaled_array("train")
+        pipeline = Pipeline([("scaler", scaler), ("model", model)])
+        y = y_all[train_idx]
+        y_scaler = StandardScaler().fit(y.reshape(-1, 1))  # gradient steps need a unit-scale target
+        rows_seen = 0
+
+    try:
+        history = _epochs(model, X, y, epochs, chunk_rows, y_scaler, progress)
+    finally:
+        del X
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    metrics = _evaluate(pipeline, y_scaler, columns, y_all, chunk_rows)
+
+    label = available_models()[key][0]
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    fname = f"{os.path.splitext(dataset_name)[0]}_{key}_incremental_{timestamp}.pkl"
+    save_model({
+        "model": pipeline,
+        "y_scaler": y_scaler,
+        "columns": columns,
+        "dtypes": {col: "float64" for col in columns},  # columns are never fully parsed here
+        "target": target,
+        "incremental": {"model_key": key, "split": manifest.get("method"),
+                        "train_end": int(train_idx.max(initial=-1)) + 1, "rows_seen": rows_seen + len(y),
+                        "epochs": epochs, "warm_start": warm_start},
+    }, fname)
+
+    result = pd.DataFrame([{
+        "Model": f"{label} ({'warm start, ' + str(len(y)) + ' new rows' if warm_start else 'incremental'})",
+        "Filename": fname,
+        **{name: round(value, 3) for name, value in metrics.items()},
+    }])
+    return result, pd.DataFrame(history)
+
+
+def incremental_models() -> list[str]:
+    """Saved models that can be warm-started (newest first)."""
+    files = [f for f in os.listdir(MODEL_DIR) if f.endswith(".pkl") and "_incremental_" in f]
+    return sorted(files, key=lambda f: os.path.getmtime(os.path.join(MODEL_DIR, f)), reverse=True)
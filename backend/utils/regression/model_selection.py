@@ -1,39 +1,50 @@
+import multiprocessing
 import os
 import pickle
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 import pandas as pd
 import numpy as np
 
-from sklearn.linear_model import LinearRegression
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.linear_model import LinearRegression, Ridge, SGDRegressor
+from sklearn.pipeline import Pipeline
 from sklearn.tree import DecisionTreeRegressor
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.svm import SVR
-from sklearn.preprocessing import StandardScaler
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.svm import SVR, LinearSVR
+from sklearn.preprocessing import OrdinalEncoder, StandardScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from threadpoolctl import threadpool_limits
 
-from backend.utils.regression.session_state import get_active_dataset
+from backend.utils.regression import train_cache
+from backend.utils.regression.split_store import load_folds, load_scaler, load_split, split_fingerprint
 
 # ── Paths ────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SPLIT_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/splits"))
 MODEL_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/models"))
-os.makedirs(SPLIT_DIR, exist_ok=True)
 os.makedirs(MODEL_DIR, exist_ok=True)
 
+CV_WORKERS = os.cpu_count() or 1
+MODEL_THREADS = os.cpu_count() or 1     # threads of one random forest fit outside the CV pool
+SCALED_TARGET = ("svr", "sgd")          # models fitted on a standardised target
+CATEGORICAL_MAX_LEVELS = 16             # hgb: columns with 3..N distinct values are split as categories
 
-# ── Load dataset-prefixed split ──────────────────────────────────
+# Kernel SVR costs O(n²)–O(n³); above SVR_MAX_ROWS training rows the RBF kernel is
+# approximated by SVR_COMPONENTS explicit features and a linear SVR is fitted instead.
+SVR_APPROXIMATIONS = {"nystroem": "Nystroem", "rff": "Random Fourier features"}
+SVR_MAX_ROWS = 20_000
+SVR_COMPONENTS = 500
+
+
+# ── Load a split of the active dataset ───────────────────────────
 def _load(name: str) -> pd.DataFrame:
     """
-    Load a specific split (X_train, y_test, etc.) based on the active dataset.
+    Materialise a specific split (X_train, y_test, etc.) from its stored row indices.
     """
-    base = Path(get_active_dataset()).stem
-    filename = f"{base}_{name}.csv"
-    path = os.path.join(SPLIT_DIR, filename)
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"{filename} not found — run previous steps.")
-    return pd.read_csv(path)
+    return load_split(name)
 
 
 # ── Available ML models ──────────────────────────────────────────
@@ -43,14 +54,117 @@ def available_models() -> dict[str, tuple[str, object]]:
     """
     return {
         "linear": ("Linear Regression", LinearRegression()),
+        "ridge":  ("Ridge Regression", Ridge(alpha=1.0)),
+        "sgd":    ("SGD Regression", SGDRegressor(penalty="l2", alpha=1e-4, max_iter=1000, tol=1e-3,
+                                                  early_stopping=True, random_state=42)),
         "dtr":    ("Decision Tree", DecisionTreeRegressor(random_state=42)),
-        "rf":     ("Random Forest", RandomForestRegressor(n_estimators=100, random_state=42)),
+        "rf":     ("Random Forest", RandomForestRegressor(n_estimators=100, n_jobs=MODEL_THREADS, random_state=42)),
+        "hgb":    ("Histogram Gradient Boosting", HistGradientBoostingRegressor(
+                      max_iter=500, early_stopping=True, validation_fraction=0.1, n_iter_no_change=20,
+                      random_state=42)),
         "svr":    ("Support Vector Regression", SVR(kernel="rbf")),
     }
 
 
+def single_threaded(model):
+    """``model`` with its own worker count set to 1, for fits that already run one per core."""
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=1)
+    return model
+
+
+def _with_categoricals(model: HistGradientBoostingRegressor, X: np.ndarray):
+    """
+    Let gradient boosting split low-cardinality columns as categories.
+
+    Columns with 3..``CATEGORICAL_MAX_LEVELS`` distinct values are ordinal-encoded
+    in front of the model and flagged as categorical; values unseen in training
+    become missing.  Returns ``model`` unchanged when there are none.
+    """
+    sample = X[:10_000]
+    levels = [len(np.unique(sample[:, j][~np.isnan(sample[:, j])])) for j in range(X.shape[1])]
+    categorical = [j for j, n in enumerate(levels) if 2 < n <= CATEGORICAL_MAX_LEVELS]
+    if not categorical:
+        return model
+    encode = ColumnTransformer(
+        [("categories", OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=np.nan,
+                                       encoded_missing_value=np.nan), categorical)],
+        remainder="passthrough",                    # categorical columns come first
+    )
+    model.set_params(categorical_features=list(range(len(categorical))))
+    return Pipeline([("encode", encode), ("model", model)])
+
+
+def _svr_for_size(model: SVR, X: np.ndarray, max_rows: int = SVR_MAX_ROWS, components: int = SVR_COMPONENTS,
+                  approximation: str = "nystroem") -> tuple[object, dict]:
+    """
+    Exact kernel SVR for up to ``max_rows`` rows, else an RBF kernel approximation + linear SVR.
+
+    The approximation keeps the SVR's ``gamma`` (``"scale"`` / ``"auto"`` are
+    resolved the way SVR resolves them), ``C`` and ``epsilon``.  Returns the
+    estimator to fit and a record of the path taken, which goes into the bundle.
+    """
+    if len(X) <= max_rows or model.kernel != "rbf":
+        return model, {"path": "exact", "rows": len(X)}
+    if approximation not in SVR_APPROXIMATIONS:
+        raise ValueError(f"SVR approximation must be one of {', '.join(SVR_APPROXIMATIONS)}.")
+    gamma = model.gamma
+    if gamma == "scale":
+        gamma = 1.0 / (X.shape[1] * float(np.var(X, dtype=np.float64)) or 1.0)
+    elif gamma == "auto":
+        gamma = 1.0 / X.shape[1]
+    n_components = min(components, len(X))
+    if approximation == "nystroem":
+        features = Nystroem(kernel="rbf", gamma=gamma, n_components=n_components, random_state=42)
+    else:
+        features = RBFSampler(gamma=gamma, n_components=n_components, random_state=42)
+    linear = LinearSVR(C=model.C, epsilon=model.epsilon, loss="squared_epsilon_insensitive", dual="auto",
+                       max_iter=5_000, random_state=42)
+    return (Pipeline([("features", features), ("svr", linear)]),
+            {"path": approximation, "rows": len(X), "components": n_components, "gamma": gamma})
+
+
+# ── Fit / predict one model ──────────────────────────────────────
+def fit_predict(key: str, model, X_train, y_train, X_test, svr_options: dict | None = None) -> tuple[np.ndarray, dict]:
+    """
+    Fit ``model`` and predict ``X_test``; returns the predictions and the model bundle.
+
+    ``svr_options`` are passed to :func:`_svr_for_size` (max_rows, components, approximation).
+    """
+    y_train = np.asarray(y_train, dtype=np.float64).ravel()
+    extra = {}
+    if key == "hgb":
+        model = _with_categoricals(model, np.asarray(X_train))
+    if key == "svr":
+        model, extra["svr"] = _svr_for_size(model, X_train, **(svr_options or {}))
+
+    # SVR / SGD are sensitive to the target's scale: fit on a standardised target
+    if key in SCALED_TARGET:
+        y_scaler = StandardScaler()
+        y_train_scaled = y_scaler.fit_transform(y_train.reshape(-1, 1)).ravel()
+        model.fit(X_train, y_train_scaled)
+        y_pred_scaled = model.predict(X_test).reshape(-1, 1)
+        y_pred = y_scaler.inverse_transform(y_pred_scaled).ravel()
+        return y_pred, {"model": model, "y_scaler": y_scaler, **extra}
+
+    model.fit(X_train, y_train)
+    return model.predict(X_test), {"model": model, "y_scaler": None, **extra}
+
+
+def regression_metrics(y_true, y_pred) -> dict:
+    """MSE, RMSE, MAE and R² of ``y_pred`` against ``y_true``."""
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        "MSE": mse,
+        "RMSE": np.sqrt(mse),
+        "MAE": mean_absolute_error(y_true, y_pred),
+        "R²": r2_score(y_true, y_pred),
+    }
+
+
 # ── Train, Evaluate, Save ─────────────────────────────────────────
-def train_and_evaluate(model_keys: list[str], dataset_name: str) -> pd.DataFrame:
+def train_and_evaluate(model_keys: list[str], dataset_name: str, evaluation: str = "holdout",
+                       svr_options: dict | None = None, force_retrain: bool = False) -> pd.DataFrame:
     """
     Train selected models on train/test splits, evaluate, and save them.
 
@@ -60,56 +174,183 @@ def train_and_evaluate(model_keys: list[str], dataset_name: str) -> pd.DataFrame
         Keys from available_models (e.g., ['linear', 'rf']).
     dataset_name : str
         Original dataset filename to use in model file prefix.
+    evaluation : str
+        "holdout" trains on the scaled train split and saves each model fused
+        with the fitted scaler (see :func:`with_preprocessing`);
+        "cv" cross-validates on the stored folds instead (see :func:`cross_validate`).
+    svr_options : dict, optional
+        Size threshold and kernel approximation for SVR (see :func:`_svr_for_size`).
+    force_retrain : bool
+        Refit even when an identical model (same split, scaler, estimator
+        parameters and library versions) was trained before; otherwise that
+        model and its metrics are reused (see ``train_cache``).
 
     Returns
     -------
     pd.DataFrame
         Table of model evaluation metrics and filenames.
     """
-    X_train = _load("X_train_scaled")
-    X_test  = _load("X_test_scaled")
+    if evaluation == "cv":
+        return cross_validate(model_keys, svr_options=svr_options)
+
+    results, to_train = {}, []
+    split = split_fingerprint()                     # hashes the split files; once for every model
+    for key in model_keys:
+        cache_key = train_cache.training_key(available_models()[key][1], split,
+                                             svr_options if key == "svr" else None)
+        entry = None if force_retrain else train_cache.lookup(cache_key)
+        if entry:
+            results[key] = {
+                "Model": entry["label"],
+                "Filename": entry["filename"],
+                **{name: round(value, 3) for name, value in entry["metrics"].items()},
+                "Source": "cache",
+            }
+        else:
+            to_train.append((key, cache_key))
+    if not to_train:                                # every model was cached: no data is loaded
+        return pd.DataFrame([results[key] for key in model_keys])
+
+    X_train_scaled = _load("X_train_scaled").to_numpy()
+    X_test_scaled  = _load("X_test_scaled").to_numpy()
     y_train = _load("y_train").squeeze()
     y_test  = _load("y_test").squeeze()
+    X_train = _load("X_train")                      # raw: column order and dtypes for the bundle
+    scaler = load_scaler()
 
-    results = []
     timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
     base_name = os.path.splitext(dataset_name)[0]
 
-    for key in model_keys:
+    for key, cache_key in to_train:
         label, model = available_models()[key]
-
-        # Special handling for SVR (requires target scaling)
-        if key == "svr":
-            y_scaler = StandardScaler()
-            y_train_scaled = y_scaler.fit_transform(y_train.to_numpy().reshape(-1, 1)).ravel()
-            model.fit(X_train, y_train_scaled)
-            y_pred_scaled = model.predict(X_test).reshape(-1, 1)
-            y_pred = y_scaler.inverse_transform(y_pred_scaled).ravel()
-            model_bundle = {"model": model, "y_scaler": y_scaler}
-        else:
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-            model_bundle = {"model": model, "y_scaler": None}
+        y_pred, model_bundle = fit_predict(key, model, X_train_scaled, y_train, X_test_scaled, svr_options)
+        model_bundle = with_preprocessing(model_bundle, scaler, X_train, y_train.name)
+        svr_path = model_bundle.get("svr", {})
+        if svr_path.get("path", "exact") != "exact":
+            label = f"{label} ({SVR_APPROXIMATIONS[svr_path['path']]}, {svr_path['components']} components)"
 
         # Save model with timestamped name
         fname = f"{base_name}_{key}_{timestamp}.pkl"
-        model_path = os.path.join(MODEL_DIR, fname)
-        with open(model_path, "wb") as f:
-            pickle.dump(model_bundle, f)
+        save_model(model_bundle, fname)
+        metrics = regression_metrics(y_test, y_pred)
+        train_cache.store(cache_key, fname, label, metrics)
 
-        # Evaluate model
-        mse = mean_squared_error(y_test, y_pred)
-        rmse = np.sqrt(mse)
-        mae = mean_absolute_error(y_test, y_pred)
-        r2  = r2_score(y_test, y_pred)
-
-        results.append({
+        results[key] = {
             "Model": label,
             "Filename": fname,
-            "MSE": round(mse, 3),
-            "RMSE": round(rmse, 3),
-            "MAE": round(mae, 3),
-            "R²": round(r2, 3),
-        })
+            **{name: round(value, 3) for name, value in metrics.items()},
+            "Source": "trained",
+        }
+
+    return pd.DataFrame([results[key] for key in model_keys])
 
+
+def save_model(bundle: dict, fname: str) -> None:
+    """Pickle a model bundle into ``MODEL_DIR`` as ``fname``."""
+    with open(os.path.join(MODEL_DIR, fname), "wb") as f:
+        pickle.dump(bundle, f)
+
+
+def with_preprocessing(bundle: dict, scaler, X_train: pd.DataFrame, target: str) -> dict:
+    """
+    Fuse the fitted scaler and the model into one pipeline that takes raw features.
+
+    The bundle also records the feature order and dtypes seen in training, so
+    ``predict`` can check and coerce raw inputs before the single pipeline call.
+    """
+    return {
+        **bundle,
+        "model": Pipeline([("scaler", scaler), ("model", bundle["model"])]),
+        "columns": X_train.columns.tolist(),
+        "dtypes": {col: str(dtype) for col, dtype in X_train.dtypes.items()},
+        "target": target,
+    }
+
+
+# ── Cross-validation ─────────────────────────────────────────────
+_cv_data: dict = {}
+
+
+def _pool_context():
+    """
+    Forkserver context with this module preloaded.
+
+    Workers fork from a single-threaded server (safe under the web server's
+    threads) that has already imported scikit-learn, so they start quickly.
+    """
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload([__name__])
+    return ctx
+
+
+def _init_cv_worker(X: np.ndarray, y: np.ndarray) -> None:
+    """
+    Pool initializer: ship X / y to each worker once instead of with every task.
+
+    The pool already runs one fit per core, so each worker keeps OpenMP / BLAS
+    (gradient boosting, ridge) single-threaded to avoid oversubscription.
+    """
+    _cv_data["X"], _cv_data["y"] = X, y
+    threadpool_limits(1)
+
+
+def _fit_fold(key: str, scaler, train: np.ndarray, test: np.ndarray, svr_options: dict | None = None) -> dict:
+    """Fit ``scaler`` and model ``key`` on one fold's training rows and score its test rows."""
+    X, y = _cv_data["X"], _cv_data["y"]
+    scaler = clone(scaler)
+    if "n_quantiles" in scaler.get_params():
+        scaler.set_params(n_quantiles=min(scaler.n_quantiles, len(train)))
+    X_train = scaler.fit_transform(X[train])            # fitted per fold: no test-row leakage
+    model = single_threaded(available_models()[key][1])
+    y_pred, _ = fit_predict(key, model, X_train, y[train], scaler.transform(X[test]), svr_options)
+    return regression_metrics(y[test], y_pred)
+
+
+def cross_validate(model_keys: list[str], max_workers: int = CV_WORKERS,
+                   svr_options: dict | None = None) -> pd.DataFrame:
+    """
+    Evaluate models on every stored fold and report mean ± std metrics.
+
+    All (model × fold) fits run concurrently in a process pool.  X is scaled
+    inside each fold with the scaler type chosen on the Scaling page
+    (StandardScaler if scaling has not run).  Models are not saved.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per model with ``mean ± std`` of each metric over the folds.
+    """
+    X, y, folds, manifest = load_folds()
+    X = X.to_numpy(dtype=np.float64)
+    y = y.to_numpy(dtype=np.float64)
+    try:
+        scaler = load_scaler()
+    except FileNotFoundError:
+        scaler = StandardScaler()
+
+    tasks = [(key, train, test) for key in model_keys for train, test in folds]
+    workers = max(1, min(max_workers, len(tasks)))
+    if workers == 1:                         # in this (server) process: restore its state afterwards
+        _cv_data["X"], _cv_data["y"] = X, y
+        try:
+            with threadpool_limits(1):
+                scores = [_fit_fold(key, scaler, train, test, svr_options) for key, train, test in tasks]
+        finally:
+            _cv_data.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                                 initializer=_init_cv_worker, initargs=(X, y)) as pool:
+            scores = list(pool.map(_fit_fold, *zip(*[(key, scaler, tr, te, svr_options) for key, tr, te in tasks])))
+
+    per_fold = pd.DataFrame(scores)
+    per_fold["key"] = [key for key, _, _ in tasks]
+    results = []
+    for key in model_keys:
+        fold_scores = per_fold[per_fold["key"] == key].drop(columns="key")
+        results.append({
+            "Model": available_models()[key][0],
+            "Folds": f"{len(fold_scores)} ({manifest['method']})",
+            **{name: f"{fold_scores[name].mean():.3f} ± {fold_scores[name].std(ddof=0):.3f}"
+               for name in fold_scores.columns},
+        })
     return pd.DataFrame(results)
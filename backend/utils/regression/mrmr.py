@@ -0,0 +1,97 @@
+"""
+Minimum-redundancy maximum-relevance (mRMR) feature selection.
+
+Features are picked greedily.  Each candidate is scored by its relevance (the
+absolute Pearson correlation with the target) against its redundancy (the
+mean absolute correlation with the features already picked), either as a
+difference (MID) or a quotient (MIQ).
+
+The feature matrix is standardised once into float32.  After that, the
+correlation of every candidate with a newly picked feature is a single
+matrix–vector product.  Those correlations are added to a running
+redundancy sum, so step *t* costs O(n·p) instead of O(n·p·t).  Large data is
+scored on a seeded row sample.
+"""
+
+import numpy as np
+import pandas as pd
+
+MRMR_SCHEMES = ("difference", "quotient")
+SAMPLE_ROWS = 20_000
+
+
+def _standardise(x: np.ndarray) -> np.ndarray:
+    """Mean-impute, centre and scale to unit variance (constant columns become 0)."""
+    means = np.nan_to_num(np.nanmean(x, axis=0))
+    x = np.where(np.isnan(x), means, x).astype(np.float32, copy=False)
+    x -= x.mean(axis=0)
+    std = x.std(axis=0)
+    x /= np.where(std > 0, std, 1)
+    return x
+
+
+def mrmr_select(df: pd.DataFrame, target: str, k: int = 10, features: list | None = None,
+                scheme: str = "difference", sample_rows: int = SAMPLE_ROWS) -> pd.DataFrame:
+    """
+    Pick ``k`` relevant, mutually non-redundant features.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset.
+    target : str
+        Numeric target column.
+    k : int
+        Number of features to select.
+    features : list, optional
+        Candidates; defaults to every numeric column except the target.
+    scheme : str
+        ``"difference"`` (relevance − redundancy) or ``"quotient"``
+        (relevance / redundancy).
+    sample_rows : int
+        Row sample used on large data.
+
+    Returns
+    -------
+    pd.DataFrame
+        Selected features in pick order with ``relevance``, ``redundancy`` and
+        ``score`` at the time each was picked.
+    """
+    if target not in df.columns:
+        raise ValueError(f"Target '{target}' not found.")
+    if scheme not in MRMR_SCHEMES:
+        raise ValueError(f"Scheme must be one of {', '.join(MRMR_SCHEMES)}.")
+    names = features or [c for c, dtype in df.dtypes.items()          # select_dtypes would copy df
+                         if pd.api.types.is_numeric_dtype(dtype)
+                         and not pd.api.types.is_bool_dtype(dtype) and c != target]
+    if not names:
+        raise ValueError("No candidate features.")
+
+    # sample row positions first so only the sampled rows of a wide frame are copied
+    rows = np.flatnonzero(df[target].notna().to_numpy())
+    if len(rows) > sample_rows:
+        rows = np.sort(np.random.default_rng(42).choice(rows, sample_rows, replace=False))
+    data = df.iloc[rows]
+    z = _standardise(data[names].to_numpy(dtype=np.float32, na_value=np.nan))
+    y = _standardise(data[[target]].to_numpy(dtype=np.float32))[:, 0]
+    n = max(len(z), 1)
+
+    relevance = np.abs(z.T @ y) / n
+    redundancy_sum = np.zeros(len(names), dtype=np.float32)
+    available = np.ones(len(names), dtype=bool)
+    picks = []
+
+    for step in range(min(k, len(names))):
+        redundancy = redundancy_sum / step if step else np.zeros_like(redundancy_sum)
+        if scheme == "difference":
+            score = relevance - redundancy
+        else:
+            score = relevance / np.maximum(redundancy, 1e-6) if step else relevance
+        score = np.where(available, score, -np.inf)
+        best = int(np.argmax(score))
+        picks.append((names[best], relevance[best], redundancy[best], score[best]))
+        available[best] = False
+        redundancy_sum += np.abs(z.T @ z[:, best]) / n       # correlations with the new pick
+
+    return pd.DataFrame(picks, columns=["feature", "relevance", "redundancy", "score"]).astype(
+        {"relevance": np.float64, "redundancy": np.float64, "score": np.float64})
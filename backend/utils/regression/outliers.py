@@ -4,6 +4,8 @@ import numpy as np
 import plotly.express as px
 from scipy.stats import skew, kurtosis
 from backend.utils.regression.session_state import get_active_dataset
+from backend.utils.regression.fingerprint import dataset_version
+from backend.utils.regression.plot_cache import cached_plot_json
 
 # Directories
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -48,44 +50,54 @@ def get_numeric_columns_for_outliers() -> list:
         return []
 
 # 📊 Generate boxplot and suggest method
-def generate_outlier_plot(column: str):
+def _suggest_method(col_data: pd.Series) -> str:
+    """Picks a treatment from the column's skew and kurtosis."""
+    skew_val = skew(col_data)
+    kurt_val = kurtosis(col_data, fisher=False)
+
+    if abs(skew_val) < 0.5 and kurt_val < 3.5:
+        return "zscore"
+    elif abs(skew_val) < 1.0:
+        return "iqr"
+    return "capping"
+
+def outlier_figure(df: pd.DataFrame, column: str):
+    """Boxplot (with every point) of one column."""
+    fig = px.box(df, y=column, template="plotly_dark", points="all")
+    fig.update_layout(
+        title=f"Outlier Distribution: {column}",
+        yaxis_title=column,
+        margin=dict(l=30, r=30, t=40, b=20),
+        height=400
+    )
+    return fig
+
+def outlier_suggestion(column: str) -> Optional[str]:
+    """Suggested outlier method for a column of the active cleaned dataset (None if unavailable)."""
+    path = _get_cleaned_path()
+    if not path:
+        return None
+    try:
+        col_data = pd.read_csv(path, usecols=[column])[column].dropna()
+        return _suggest_method(col_data)
+    except Exception:
+        return None
+
+def outlier_plot_json(column: str, binary: bool = True) -> tuple[str, str]:
     """
-    Generates a boxplot and suggests the best method to treat outliers.
+    Figure JSON of the outlier boxplot, served from the plot cache.
 
     Returns:
-        (str: HTML of plot, str: suggested method)
+        (str: ETag, str: figure JSON)
     """
     path = _get_cleaned_path()
     if not path:
-        return None, None
-    try:
-        df = pd.read_csv(path)
-        if column not in df.columns:
-            return None, None
-
-        col_data = df[column].dropna()
-        skew_val = skew(col_data)
-        kurt_val = kurtosis(col_data, fisher=False)
-
-        # Suggest method based on skew and kurtosis
-        if abs(skew_val) < 0.5 and kurt_val < 3.5:
-            suggestion = "zscore"
-        elif abs(skew_val) < 1.0:
-            suggestion = "iqr"
-        else:
-            suggestion = "capping"
-
-        fig = px.box(df, y=column, template="plotly_dark", points="all")
-        fig.update_layout(
-            title=f"Outlier Distribution: {column}",
-            yaxis_title=column,
-            margin=dict(l=30, r=30, t=40, b=20),
-            height=400
-        )
-
-        return fig.to_html(full_html=False, config={"displayModeBar": False}), suggestion
-    except Exception:
-        return None, None
+        raise ValueError("No active dataset selected.")
+    df = pd.read_csv(path)
+    if column not in df.columns:
+        raise KeyError(f"Column '{column}' not found.")
+    return cached_plot_json(os.path.basename(path), dataset_version(df), "outliers", [column], {},
+                            lambda: outlier_figure(df, column), binary=binary)
 
 # 🧮 Apply outlier handling method
 def handle_outliers(column: str, method: str):
@@ -0,0 +1,293 @@
+"""
+Content-addressed cache for generated Plotly artifacts.
+
+Entries are keyed by (dataset version, plot type, column(s), parameters) and
+stored on disk as ``<dataset>__<version>__<key>.html`` (or ``.json`` for figure
+JSON served by the plot API) under static/plots/cache.
+A new dataset version drops every entry of the old one (after a short grace
+period), the directory is kept under ``PLOT_CACHE_MAX_MB`` by evicting the
+least recently used files, and concurrent requests for one entry build it once.
+"""
+
+import base64
+import json
+import hashlib
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Union
+
+import numpy as np
+from plotly.io import to_html
+import plotly.graph_objects as go
+
+from backend.config import PLOT_CACHE_MAX_MB
+from backend.utils.compression import SIDECAR_SUFFIXES, write_sidecars
+
+# ── Paths ────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/plots/cache"))
+CACHE_URL = "/static/plots/cache"
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+MAX_CACHE_BYTES = PLOT_CACHE_MAX_MB * 1024 * 1024
+STALE_GRACE_SECONDS = 60   # how long an old-version entry stays servable
+CACHE_FORMAT = 6  # bump whenever figure builders change so stale entries miss
+
+_lock = threading.Lock()
+_inflight: dict[str, threading.Lock] = {}   # per-entry locks of builds in progress
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+Artifact = Union[go.Figure, str]
+
+
+# ── Keys ─────────────────────────────────────────────────────────
+def _namespace(dataset_name: str, scope: str = "") -> str:
+    """
+    Filesystem-safe prefix identifying the dataset (and optional column scope)
+    an entry belongs to.  Entries of one namespace share a single live version.
+    """
+    ns = re.sub(r"[^\w\-]", "_", Path(dataset_name or "dataset").stem)
+    if scope:
+        tag = hashlib.sha1(scope.encode("utf-8")).hexdigest()[:6]
+        safe_scope = re.sub(r"[^\w]", "_", scope)[:40]
+        ns = f"{ns}--{safe_scope}-{tag}"
+    return ns
+
+
+def plot_key(version: str, plot_type: str, columns: list, params: dict | None = None) -> str:
+    """Hash of everything that determines how a figure looks."""
+    payload = json.dumps(
+        {"fmt": CACHE_FORMAT, "v": version, "type": plot_type,
+         "cols": list(columns), "params": params or {}},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+# ── Internal helpers ─────────────────────────────────────────────
+def _write_atomic(path: str, text: str) -> None:
+    data = text.encode("utf-8")
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    write_sidecars(path, data)  # pre-compressed copies for the static file server
+
+
+def _sidecars(path: str) -> list[str]:
+    return [path + suffix for suffix in SIDECAR_SUFFIXES.values()]
+
+
+def _is_sidecar(fname: str) -> bool:
+    return fname.endswith(tuple(SIDECAR_SUFFIXES.values()))
+
+
+def _plain_arrays(obj):
+    """Replace Plotly's base64 typed arrays (``{"dtype", "bdata"}``) with plain lists."""
+    if isinstance(obj, dict):
+        if "bdata" in obj and "dtype" in obj:
+            arr = np.frombuffer(base64.b64decode(obj["bdata"]), dtype=obj["dtype"])
+            if "shape" in obj:
+                arr = arr.reshape([int(n) for n in str(obj["shape"]).split(",")])
+            return arr.tolist()
+        return {k: _plain_arrays(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_plain_arrays(v) for v in obj]
+    return obj
+
+
+def figure_json(fig: go.Figure, binary: bool = True) -> str:
+    """
+    Compact figure JSON for ``Plotly.newPlot``.
+
+    NumPy arrays are emitted as base64 typed arrays, which plotly.js decodes
+    natively; ``binary=False`` expands them to plain lists for other clients.
+    """
+    text = fig.to_json()
+    if not binary:
+        text = json.dumps(_plain_arrays(json.loads(text)), separators=(",", ":"))
+    return text
+
+
+def _render(artifact: Artifact, kind: str, binary: bool = True) -> str:
+    if not isinstance(artifact, go.Figure):
+        return artifact
+    if kind == "json":
+        return figure_json(artifact, binary)
+    # plotly.js comes from the CDN so entries stay small and the browser caches it once
+    return to_html(artifact, full_html=kind == "page", include_plotlyjs="cdn")
+
+
+def _invalidate_old_versions(namespace: str, version: str) -> None:
+    # entries used within the grace period may still be referenced by a page
+    # another request is rendering; they are left to a later pass or the quota
+    prefix = f"{namespace}__"
+    current = f"{namespace}__{version}__"
+    cutoff = time.time() - STALE_GRACE_SECONDS
+    for f in os.listdir(CACHE_DIR):
+        if f.startswith(prefix) and not f.startswith(current):
+            try:
+                if os.path.getmtime(os.path.join(CACHE_DIR, f)) > cutoff:
+                    continue
+                os.remove(os.path.join(CACHE_DIR, f))
+                _stats["invalidations"] += not _is_sidecar(f)
+            except OSError:
+                pass
+
+
+def _evict_to_quota() -> None:
+    # an entry is its file plus compressed sidecars; recency comes from the file itself
+    entries = {}
+    for f in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, f)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        base = path.rsplit(".", 1)[0] if _is_sidecar(f) else path
+        mtime, size = entries.get(base, (0.0, 0))
+        entries[base] = (st.st_mtime if base == path else mtime, size + st.st_size)
+
+    total = sum(size for _, size in entries.values())
+    for base, (_, size) in sorted(entries.items(), key=lambda kv: kv[1][0]):
+        if total <= MAX_CACHE_BYTES:
+            break
+        for path in [base, *_sidecars(base)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+        _stats["evictions"] += 1
+
+
+def _touch(path: str) -> bool:
+    """Mark an entry as recently used; False when it does not exist."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    for sidecar in _sidecars(path):  # sidecars must stay at least as new as the file
+        try:
+            os.utime(sidecar)
+        except FileNotFoundError:
+            pass
+    return True
+
+
+def _read_hit(path: str, want_text: bool) -> tuple[bool, str | None]:
+    """(hit, text) for an existing entry; a concurrent eviction counts as a miss."""
+    if not _touch(path):
+        return False, None
+    if not want_text:
+        return True, None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return True, f.read()
+    except FileNotFoundError:
+        return False, None
+
+
+def _get_or_build(dataset_name: str, version: str, plot_type: str, columns: list,
+                  params: dict | None, build: Callable[[], Artifact],
+                  kind: str, scope: str = "", want_text: bool = False) -> tuple[str, str | None]:
+    """
+    Return (file name, text); text is filled in when ``want_text`` or just built.
+
+    ``kind`` is ``"page"`` (standalone HTML) or ``"json"`` / ``"json-plain"``
+    (figure JSON with binary or list arrays).
+    Concurrent requests for the same entry build it once: later callers wait
+    on a per-entry lock and then read the result.
+    """
+    namespace = _namespace(dataset_name, scope)
+    key = plot_key(version, f"{plot_type}:{kind}", columns, params)
+    ext = "json" if kind.startswith("json") else "html"
+    fname = f"{namespace}__{version}__{key}.{ext}"
+    path = os.path.join(CACHE_DIR, fname)
+
+    hit, text = _read_hit(path, want_text)
+    if not hit:
+        with _lock:
+            flight = _inflight.setdefault(fname, threading.Lock())
+        try:
+            with flight:
+                hit, text = _read_hit(path, want_text)   # built while we waited?
+                if not hit:
+                    text = _render(build(), kind.split("-")[0], binary=kind != "json-plain")
+                    with _lock:
+                        _stats["misses"] += 1
+                        _invalidate_old_versions(namespace, version)
+                        _write_atomic(path, text)
+                        _evict_to_quota()
+                    return fname, text
+        finally:
+            with _lock:
+                if _inflight.get(fname) is flight:   # a later build may own a fresh lock
+                    del _inflight[fname]
+
+    with _lock:
+        _stats["hits"] += 1
+    return fname, text
+
+
+# ── Public API ───────────────────────────────────────────────────
+def cached_plot_file(dataset_name: str, version: str, plot_type: str, columns: list,
+                     params: dict | None, build: Callable[[], Artifact], scope: str = "") -> str:
+    """
+    Return the static URL of a standalone HTML plot, building it only on a miss.
+
+    ``build`` is called with no arguments and must return a Plotly figure
+    (or a ready HTML page).  Pass a column name as ``scope`` together with
+    that column's fingerprint as ``version`` to make the entry survive edits
+    of other columns.
+    """
+    fname, _ = _get_or_build(dataset_name, version, plot_type, columns, params, build,
+                             kind="page", scope=scope)
+    return f"{CACHE_URL}/{fname}"
+
+
+def cached_plot_json(dataset_name: str, version: str, plot_type: str, columns: list,
+                     params: dict | None, build: Callable[[], go.Figure], scope: str = "",
+                     binary: bool = True) -> tuple[str, str]:
+    """
+    Return ``(etag, figure JSON)``, building the figure only on a miss.
+
+    The entry key doubles as a strong ETag: it changes exactly when the
+    dataset version, plot parameters or figure builders change.
+    """
+    kind = "json" if binary else "json-plain"
+    fname, text = _get_or_build(dataset_name, version, plot_type, columns, params, build,
+                                kind=kind, scope=scope, want_text=True)
+    return fname.rsplit("__", 1)[-1].split(".")[0], text
+
+
+def purge_dataset(dataset_name: str) -> None:
+    """Remove every cached artifact belonging to a dataset (raw or cleaned)."""
+    base = _namespace(dataset_name)
+    if base.endswith("_cleaned"):
+        base = base[: -len("_cleaned")]
+    with _lock:
+        for f in os.listdir(CACHE_DIR):
+            if f.startswith((f"{base}__", f"{base}--", f"{base}_cleaned__", f"{base}_cleaned--")):
+                try:
+                    os.remove(os.path.join(CACHE_DIR, f))
+                except OSError:
+                    pass
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for this process plus the current disk footprint."""
+    all_files = os.listdir(CACHE_DIR)
+    files = [f for f in all_files if not _is_sidecar(f)]
+    size = sum(os.path.getsize(os.path.join(CACHE_DIR, f)) for f in all_files)
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+        "entries": len(files),
+        "bytes": size,
+        "quota_bytes": MAX_CACHE_BYTES,
+    }
@@ -7,14 +7,13 @@ import numpy as np
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
 from backend.utils.regression.session_state import get_active_dataset
+from backend.utils.regression.split_store import load_split
 
 # ── Directory setup ───────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SPLIT_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/splits"))
 MODEL_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/models"))
 PRED_DIR  = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/predictions"))
 
-os.makedirs(SPLIT_DIR, exist_ok=True)
 os.makedirs(MODEL_DIR, exist_ok=True)
 os.makedirs(PRED_DIR, exist_ok=True)
 
@@ -46,14 +45,35 @@ def _load_model(key: str):
 # ── Load X_test or y_test ─────────────────────────────────────────
 def _load_split(name: str) -> pd.DataFrame:
     """
-    Load split CSV using active dataset's name as prefix.
+    Materialise a split of the active dataset from its stored row indices.
     """
-    base = Path(get_active_dataset()).stem
-    fname = f"{base}_{name}.csv"
-    path = os.path.join(SPLIT_DIR, fname)
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"{fname} not found — run prior steps.")
-    return pd.read_csv(path)
+    return load_split(name)
+
+
+# ── Inputs ────────────────────────────────────────────────────────
+def _prepare(df: pd.DataFrame, bundle: dict) -> pd.DataFrame:
+    """
+    Raw features in training order and dtypes; extra columns are ignored.
+    """
+    missing = [c for c in bundle["columns"] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Input is missing feature column(s): {', '.join(missing)}")
+    try:
+        return df[bundle["columns"]].astype(bundle["dtypes"])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Input columns do not match the training dtypes: {e}") from e
+
+
+def test_inputs(model_key: str) -> pd.DataFrame:
+    """
+    X_test in the form the model expects: raw features for bundles that carry
+    their own preprocessing, X_test_scaled for models saved before that.
+    """
+    obj = _load_model(model_key)
+    raw = isinstance(obj, dict) and "columns" in obj
+    df = _load_split("X_test" if raw else "X_test_scaled")
+    df.attrs["source_name"] = "X_test"
+    return df
 
 
 # ── Predict using a model ─────────────────────────────────────────
@@ -66,7 +86,8 @@ def predict(model_key: str, df: pd.DataFrame, include_metrics: bool = False) ->
     model_key : str
         Model identifier (from list_models()).
     df : pd.DataFrame
-        Feature matrix to predict on (usually X_test_scaled).
+        Feature matrix to predict on.  Raw (unscaled) features for bundles
+        saved with their preprocessing; already scaled ones for older models.
     include_metrics : bool
         Whether to compute and return test set metrics.
 
@@ -81,11 +102,13 @@ def predict(model_key: str, df: pd.DataFrame, include_metrics: bool = False) ->
     """
     obj = _load_model(model_key)
 
-    # Handle model bundle (SVR case with y_scaler)
+    # Handle model bundle (fused preprocessing pipeline, SVR case with y_scaler)
     if isinstance(obj, dict) and "model" in obj:
         model = obj["model"]
         y_scaler = obj.get("y_scaler")
-        y_pred_scaled = model.predict(df).reshape(-1, 1)
+        # float32 like the scaled training arrays, so the scaler reproduces them bit for bit
+        X = _prepare(df, obj).to_numpy(dtype=np.float32) if "columns" in obj else df
+        y_pred_scaled = model.predict(X).reshape(-1, 1)
         preds = (
             y_scaler.inverse_transform(y_pred_scaled).ravel()
             if y_scaler else
@@ -96,7 +119,7 @@ def predict(model_key: str, df: pd.DataFrame, include_metrics: bool = False) ->
         preds = model.predict(df)
 
     # Attach source name to track origin (default to X_test)
-    if "source_name" not in df.attrs or df.attrs["source_name"] == "X_test_scaled":
+    if "source_name" not in df.attrs or df.attrs["source_name"] in ("X_test", "X_test_scaled"):
         df.attrs["source_name"] = get_active_dataset()
 
     # Save predictions
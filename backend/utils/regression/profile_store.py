@@ -0,0 +1,106 @@
+"""
+Per-column profile store.
+
+Column profiles are persisted per dataset and keyed by a fingerprint of the
+column's non-null values.  On refresh only columns whose values changed are
+re-profiled; for every other column just the row-membership statistics
+(row count and null count) are updated.  A fill/encode/smooth of one column
+therefore costs one column, and dropping rows where a column is null leaves
+that column's value statistics untouched.
+"""
+
+import os
+import pickle
+import re
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from backend.config import STORE_DIR as STORE_ROOT
+
+from .fingerprint import column_fingerprint
+from .profiling import ColumnProfile, profile_dataframe
+
+# ── Paths ────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../..", STORE_ROOT, "profiles"))
+os.makedirs(STORE_DIR, exist_ok=True)
+
+_lock = threading.Lock()
+
+
+def _store_path(dataset_name: str) -> str:
+    stem = re.sub(r"[^\w\-]", "_", Path(dataset_name).stem)
+    return os.path.join(STORE_DIR, f"{stem}.pkl")
+
+
+def _load(dataset_name: str) -> dict:
+    path = _store_path(dataset_name)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return {}
+
+
+def _save(dataset_name: str, store: dict) -> None:
+    path = _store_path(dataset_name)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(store, f)
+    os.replace(tmp, path)
+
+
+# ── Public helpers ───────────────────────────────────────────────
+def value_fingerprint(series: pd.Series) -> str:
+    """Fingerprint of a column's non-null values (ignores where the nulls were)."""
+    return column_fingerprint(series.dropna())
+
+
+def column_profiles(df: pd.DataFrame, dataset_name: str) -> dict[str, ColumnProfile]:
+    """
+    Return profiles for every column of ``df``, recomputing only changed columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Current contents of the dataset.
+    dataset_name : str
+        Dataset file name; the store is kept per dataset.
+
+    Returns
+    -------
+    dict[str, ColumnProfile]
+        Profiles in column order.
+    """
+    fps = {col: value_fingerprint(df[col]) for col in df.columns}
+
+    with _lock:
+        store = _load(dataset_name)
+        stale = [c for c in df.columns if store.get(c, {}).get("fp") != fps[c]]
+        fresh = profile_dataframe(df[stale]) if stale else {}
+
+        profiles = {}
+        for col in df.columns:
+            if col in fresh:
+                prof = fresh[col]
+            else:
+                prof = store[col]["profile"]
+                prof.rows = len(df)                      # row-membership stats only
+                prof.nulls = int(df[col].isna().sum())
+            profiles[col] = prof
+
+        _save(dataset_name, {col: {"fp": fps[col], "profile": profiles[col]} for col in df.columns})
+
+    return profiles
+
+
+def drop_store(dataset_name: str) -> None:
+    """Forget every stored profile of a dataset (raw or cleaned)."""
+    for name in (dataset_name, dataset_name.replace(".csv", "_cleaned.csv")):
+        path = _store_path(name)
+        if os.path.exists(path):
+            os.remove(path)
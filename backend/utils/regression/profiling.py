@@ -0,0 +1,209 @@
+"""
+Single-pass column profiling.
+
+Every column is streamed once, chunk by chunk, through a ``ColumnProfile``
+accumulator that keeps:
+
+* count / null count, mean and variance (Chan's parallel Welford merge), min / max
+* quantiles from a fixed-size reservoir sample (exact while the column fits in it)
+* a HyperLogLog sketch for the distinct count
+* a Misra–Gries heavy-hitters table for the top-k modes
+
+Columns of a chunk are updated in parallel threads (the heavy lifting is NumPy /
+pandas code that releases the GIL).  ``profile_chunks`` accepts any chunk
+iterator, e.g. ``pd.read_csv(path, chunksize=...)``, so datasets larger than
+memory can be profiled.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+HLL_PRECISION = 12          # 4096 registers → ~1.6 % standard error
+RESERVOIR_SIZE = 20_000     # quantiles are exact up to this many values
+TOPK_CAPACITY = 64          # heavy-hitter counters kept per column
+DEFAULT_CHUNKSIZE = 100_000
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+# ── HyperLogLog ──────────────────────────────────────────────────
+def _hll_alpha(m: int) -> float:
+    return 0.7213 / (1 + 1.079 / m)
+
+
+def _hll_update(registers: np.ndarray, hashes: np.ndarray) -> None:
+    p = HLL_PRECISION
+    idx = (hashes >> np.uint64(64 - p)).astype(np.int64)
+    # top 32 of the remaining 64-p bits; rank = leading zeros + 1 (capped at 33)
+    rest = ((hashes << np.uint64(p)) >> np.uint64(32)).astype(np.uint32)
+    rank = np.full(rest.shape, 33, dtype=np.uint8)
+    nz = rest > 0
+    rank[nz] = (32 - np.floor(np.log2(rest[nz].astype(np.float64)))).astype(np.uint8)
+    np.maximum.at(registers, idx, rank)
+
+
+def _hll_estimate(registers: np.ndarray) -> int:
+    m = registers.size
+    est = _hll_alpha(m) * m * m / np.sum(np.exp2(-registers.astype(np.float64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if est <= 2.5 * m and zeros:
+        est = m * np.log(m / zeros)  # linear counting for small cardinalities
+    return int(round(est))
+
+
+# ── Accumulator ──────────────────────────────────────────────────
+class ColumnProfile:
+    """Mergeable one-pass statistics for a single column."""
+
+    def __init__(self, name: str, numeric: bool, seed: int = 0):
+        self.name = name
+        self.numeric = numeric
+        self.rows = 0
+        self.nulls = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.reservoir = np.empty(0, dtype=np.float64)
+        self.registers = np.zeros(1 << HLL_PRECISION, dtype=np.uint8)
+        self.heavy: dict = {}
+        self._rng = np.random.default_rng(seed)
+
+    # -- streaming update -----------------------------------------
+    def update(self, values: pd.Series) -> None:
+        self.rows += len(values)
+        mask = values.isna().to_numpy()
+        n_null = int(mask.sum())
+        self.nulls += n_null
+        present = values[~mask]
+        if present.empty:
+            return
+
+        self._update_sketches(present)
+        if self.numeric:
+            self._update_moments(present.to_numpy(dtype=np.float64))
+        else:
+            self.count += len(present)
+
+    def _update_moments(self, arr: np.ndarray) -> None:
+        n_b = arr.size
+        mean_b = float(arr.mean())
+        m2_b = float(((arr - mean_b) ** 2).sum())
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.count = n
+        self.min = float(np.nanmin([self.min, arr.min()]))
+        self.max = float(np.nanmax([self.max, arr.max()]))
+        self._update_reservoir(arr, seen_before=n_a)
+
+    def _update_reservoir(self, arr: np.ndarray, seen_before: int) -> None:
+        free = RESERVOIR_SIZE - self.reservoir.size
+        if free > 0:
+            self.reservoir = np.concatenate([self.reservoir, arr[:free]])
+            arr, seen_before = arr[free:], seen_before + min(free, arr.size)
+        if arr.size == 0:
+            return
+        # Algorithm R, vectorised: item t replaces slot j ~ U[0, t) when j < k
+        t = seen_before + np.arange(1, arr.size + 1)
+        j = (self._rng.random(arr.size) * t).astype(np.int64)
+        keep = j < RESERVOIR_SIZE
+        self.reservoir[j[keep]] = arr[keep]
+
+    def _update_sketches(self, present: pd.Series) -> None:
+        _hll_update(self.registers, pd.util.hash_pandas_object(present, index=False).to_numpy())
+
+        # Misra–Gries merge of this chunk's exact counts
+        for value, cnt in present.value_counts(sort=True).head(4 * TOPK_CAPACITY).items():
+            self.heavy[value] = self.heavy.get(value, 0) + int(cnt)
+        if len(self.heavy) > TOPK_CAPACITY:
+            ranked = sorted(self.heavy.values(), reverse=True)
+            cut = ranked[TOPK_CAPACITY]
+            self.heavy = {k: c - cut for k, c in self.heavy.items() if c > cut}
+
+    # -- results --------------------------------------------------
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    def quantiles(self, qs=(0.25, 0.5, 0.75)) -> list[float]:
+        if self.reservoir.size == 0:
+            return [np.nan] * len(qs)
+        return [float(q) for q in np.quantile(self.reservoir, qs)]
+
+    def distinct(self) -> int:
+        return _hll_estimate(self.registers)
+
+    def top_k(self, k: int = 5) -> list[tuple]:
+        """Most frequent values (ties broken by value) with their approximate counts."""
+        try:
+            items = sorted(self.heavy.items(), key=lambda kv: (-kv[1], kv[0]))
+        except TypeError:  # mixed-type object column
+            items = sorted(self.heavy.items(), key=lambda kv: (-kv[1], str(kv[0])))
+        return items[:k]
+
+    def mode(self):
+        top = self.top_k(1)
+        return top[0][0] if top else np.nan
+
+
+# ── Drivers ──────────────────────────────────────────────────────
+def profile_chunks(chunks: Iterable[pd.DataFrame]) -> dict[str, ColumnProfile]:
+    """Stream DataFrame chunks through per-column accumulators (parallel per chunk)."""
+    profiles: dict[str, ColumnProfile] = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for chunk in chunks:
+            for col in chunk.columns:
+                if col not in profiles:
+                    numeric = pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col])
+                    profiles[col] = ColumnProfile(col, numeric, seed=len(profiles))
+            list(pool.map(lambda c: profiles[c].update(chunk[c]), chunk.columns))
+    return profiles
+
+
+def profile_dataframe(df: pd.DataFrame, chunksize: int = DEFAULT_CHUNKSIZE) -> dict[str, ColumnProfile]:
+    """Profile an in-memory DataFrame in row chunks."""
+    chunks = (df.iloc[i:i + chunksize] for i in range(0, max(len(df), 1), chunksize))
+    return profile_chunks(chunks)
+
+
+def profiles_to_frames(profiles: dict[str, ColumnProfile]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Convert profiles into the (summary, missing) tables shown on the EDA page.
+
+    The summary mirrors ``df.describe().T`` for numeric columns plus
+    median, mode and an estimated distinct count.
+    """
+    rows = {}
+    for name, p in profiles.items():
+        if not p.numeric:
+            continue
+        q25, q50, q75 = p.quantiles()
+        rows[name] = {
+            "count": float(p.count),
+            "mean": p.mean if p.count else np.nan,
+            "std": p.std,
+            "min": p.min,
+            "25%": q25,
+            "50%": q50,
+            "75%": q75,
+            "max": p.max,
+            "median": q50,
+            "mode": p.mode(),
+            "distinct": p.distinct(),
+        }
+    summary = pd.DataFrame.from_dict(rows, orient="index",
+                                     columns=["count", "mean", "std", "min", "25%", "50%",
+                                              "75%", "max", "median", "mode", "distinct"])
+
+    missing = pd.DataFrame({
+        "missing_count": {n: p.nulls for n, p in profiles.items()},
+        "missing_percent": {n: (100 * p.nulls / p.rows if p.rows else 0.0) for n, p in profiles.items()},
+    })
+    return summary, missing
@@ -0,0 +1,100 @@
+"""
+Point-budget sampling for scatter and line plots.
+
+Instead of plotting the first N rows, plots draw a seeded sample of the whole
+dataset that fits a point budget:
+
+* ``uniform``    – simple random rows
+* ``stratified`` – proportional allocation over quantile bins of a column, so
+                   sparse tails keep their share of points
+* ``extremes``   – min/max per index bucket, which preserves spikes and the
+                   envelope of a series (best for line plots)
+
+Returned positions are sorted, so index order (and therefore line plots) is kept.
+"""
+
+import numpy as np
+import pandas as pd
+
+SAMPLING_METHODS = ("uniform", "stratified", "extremes")
+DEFAULT_POINT_BUDGET = 5_000
+WEBGL_THRESHOLD = 2_000      # above this many points switch to scattergl
+STRATA = 10
+
+
+def _uniform(n: int, budget: int, rng: np.random.Generator) -> np.ndarray:
+    return np.sort(rng.choice(n, size=budget, replace=False))
+
+
+def _stratified(values: np.ndarray, budget: int, rng: np.random.Generator) -> np.ndarray:
+    n = values.size
+    finite = values[~np.isnan(values)]
+    edges = np.quantile(finite, np.linspace(0, 1, STRATA + 1)[1:-1]) if finite.size else np.array([])
+    strata = np.searchsorted(edges, values, side="right")       # NaN rows land in the last stratum
+    sizes = np.bincount(strata, minlength=STRATA)
+    quota = np.maximum(np.floor(sizes * budget / n), sizes > 0).astype(np.int64)
+
+    picks = np.concatenate([
+        rng.choice(np.flatnonzero(strata == k), size=min(quota[k], sizes[k]), replace=False)
+        for k in range(len(sizes)) if sizes[k]
+    ])
+    if picks.size > budget:                     # one point per tiny stratum can overshoot
+        picks = rng.choice(picks, size=budget, replace=False)
+    return np.sort(picks)
+
+
+def _extremes(values: np.ndarray, budget: int) -> np.ndarray:
+    n = values.size
+    if np.isnan(values).all():                  # nothing to plot
+        return np.array([], dtype=np.int64)
+    buckets = max(budget // 2, 1)
+    bucket = np.arange(n) * buckets // n
+    s = pd.Series(np.where(np.isnan(values), np.nanmean(values), values))
+    grouped = s.groupby(bucket)
+    picks = np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()])
+    return np.unique(picks)
+
+
+def sample_positions(df: pd.DataFrame, budget: int | None, method: str = "uniform",
+                     column: str | None = None, seed: int = 42) -> np.ndarray:
+    """
+    Row positions (sorted) of a reproducible sample of at most ``budget`` rows.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Data to sample.
+    budget : int or None
+        Maximum number of points; ``None`` keeps every row.
+    method : str
+        One of ``SAMPLING_METHODS``.
+    column : str, optional
+        Column used by the stratified and extremes methods.
+    seed : int
+        Random seed, so the same request draws the same points.
+    """
+    n = len(df)
+    if budget is None or n <= budget:
+        return np.arange(n)
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Sampling method must be one of {', '.join(SAMPLING_METHODS)}.")
+
+    rng = np.random.default_rng(seed)
+    if method == "uniform" or column is None:
+        return _uniform(n, budget, rng)
+    values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+    if method == "stratified":
+        return _stratified(values, budget, rng)
+    return _extremes(values, budget)
+
+
+def sample_frame(df: pd.DataFrame, budget: int | None, method: str = "uniform",
+                 column: str | None = None, seed: int = 42) -> pd.DataFrame:
+    """``df`` restricted to :func:`sample_positions` (original index kept)."""
+    pos = sample_positions(df, budget, method, column, seed)
+    return df if len(pos) == len(df) else df.iloc[pos]
+
+
+def render_mode(n_points: int) -> str:
+    """Plotly Express render mode for a trace with ``n_points`` points."""
+    return "webgl" if n_points > WEBGL_THRESHOLD else "svg"
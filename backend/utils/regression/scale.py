@@ -1,20 +1,47 @@
+"""
+Scaling stage.
+
+The scaler is fitted on the training rows of the stored split and kept with it
+(see ``split_store``).  Fitting and transforming stream over the processing
+CSV in chunks, so memory stays bounded by the chunk size:
+
+* ``standard`` / ``minmax`` are fitted exactly with ``partial_fit``
+* ``robust`` / ``quantile`` / ``power`` need order statistics or a likelihood
+  fit, so they are fitted on a uniform sketch of at most ``SKETCH_ROWS``
+  training rows that is collected during the same pass
+
+A second pass writes the scaled train / test features as float32 ``.npy`` files
+whose rows follow the split order.  Later stages memory-map them instead of
+re-scaling.
+"""
+
 import os
-from pathlib import Path
+
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from sklearn.preprocessing import (MinMaxScaler, PowerTransformer, QuantileTransformer, RobustScaler,
+                                   StandardScaler)
 
-from backend.utils.regression.session_state import get_active_dataset
+from backend.utils.regression.session_state import get_processing_dataset_path
+from backend.utils.regression.split_store import (check_version, load_indices, load_manifest, load_split,
+                                                  save_scaled_meta, save_scaler, scaled_array_path)
 
-# ── Directory Setup ───────────────────────────────────────────────
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SPLIT_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/splits"))
-os.makedirs(SPLIT_DIR, exist_ok=True)
+SCALERS = {
+    "standard": "StandardScaler (z‑score)",
+    "minmax": "MinMaxScaler (0‑1)",
+    "robust": "RobustScaler (median / IQR)",
+    "quantile": "QuantileTransformer (normal output)",
+    "power": "PowerTransformer (Yeo‑Johnson)",
+}
+STREAMING_SCALERS = ("standard", "minmax")      # exact partial_fit; the rest use the sketch
+CHUNK_ROWS = 100_000
+SKETCH_ROWS = 200_000
 
 
-# ── Load split file with dataset prefix ───────────────────────────
+# ── Load split by name ────────────────────────────────────────────
 def _load_split(name: str) -> pd.DataFrame:
     """
-    Load a split CSV file with dataset name prefix.
+    Materialise a split from its stored row indices.
 
     Parameters
     ----------
@@ -26,49 +53,108 @@ def _load_split(name: str) -> pd.DataFrame:
     pd.DataFrame
         Loaded DataFrame.
     """
-    base = Path(get_active_dataset()).stem
-    filename = f"{base}_{name}.csv"
-    path = os.path.join(SPLIT_DIR, filename)
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"{filename} not found. Run Train‑Test Split first.")
-    return pd.read_csv(path)
+    return load_split(name)
+
+
+def _make_scaler(scaler_type: str):
+    if scaler_type == "standard":
+        return StandardScaler()
+    if scaler_type == "minmax":
+        return MinMaxScaler(feature_range=(0, 1))
+    if scaler_type == "robust":
+        return RobustScaler()
+    if scaler_type == "quantile":
+        return QuantileTransformer(output_distribution="normal", n_quantiles=1_000, random_state=42)
+    if scaler_type == "power":
+        return PowerTransformer(method="yeo-johnson")
+    raise ValueError(f"Scaler type must be one of {', '.join(SCALERS)}.")
 
 
-# ── Apply Scaler to Train/Test Splits ─────────────────────────────
-def apply_scaler(scaler_type: str) -> dict:
+def csv_chunks(columns: list, chunk_rows: int, n_rows: int):
+    """(first row position, float32 block) per CSV chunk of ``columns``, up to row ``n_rows``."""
+    start = 0
+    for chunk in pd.read_csv(get_processing_dataset_path(), usecols=columns, chunksize=chunk_rows):
+        if start >= n_rows:
+            break
+        yield start, chunk[columns].iloc[:n_rows - start].to_numpy(dtype=np.float32, na_value=np.nan)
+        start += len(chunk)
+
+
+def _positions(idx: np.ndarray, n_rows: int) -> np.ndarray:
+    """Row position → position in the split (−1 for rows outside it)."""
+    pos = np.full(n_rows, -1, dtype=np.int64)
+    pos[idx] = np.arange(len(idx))
+    return pos
+
+
+# ── Fit Scaler on the Train Split ─────────────────────────────────
+def apply_scaler(scaler_type: str, chunk_rows: int = CHUNK_ROWS) -> dict:
     """
-    Apply the selected scaler to X_train and X_test splits.
+    Fit the selected scaler on X_train and write scaled float32 train / test features.
 
     Parameters
     ----------
     scaler_type : str
-        "standard" for StandardScaler, "minmax" for MinMaxScaler.
+        One of ``SCALERS``.
+    chunk_rows : int
+        Rows parsed per CSV chunk; bounds the memory used.
 
     Returns
     -------
     dict
         Preview (head) of scaled X_train and X_test DataFrames.
     """
-    base = Path(get_active_dataset()).stem
-    X_train = _load_split("X_train")
-    X_test = _load_split("X_test")
+    scaler = _make_scaler(scaler_type)
+    manifest = load_manifest()
+    check_version(manifest)                          # stored row positions must still match the file
+    columns = manifest["X"]
+    train_idx, test_idx = np.asarray(load_indices("train")), np.asarray(load_indices("test"))
+    n_rows = int(max(train_idx.max(initial=-1), test_idx.max(initial=-1))) + 1
+    train_pos, test_pos = _positions(train_idx, n_rows), _positions(test_idx, n_rows)
 
-    if scaler_type == "standard":
-        scaler = StandardScaler()
-    elif scaler_type == "minmax":
-        scaler = MinMaxScaler(feature_range=(0, 1))
-    else:
-        raise ValueError("Scaler type must be 'standard' or 'minmax'.")
-
-    # Apply scaling
-    X_train_scaled = pd.DataFrame(scaler.fit_transform(X_train), columns=X_train.columns)
-    X_test_scaled = pd.DataFrame(scaler.transform(X_test), columns=X_test.columns)
+    # pass 1: fit (exact partial_fit, or collect a uniform sketch of training rows)
+    streaming = scaler_type in STREAMING_SCALERS
+    if not streaming:
+        sketch_rows = np.sort(np.random.default_rng(42).choice(
+            train_idx, min(SKETCH_ROWS, len(train_idx)), replace=False))
+        sketch = []
+    for start, block in csv_chunks(columns, chunk_rows, n_rows):
+        rows = np.arange(start, start + len(block))
+        if streaming:
+            in_train = train_pos[rows] >= 0
+            if in_train.any():
+                scaler.partial_fit(block[in_train])
+        else:
+            lo, hi = np.searchsorted(sketch_rows, [start, start + len(block)])
+            sketch.append(block[sketch_rows[lo:hi] - start])
+    if not streaming:
+        sketch = np.vstack(sketch)
+        if scaler_type == "quantile":
+            scaler.set_params(n_quantiles=min(scaler.n_quantiles, len(sketch)))
+        scaler.fit(sketch)
+    save_scaler(scaler)
 
-    # Save scaled splits
-    X_train_scaled.to_csv(os.path.join(SPLIT_DIR, f"{base}_X_train_scaled.csv"), index=False)
-    X_test_scaled.to_csv(os.path.join(SPLIT_DIR, f"{base}_X_test_scaled.csv"), index=False)
+    # pass 2: transform each chunk straight into float32 arrays in split order
+    outputs = {
+        part: np.lib.format.open_memmap(f"{scaled_array_path(part)}.tmp", mode="w+", dtype=np.float32,
+                                        shape=(len(idx), len(columns)))
+        for part, idx in (("train", train_idx), ("test", test_idx))
+    }
+    for start, block in csv_chunks(columns, chunk_rows, n_rows):
+        rows = np.arange(start, start + len(block))
+        for part, pos in (("train", train_pos), ("test", test_pos)):
+            target = pos[rows]
+            keep = target >= 0
+            if keep.any():
+                outputs[part][target[keep]] = scaler.transform(block[keep])
+    for array in outputs.values():
+        array.flush()
+    outputs.clear()                                  # closes the memmaps
+    for part in ("train", "test"):
+        os.replace(f"{scaled_array_path(part)}.tmp", scaled_array_path(part))
+    save_scaled_meta(scaler=scaler_type, columns=columns)
 
     return {
-        "X_train_scaled": X_train_scaled.head(5),
-        "X_test_scaled": X_test_scaled.head(5),
+        "X_train_scaled": _load_split("X_train_scaled").head(5),
+        "X_test_scaled": _load_split("X_test_scaled").head(5),
     }
@@ -0,0 +1,344 @@
+"""
+Index-based train/test splits.
+
+A split is not a copy of the data.  It is stored as:
+
+* ``<stem>_train_idx.npy`` / ``<stem>_test_idx.npy`` – row positions into the
+  processing dataset (int32 when they fit)
+* ``<stem>_split.json`` – manifest with the dataset file, its version, the X / y
+  columns and how the split was made
+* ``<stem>_scaler.pkl`` – the scaler fitted on the training rows, once scaling ran
+* ``<stem>_X_train_scaled.npy`` / ``<stem>_X_test_scaled.npy`` – float32 scaled
+  features written by the scaling stage, read back memory-mapped
+* ``<stem>_folds.npz`` / ``<stem>_folds.json`` – train/test row positions of
+  every cross-validation fold and their manifest
+
+Frames such as ``X_train`` or ``X_test_scaled`` are materialised on demand by
+:func:`load_split`.  The X ∪ y columns are parsed once and kept in memory per file
+modification time.  Index arrays are memory-mapped, and contiguous row ranges
+(sequential splits) become slices, i.e. views rather than copies.  A split whose
+dataset changed since it was made is rejected instead of silently misaligned.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .fingerprint import dataset_version
+from .session_state import get_active_dataset, get_processing_dataset_path
+
+# ── Paths ────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SPLIT_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/splits"))
+os.makedirs(SPLIT_DIR, exist_ok=True)
+
+SPLIT_NAMES = ("X_train", "X_test", "y_train", "y_test", "X_train_scaled", "X_test_scaled")
+SCALER_FILES = ("scaler.pkl", "scaled.json", "X_train_scaled.npy", "X_test_scaled.npy")
+
+_lock = threading.Lock()
+_frame_cache: dict = {}     # one entry: (path, mtime, columns) -> (frame, version)
+
+
+def _stem() -> str:
+    return Path(get_active_dataset()).stem
+
+
+def _path(suffix: str, stem: str | None = None) -> str:
+    return os.path.join(SPLIT_DIR, f"{stem or _stem()}_{suffix}")
+
+
+def _save_atomic(path: str, write) -> None:
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _compact(idx: np.ndarray) -> np.ndarray:
+    return idx.astype(np.int32 if len(idx) == 0 or idx.max() < 2**31 else np.int64)
+
+
+def take_rows(frame: pd.DataFrame, idx: np.ndarray) -> pd.DataFrame:
+    """Rows at ``idx``; a contiguous ascending range is sliced (a view) instead of gathered."""
+    if len(idx) and idx[-1] - idx[0] == len(idx) - 1 and np.all(np.diff(idx) == 1):
+        return frame.iloc[int(idx[0]):int(idx[-1]) + 1]
+    return frame.take(np.asarray(idx))
+
+
+# ── Dataset columns ──────────────────────────────────────────────
+def dataset_frame(columns: list) -> tuple[pd.DataFrame, str]:
+    """
+    The given columns of the processing dataset and their version.
+
+    Only ``columns`` are parsed.  The last frame is kept in memory until the file
+    changes, so the split, scale, train and predict stages share one parse.
+    """
+    path = get_processing_dataset_path()
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError("No processing dataset — upload a dataset first.")
+    columns = list(dict.fromkeys(columns))
+    key = (path, os.path.getmtime(path), tuple(columns))
+    with _lock:
+        if key not in _frame_cache:
+            frame = pd.read_csv(path, usecols=columns)[columns]
+            _frame_cache.clear()
+            _frame_cache[key] = (frame, dataset_version(frame))
+        return _frame_cache[key]
+
+
+def dataset_columns() -> list[str]:
+    """Column names of the processing dataset (header only)."""
+    path = get_processing_dataset_path()
+    if not path or not os.path.exists(path):
+        return []
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def dataset_column(name: str) -> pd.Series:
+    """One column of the processing dataset, parsed on its own (not cached)."""
+    path = get_processing_dataset_path()
+    if name not in dataset_columns():
+        raise ValueError(f"Column '{name}' not found.")
+    return pd.read_csv(path, usecols=[name])[name]
+
+
+# ── Writing ──────────────────────────────────────────────────────
+def save_split(train_idx, test_idx, x_cols: list, y_col: str, version: str, **params) -> dict:
+    """
+    Persist a split as row-index arrays plus a manifest; drops any fitted scaler.
+
+    Returns
+    -------
+    dict
+        The manifest.
+    """
+    stem = _stem()
+    manifest = {
+        "dataset": os.path.basename(get_processing_dataset_path()),
+        "version": version,
+        "X": list(x_cols),
+        "y": y_col,
+        "n_train": int(len(train_idx)),
+        "n_test": int(len(test_idx)),
+        **params,
+    }
+    _save_atomic(_path("train_idx.npy", stem), lambda f: np.save(f, _compact(np.asarray(train_idx))))
+    _save_atomic(_path("test_idx.npy", stem), lambda f: np.save(f, _compact(np.asarray(test_idx))))
+    _save_atomic(_path("split.json", stem), lambda f: f.write(json.dumps(manifest, indent=2).encode("utf-8")))
+    _drop_scaler(stem)                                      # fitted on the previous training rows
+    return manifest
+
+
+def save_folds(folds: list, x_cols: list, y_col: str, version: str, **params) -> dict:
+    """
+    Persist cross-validation folds (a list of ``(train_idx, test_idx)``) as row indices.
+
+    Returns
+    -------
+    dict
+        The manifest.
+    """
+    stem = _stem()
+    manifest = {
+        "dataset": os.path.basename(get_processing_dataset_path()),
+        "version": version,
+        "X": list(x_cols),
+        "y": y_col,
+        "n_folds": len(folds),
+        **params,
+    }
+    arrays = {}
+    for i, (train_idx, test_idx) in enumerate(folds):
+        arrays[f"train_{i}"] = _compact(np.asarray(train_idx))
+        arrays[f"test_{i}"] = _compact(np.asarray(test_idx))
+    _save_atomic(_path("folds.npz", stem), lambda f: np.savez(f, **arrays))
+    _save_atomic(_path("folds.json", stem), lambda f: f.write(json.dumps(manifest, indent=2).encode("utf-8")))
+    return manifest
+
+
+def save_scaler(scaler) -> None:
+    """Persist the scaler fitted on ``X_train`` of the current split."""
+    _drop_scaler(_stem())
+    _save_atomic(_path("scaler.pkl"), lambda f: pickle.dump(scaler, f))
+
+
+def scaled_array_path(part: str) -> str:
+    """Where the float32 scaled features of ``part`` ("train" or "test") live."""
+    return _path(f"X_{part}_scaled.npy")
+
+
+def save_scaled_meta(**meta) -> None:
+    """
+    Mark the scaled arrays as complete for the current processing file.
+
+    The file's modification time is recorded, so arrays left over from an edited
+    dataset are ignored.
+    """
+    meta["mtime"] = os.path.getmtime(get_processing_dataset_path())
+    _save_atomic(_path("scaled.json"), lambda f: f.write(json.dumps(meta, indent=2).encode("utf-8")))
+
+
+def _drop_scaler(stem: str) -> None:
+    for suffix in SCALER_FILES:
+        if os.path.exists(_path(suffix, stem)):
+            os.remove(_path(suffix, stem))
+
+
+def _load_scaled(part: str, columns: list) -> pd.DataFrame | None:
+    """Memory-mapped scaled features of ``part``, or None if they are missing or stale."""
+    try:
+        return pd.DataFrame(load_scaled_array(part), columns=columns, copy=False)
+    except FileNotFoundError:
+        return None
+
+
+def load_scaled_array(part: str) -> np.ndarray:
+    """
+    Memory-mapped float32 scaled features of ``part`` ("train" or "test").
+
+    Raises
+    ------
+    FileNotFoundError
+        When scaling has not run, or the dataset changed since it did.
+    """
+    meta_path = _path("scaled.json")
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError("No scaled features found — run Scaling first.")
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("mtime") != os.path.getmtime(get_processing_dataset_path()):
+        raise FileNotFoundError("The dataset changed since it was scaled — run Scaling again.")
+    return np.load(scaled_array_path(part), mmap_mode="r")
+
+
+# ── Reading ──────────────────────────────────────────────────────
+def split_fingerprint() -> str:
+    """
+    Hash of the current split and its fitted scaler: manifest, row indices and scaler bytes.
+
+    The processing file's modification time is included too, so an edited
+    dataset never matches a split made before the edit.
+
+    Raises
+    ------
+    FileNotFoundError
+        When there is no split or scaling has not run.
+    """
+    if not os.path.exists(_path("scaler.pkl")):
+        raise FileNotFoundError("No fitted scaler found — run Scaling first.")
+    h = hashlib.sha1(repr(os.path.getmtime(get_processing_dataset_path())).encode("utf-8"))
+    for suffix in ("split.json", "train_idx.npy", "test_idx.npy", "scaler.pkl"):
+        if not os.path.exists(_path(suffix)):
+            raise FileNotFoundError("No split found — run Train‑Test Split first.")
+        with open(_path(suffix), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:20]
+
+
+def load_manifest() -> dict:
+    path = _path("split.json")
+    if not os.path.exists(path):
+        raise FileNotFoundError("No split found — run Train‑Test Split first.")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_version(manifest: dict) -> pd.DataFrame:
+    """
+    The X ∪ y columns of the processing dataset, checked against the split's version.
+
+    Raises
+    ------
+    FileNotFoundError
+        When the dataset changed since it was split, so the stored row
+        positions no longer point at the rows they were drawn from.
+    """
+    frame, version = dataset_frame(manifest["X"] + [manifest["y"]])
+    if version != manifest["version"]:
+        raise FileNotFoundError("The dataset changed since it was split — run Train‑Test Split again.")
+    return frame
+
+
+def load_indices(part: str) -> np.ndarray:
+    """Memory-mapped row positions of ``part`` ("train" or "test")."""
+    return np.load(_path(f"{part}_idx.npy"), mmap_mode="r")
+
+
+def load_scaler():
+    path = _path("scaler.pkl")
+    if not os.path.exists(path):
+        raise FileNotFoundError("No fitted scaler found — run Scaling first.")
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_folds() -> tuple[pd.DataFrame, pd.Series, list, dict]:
+    """
+    X, y, the fold index pairs and the manifest of the stored cross-validation split.
+
+    Raises
+    ------
+    FileNotFoundError
+        When no folds are stored or the dataset changed since they were made.
+    """
+    path = _path("folds.json")
+    if not os.path.exists(path):
+        raise FileNotFoundError("No cross-validation folds found — run a K‑Fold split first.")
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    frame, version = dataset_frame(manifest["X"] + [manifest["y"]])
+    if version != manifest["version"]:
+        raise FileNotFoundError("The dataset changed since the folds were made — split again.")
+    with np.load(_path("folds.npz")) as data:
+        folds = [(data[f"train_{i}"], data[f"test_{i}"]) for i in range(manifest["n_folds"])]
+    return frame[manifest["X"]], frame[manifest["y"]], folds, manifest
+
+
+def load_split(name: str) -> pd.DataFrame:
+    """
+    Materialise one split frame.
+
+    Parameters
+    ----------
+    name : str
+        One of ``SPLIT_NAMES``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Rows of the split, with the X columns (scaled for ``*_scaled``) or the y column.
+    """
+    if name not in SPLIT_NAMES:
+        raise ValueError(f"Unknown split '{name}'.")
+    manifest = load_manifest()
+    part = "train" if "train" in name else "test"
+    if name.endswith("_scaled"):
+        scaled = _load_scaled(part, manifest["X"])
+        if scaled is not None:
+            return scaled
+
+    frame = check_version(manifest)
+    rows = take_rows(frame, load_indices(part))
+    if name.startswith("y_"):
+        return rows[[manifest["y"]]].reset_index(drop=True)
+
+    x = rows[manifest["X"]].reset_index(drop=True)
+    if name.endswith("_scaled"):
+        x = pd.DataFrame(load_scaler().transform(x.to_numpy(dtype=np.float32)), columns=x.columns)
+    return x
+
+
+def drop_split(dataset_name: str) -> None:
+    """Remove the stored splits of a dataset (indices, folds, manifests and scaler)."""
+    stem = Path(dataset_name).stem
+    for suffix in ("train_idx.npy", "test_idx.npy", "split.json", "folds.npz", "folds.json"):
+        path = _path(suffix, stem)
+        if os.path.exists(path):
+            os.remove(path)
+    _drop_scaler(stem)
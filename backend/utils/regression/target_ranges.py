@@ -0,0 +1,57 @@
+"""
+Percentile bands of a target column.
+
+The two percentile bounds are computed in a single ``np.nanquantile`` call and
+rows are labelled with vectorised comparisons, so banding, counting and
+filtering are a few array operations regardless of row count.  Filtering
+yields a boolean row mask; callers decide whether to materialise it.
+"""
+
+import numpy as np
+import pandas as pd
+
+BELOW, WITHIN, ABOVE = 0, 1, 2
+
+
+class TargetRange:
+    """Bounds, per-row band codes and band counts for one target column."""
+
+    def __init__(self, values: pd.Series, lower_percentile: float, upper_percentile: float):
+        if not (0 <= lower_percentile <= 100 and 0 <= upper_percentile <= 100):
+            raise ValueError("Percentiles must be between 0 and 100.")
+        self.lower_percentile = lower_percentile
+        self.upper_percentile = upper_percentile
+        self._values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+
+        if np.isnan(self._values).all():
+            self.lower = self.upper = np.nan
+        else:
+            self.lower, self.upper = np.nanquantile(
+                self._values, [lower_percentile / 100, upper_percentile / 100]
+            )
+
+        # -1 marks missing targets
+        codes = np.full(self._values.shape, WITHIN, dtype=np.int8)
+        codes[self._values < self.lower] = BELOW
+        codes[self._values > self.upper] = ABOVE
+        codes[np.isnan(self._values)] = -1
+        self.codes = codes
+
+    @property
+    def band_names(self) -> list[str]:
+        lo, hi = self.lower_percentile, self.upper_percentile
+        return [f"< {lo}th percentile", f"{lo}–{hi}% Range", f"> {hi}th percentile"]
+
+    def labels(self, index=None) -> pd.Series:
+        """Categorical band label per row (NaN for missing targets)."""
+        cat = pd.Categorical.from_codes(self.codes, categories=self.band_names)
+        return pd.Series(cat, index=index)
+
+    def counts(self) -> dict[str, int]:
+        """Number of rows in each band."""
+        n = np.bincount(self.codes[self.codes >= 0], minlength=3)
+        return dict(zip(self.band_names, n.tolist()))
+
+    def mask(self) -> np.ndarray:
+        """Boolean mask of rows whose target lies within [lower, upper]."""
+        return self.codes == WITHIN
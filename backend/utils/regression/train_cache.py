@@ -0,0 +1,97 @@
+"""
+Memoised model training.
+
+A trained model is fully determined by its inputs:
+
+* the split – the manifest (dataset version, X / y columns, method) and the
+  train / test row indices
+* the preprocessing – the fitted scaler
+* the estimator class and its parameters (plus any training options)
+* the versions of the libraries that fit it
+
+``training_key`` hashes all of them.  ``train_cache.json`` next to the saved
+models maps each key to the model file and test metrics it produced.  When the
+same key comes up again, the stored model is reused instead of refitted, as
+long as its file still exists unchanged (same modification time).
+"""
+
+import hashlib
+import json
+import os
+import platform
+import threading
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+# ── Paths ────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/models"))
+CACHE_FILE = os.path.join(MODEL_DIR, "train_cache.json")
+
+CACHE_FORMAT = 1                        # bump whenever training changes so old entries miss
+IGNORED_PARAMS = ("n_jobs", "verbose")  # do not change the fitted model
+
+_lock = threading.Lock()
+
+
+def _versions() -> dict:
+    return {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "sklearn": sklearn.__version__}
+
+
+def training_key(model, split: str, options: dict | None = None) -> str:
+    """
+    Hash of everything that determines a model trained on the current split.
+
+    Parameters
+    ----------
+    model : estimator
+        Unfitted estimator as it will be trained.
+    split : str
+        ``split_store.split_fingerprint()``, computed once per training run.
+    options : dict, optional
+        Training options that are not estimator parameters.
+    """
+    params = {name: value for name, value in model.get_params().items() if name not in IGNORED_PARAMS}
+    payload = json.dumps(
+        {"fmt": CACHE_FORMAT, "split": split,
+         "estimator": f"{type(model).__module__}.{type(model).__qualname__}",
+         "params": params, "options": options or {}, "versions": _versions()},
+        sort_keys=True, default=repr,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+def _read() -> dict:
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    with open(CACHE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _valid(entry: dict) -> bool:
+    """The entry's model file still exists and was not overwritten since it was cached."""
+    path = os.path.join(MODEL_DIR, entry["filename"])
+    return os.path.exists(path) and os.path.getmtime(path) == entry["mtime"]
+
+
+def lookup(key: str) -> dict | None:
+    """The cached entry (``filename``, ``label``, ``metrics``) for ``key``, if its model file is intact."""
+    with _lock:
+        entry = _read().get(key)
+    return entry if entry and _valid(entry) else None
+
+
+def store(key: str, filename: str, label: str, metrics: dict) -> None:
+    """Remember which model file and metrics ``key`` produced; entries of deleted models are pruned."""
+    with _lock:
+        entries = {k: e for k, e in _read().items() if _valid(e)}
+        entries[key] = {"filename": filename, "mtime": os.path.getmtime(os.path.join(MODEL_DIR, filename)),
+                        "label": label,
+                        "metrics": {name: float(v) for name, v in metrics.items()}}
+        tmp = f"{CACHE_FILE}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp, CACHE_FILE)
@@ -1,21 +1,40 @@
-import os
-from pathlib import Path
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split , KFold
+from sklearn.model_selection import train_test_split, KFold, RepeatedKFold, TimeSeriesSplit
 
-from .cleaning import load_data
 from .selection_state import load_xy
-from backend.utils.regression.session_state import get_active_dataset
+from .split_store import dataset_column, dataset_frame, save_folds, save_split, take_rows
 
-# 📁 Paths
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SPLIT_DIR = os.path.abspath(os.path.join(BASE_DIR, "../../../frontend/static/splits"))
-os.makedirs(SPLIT_DIR, exist_ok=True)
+
+def _xy_frame() -> tuple[pd.DataFrame, list, str, str]:
+    xy = load_xy()
+    if not xy["X"] or not xy["y"]:
+        raise ValueError("Please define X / y first in Feature‑Selection.")
+    frame, version = dataset_frame(xy["X"] + [xy["y"]])
+    return frame, xy["X"], xy["y"], version
+
+
+def _preview(frame: pd.DataFrame, x_cols: list, y_col: str, train_idx, test_idx, preview_rows: int) -> dict:
+    """Head of each split and its shape, materialising only the preview rows."""
+    n_x = len(x_cols)
+    head = lambda idx: take_rows(frame, np.asarray(idx[:preview_rows]))
+    return {
+        "X_train": head(train_idx)[x_cols],
+        "X_test": head(test_idx)[x_cols],
+        "y_train": head(train_idx)[[y_col]],
+        "y_test": head(test_idx)[[y_col]],
+        "shapes": {
+            "X_train": (len(train_idx), n_x),
+            "X_test": (len(test_idx), n_x),
+            "y_train": (len(train_idx),),
+            "y_test": (len(test_idx),),
+        }
+    }
 
 
 def perform_split(test_size: float, random_state: int, preview_rows: int = 5) -> dict:
     """
-    Perform a train-test split and save split CSVs for the current dataset.
+    Perform a random train-test split and store it as row indices.
 
     Parameters
     ----------
@@ -31,117 +50,191 @@ def perform_split(test_size: float, random_state: int, preview_rows: int = 5) ->
     dict
         Dictionary with split previews and their shapes.
     """
-    xy = load_xy()
-    if not xy["X"] or not xy["y"]:
-        raise ValueError("Please define X / y first in Feature‑Selection.")
-
-    df = load_data()
-    X = df[xy["X"]]
-    y = df[xy["y"]]
-
-    if len(X) < 10:
+    frame, x_cols, y_col, version = _xy_frame()
+    if len(frame) < 10:
         raise ValueError("Not enough data to split. Please check your selections.")
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state
+    train_idx, test_idx = train_test_split(
+        np.arange(len(frame)), test_size=test_size, random_state=random_state
     )
+    save_split(train_idx, test_idx, x_cols, y_col, version,
+               method="random", test_size=test_size, random_state=random_state)
+    return _preview(frame, x_cols, y_col, train_idx, test_idx, preview_rows)
 
-    # 💾 Save with dataset prefix
-    dataset_name = get_active_dataset()
-    base = Path(dataset_name).stem
-
-    pd.DataFrame(X_train).to_csv(os.path.join(SPLIT_DIR, f"{base}_X_train.csv"), index=False)
-    pd.DataFrame(X_test).to_csv(os.path.join(SPLIT_DIR, f"{base}_X_test.csv"), index=False)
-    pd.DataFrame(y_train).to_csv(os.path.join(SPLIT_DIR, f"{base}_y_train.csv"), index=False, header=True)
-    pd.DataFrame(y_test).to_csv(os.path.join(SPLIT_DIR, f"{base}_y_test.csv"), index=False, header=True)
 
-    return {
-        "X_train": X_train.head(preview_rows),
-        "X_test": X_test.head(preview_rows),
-        "y_train": y_train.head(preview_rows).to_frame(name=y.name or "y"),
-        "y_test": y_test.head(preview_rows).to_frame(name=y.name or "y"),
-        "shapes": {
-            "X_train": X_train.shape,
-            "X_test": X_test.shape,
-            "y_train": y_train.shape,
-            "y_test": y_test.shape,
-        }
-    }
 def perform_sequential_split(test_size: float, preview_rows: int = 5) -> dict:
-    xy = load_xy()
-    if not xy["X"] or not xy["y"]:
-        raise ValueError("Please define X / y first in Feature‑Selection.")
-
-    df = load_data()
-    X = df[xy["X"]]
-    y = df[xy["y"]]
-
-    n = len(X)
+    """Hold out the last ``test_size`` share of rows, keeping row order (time series)."""
+    frame, x_cols, y_col, version = _xy_frame()
+    n = len(frame)
     if n < 10:
         raise ValueError("Not enough data to split.")
 
     split_index = int(n * (1 - test_size))
+    train_idx, test_idx = np.arange(split_index), np.arange(split_index, n)
+    save_split(train_idx, test_idx, x_cols, y_col, version, method="sequential", test_size=test_size)
+    return _preview(frame, x_cols, y_col, train_idx, test_idx, preview_rows)
 
-    X_train, X_test = X.iloc[:split_index], X.iloc[split_index:]
-    y_train, y_test = y.iloc[:split_index], y.iloc[split_index:]
 
-    dataset_name = get_active_dataset()
-    base = Path(dataset_name).stem
+def _stratified_test_mask(y: np.ndarray, test_size: float, n_bins: int, rng) -> np.ndarray:
+    """
+    Test-row mask that takes ``test_size`` of every target-quantile bin.
 
-    pd.DataFrame(X_train).to_csv(os.path.join(SPLIT_DIR, f"{base}_X_train.csv"), index=False)
-    pd.DataFrame(X_test).to_csv(os.path.join(SPLIT_DIR, f"{base}_X_test.csv"), index=False)
-    pd.DataFrame(y_train).to_csv(os.path.join(SPLIT_DIR, f"{base}_y_train.csv"), index=False, header=True)
-    pd.DataFrame(y_test).to_csv(os.path.join(SPLIT_DIR, f"{base}_y_test.csv"), index=False, header=True)
+    Rows are shuffled once, stably sorted by bin, and the first
+    ``round(bin size × test_size)`` rows of each bin go to the test set.  There
+    is no per-bin loop.  Rows with a missing target form their own bin.
+    """
+    n = len(y)
+    finite = np.isfinite(y)
+    edges = np.unique(np.quantile(y[finite], np.linspace(0, 1, n_bins + 1)[1:-1])) if finite.any() else []
+    bins = np.where(finite, np.searchsorted(edges, np.where(finite, y, 0), side="right"), len(edges) + 1)
 
-    return {
-        "X_train": X_train.head(preview_rows),
-        "X_test": X_test.head(preview_rows),
-        "y_train": y_train.head(preview_rows).to_frame(name=y.name or "y"),
-        "y_test": y_test.head(preview_rows).to_frame(name=y.name or "y"),
-        "shapes": {
-            "X_train": X_train.shape,
-            "X_test": X_test.shape,
-            "y_train": y_train.shape,
-            "y_test": y_test.shape,
-        }
-    }
-# def perform_kfold_split(n_splits: int = 5, random_state: int = 42, preview_rows: int = 5) -> dict:
-#     # Load selected features and target
-#     xy = load_xy()
-#     if not xy.get("X") or not xy.get("y"):
-#         raise ValueError("❌ Please define X and y first in Feature Selection.")
-
-#     # Load dataset
-#     df = load_data()
-#     X = df[xy["X"]]
-#     y = df[xy["y"]]
-
-#     # Initialize KFold splitter
-#     kf = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
-#     previews = []
-
-#     for fold, (train_idx, test_idx) in enumerate(kf.split(X), start=1):
-#         x_train, x_test = X.iloc[train_idx], X.iloc[test_idx]
-#         y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-
-#         # Append preview of each fold
-#         previews.append({
-#     "fold": fold,
-#     "X_train": x_train.head(preview_rows),
-#     "X_test": x_test.head(preview_rows),
-#     "y_train": y_train.head(preview_rows).to_frame(name="y_train"),
-#     "y_test": y_test.head(preview_rows).to_frame(name="y_test"),
-#     "shapes": {
-#         "X_train": x_train.shape,
-#         "X_test": x_test.shape,
-#         "y_train": y_train.shape,
-#         "y_test": y_test.shape,
-#     }
-# })
-
-
-#     return {
-#         "n_splits": n_splits,
-#         "preview_rows": preview_rows,
-#         "kfold": previews
-#     }
\ No newline at end of file
+    perm = rng.permutation(n)
+    order = perm[np.argsort(bins[perm], kind="stable")]
+    counts = np.bincount(bins, minlength=len(edges) + 2)
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(n) - starts[bins[order]]
+    take = np.rint(counts * test_size).astype(np.int64)
+
+    mask = np.zeros(n, dtype=bool)
+    mask[order[rank < take[bins[order]]]] = True
+    return mask
+
+
+def _grouped_test_mask(groups: pd.Series, test_size: float, rng) -> np.ndarray:
+    """
+    Test-row mask made of whole groups covering about ``test_size`` of the rows.
+
+    Groups are shuffled and taken until their cumulative row count reaches the
+    target size, so no group ends up on both sides.  Missing group values form
+    one group.
+    """
+    codes, uniques = pd.factorize(groups)
+    codes = np.where(codes < 0, len(uniques), codes)
+    sizes = np.bincount(codes)
+    if np.count_nonzero(sizes) < 2:
+        raise ValueError("The group column needs at least two distinct values.")
+
+    perm = rng.permutation(len(sizes))
+    n_groups = int(np.searchsorted(np.cumsum(sizes[perm]), test_size * len(codes))) + 1
+    n_groups = min(max(n_groups, 1), len(sizes) - 1)
+    test_groups = np.zeros(len(sizes), dtype=bool)
+    test_groups[perm[:n_groups]] = True
+    return test_groups[codes]
+
+
+def perform_stratified_split(test_size: float, random_state: int, n_bins: int = 10,
+                             preview_rows: int = 5) -> dict:
+    """
+    Random split that keeps every target-quantile bin (tails included) in both sets.
+
+    Parameters
+    ----------
+    test_size : float
+        Proportion of the dataset to include in the test split.
+    random_state : int
+        Seed for reproducibility.
+    n_bins : int
+        Number of target quantile bins to stratify on.
+    preview_rows : int
+        Number of preview rows to return from each split.
+
+    Returns
+    -------
+    dict
+        Dictionary with split previews and their shapes.
+    """
+    frame, x_cols, y_col, version = _xy_frame()
+    if len(frame) < 10:
+        raise ValueError("Not enough data to split.")
+
+    y = pd.to_numeric(frame[y_col], errors="coerce").to_numpy(dtype=np.float64)
+    mask = _stratified_test_mask(y, test_size, n_bins, np.random.default_rng(random_state))
+    train_idx, test_idx = np.flatnonzero(~mask), np.flatnonzero(mask)
+    save_split(train_idx, test_idx, x_cols, y_col, version, method="stratified",
+               test_size=test_size, random_state=random_state, n_bins=n_bins)
+    return _preview(frame, x_cols, y_col, train_idx, test_idx, preview_rows)
+
+
+def perform_grouped_split(test_size: float, random_state: int, group_col: str,
+                          preview_rows: int = 5) -> dict:
+    """
+    Random split of whole groups: all rows sharing a ``group_col`` value land on the same side.
+
+    Parameters
+    ----------
+    test_size : float
+        Approximate proportion of rows in the test split.
+    random_state : int
+        Seed for reproducibility.
+    group_col : str
+        Column identifying the groups (any column of the dataset).
+    preview_rows : int
+        Number of preview rows to return from each split.
+
+    Returns
+    -------
+    dict
+        Dictionary with split previews and their shapes.
+    """
+    frame, x_cols, y_col, version = _xy_frame()
+    if len(frame) < 10:
+        raise ValueError("Not enough data to split.")
+
+    groups = dataset_column(group_col)
+    mask = _grouped_test_mask(groups, test_size, np.random.default_rng(random_state))
+    train_idx, test_idx = np.flatnonzero(~mask), np.flatnonzero(mask)
+    save_split(train_idx, test_idx, x_cols, y_col, version, method="grouped",
+               test_size=test_size, random_state=random_state, group_col=group_col)
+    return _preview(frame, x_cols, y_col, train_idx, test_idx, preview_rows)
+
+
+CV_MODES = ("kfold", "repeated", "timeseries")
+
+
+def perform_kfold_split(mode: str = "kfold", n_splits: int = 5, n_repeats: int = 3,
+                        random_state: int = 42) -> dict:
+    """
+    Build cross-validation folds over all rows and store their indices.
+
+    Parameters
+    ----------
+    mode : str
+        "kfold" (shuffled K-fold), "repeated" (K-fold repeated ``n_repeats``
+        times with different shuffles) or "timeseries" (expanding window,
+        test folds always after their training rows).
+    n_splits : int
+        Number of folds per repetition.
+    n_repeats : int
+        Repetitions for "repeated".
+    random_state : int
+        Seed for the shuffles.
+
+    Returns
+    -------
+    dict
+        ``folds`` (one summary row per fold) and the stored manifest.
+    """
+    frame, x_cols, y_col, version = _xy_frame()
+    if len(frame) < 2 * n_splits:
+        raise ValueError("Not enough data for that many folds.")
+
+    rows = np.arange(len(frame))
+    if mode == "kfold":
+        splitter, params = KFold(n_splits, shuffle=True, random_state=random_state), {}
+    elif mode == "repeated":
+        splitter = RepeatedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+        params = {"n_repeats": n_repeats}
+    elif mode == "timeseries":
+        splitter, params = TimeSeriesSplit(n_splits), {}
+    else:
+        raise ValueError(f"Mode must be one of {', '.join(CV_MODES)}.")
+    folds = list(splitter.split(rows))
+
+    manifest = save_folds(folds, x_cols, y_col, version, method=mode, n_splits=n_splits,
+                          random_state=random_state, **params)
+    summary = pd.DataFrame({
+        "fold": np.arange(1, len(folds) + 1),
+        "train rows": [len(tr) for tr, _ in folds],
+        "test rows": [len(te) for _, te in folds],
+    })
+    return {"folds": summary, "manifest": manifest}
@@ -13,6 +13,10 @@ from  backend.utils.regression.session_state import (
     is_dataset_active,
     set_processing_dataset
 )
+from backend.utils.regression.plot_cache import purge_dataset
+from backend.utils.regression.profile_store import drop_store
+from backend.utils.regression.feature_scoring import drop_store as drop_feature_scores
+from backend.utils.regression.split_store import drop_split
 
 # 📁 Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -135,7 +139,8 @@ def delete_related_model_files(dataset_name: str):
 
 def delete_related_split_files(dataset_name: str):
     base = os.path.splitext(dataset_name)[0]
-    _delete_files_by_prefix_and_ext(SPLIT_DIR, base, ".csv")
+    _delete_files_by_prefix_and_ext(SPLIT_DIR, base, ".csv")   # splits written before index storage
+    drop_split(dataset_name)
 
 def delete_related_plot_files(dataset_name: str):
     base = os.path.splitext(dataset_name)[0]
@@ -143,12 +148,15 @@ def delete_related_plot_files(dataset_name: str):
         base = base.replace("_cleaned", "")
 
     for f in os.listdir(PLOTS_DIR):
-        if f.startswith(base):
+        # compare_* files predate the plot cache and are not tied to any dataset
+        if f.startswith((base, "compare_")) and os.path.isfile(os.path.join(PLOTS_DIR, f)):
             try:
                 os.remove(os.path.join(PLOTS_DIR, f))
             except Exception as e:
                 print(f"⚠️ Could not delete plot file {f} from {PLOTS_DIR}: {e}")
 
+    purge_dataset(dataset_name)
+
 def delete_cleaned_version(dataset_name: str):
     base = os.path.splitext(dataset_name)[0]
     cleaned_file = f"{base}_cleaned.csv"
@@ -168,3 +176,5 @@ def clear_all_cache_for(filename: str):
     delete_related_split_files(filename)
     delete_related_plot_files(filename)
     delete_cleaned_version(filename)
+    drop_store(filename)
+    drop_feature_scores(filename)
@@ -1,8 +1,14 @@
 import os
+from urllib.parse import urlencode
 import pandas as pd
 import plotly.express as px
-from plotly.io import to_html
 from .cleaning import load_data as _load_data
+from .fingerprint import file_version
+from .plot_cache import cached_plot_json
+from .histogram import histogram_figure
+from .sampling import DEFAULT_POINT_BUDGET, sample_frame, render_mode
+from .density import DEFAULT_GRID, density_figure, density_grid
+from backend.utils.regression.session_state import get_processing_dataset_path
 
 
 def get_numeric_columns() -> list:
@@ -19,142 +25,188 @@ def load_cleaned_data() -> pd.DataFrame:
     return _load_data()
 
 
-# ---------- Visualization Helpers ----------
+_pair_cache: dict = {}
 
-def make_scatter(df, column: str, limit: int = 100, dark=False) -> str:
-    if column not in df.columns:
-        return f"<p class='text-danger'>Column '{column}' not found in dataset.</p>"
 
-    data = df if limit is None else df.head(limit)
+def load_column_pair(x_col: str, y_col: str) -> pd.DataFrame:
+    """
+    Read just two columns of the processing dataset.
+
+    The last few pairs are kept in memory keyed by file modification time, so
+    zoom re-queries of a density plot do not re-parse the CSV.
+    """
+    path = get_processing_dataset_path()
+    key = (path, os.path.getmtime(path), x_col, y_col)
+    if key not in _pair_cache:
+        if len(_pair_cache) >= 4:
+            _pair_cache.pop(next(iter(_pair_cache)))
+        _pair_cache[key] = pd.read_csv(path, usecols=list({x_col, y_col}))
+    return _pair_cache[key]
+
+
+# ---------- Figure Builders ----------
+
+def _sample_note(data, df) -> str:
+    return f" (sample of {len(data):,} / {len(df):,} rows)" if len(data) < len(df) else ""
+
+
+def _check_columns(df, cols) -> None:
+    missing = [c for c in cols if c not in df.columns]
+    if missing:
+        raise KeyError(f"Column(s) not found in dataset: {', '.join(missing)}")
+
+
+def scatter_figure(df, column: str, x_col: str | None = None, limit: int = DEFAULT_POINT_BUDGET,
+                   dark=False, sampling: str = "uniform", seed: int = 42):
+    """Scatter of ``column`` against the index, or against ``x_col`` when given."""
+    _check_columns(df, [column] + ([x_col] if x_col else []))
+    data = sample_frame(df, limit, sampling, column, seed)
+    title = f"{x_col} vs {column}" if x_col else f"Scatter: Index vs {column}"
     fig = px.scatter(
         data,
+        x=x_col,
         y=column,
-        title=f"Scatter: Index vs {column}",
+        title=f"{title}{_sample_note(data, df)}",
+        render_mode=render_mode(len(data)),
         template="plotly_dark" if dark else "plotly_white"
     )
     fig.update_layout(margin=dict(t=40, l=40, r=20, b=40))
-    return to_html(fig, full_html=False)
-
+    return fig
 
-def make_histogram(df, column: str, bins: int = 20, dark=False) -> str:
-    if column not in df.columns:
-        return f"<p class='text-danger'>Column '{column}' not found in dataset.</p>"
 
-    fig = px.histogram(
-        df,
-        x=column,
+def histogram_plot_figure(df, column: str, bins: int = 20, dark=False):
+    _check_columns(df, [column])
+    fig = histogram_figure(
+        df[column],
         nbins=bins,
         title=f"Histogram of {column}",
         template="plotly_dark" if dark else "plotly_white"
     )
     fig.update_layout(margin=dict(t=40, l=40, r=20, b=40))
-    return to_html(fig, full_html=False)
+    return fig
 
 
-def make_lineplot(df, column: str, limit: int = 100, dark=False) -> str:
-    if column not in df.columns:
-        return f"<p class='text-danger'>Column '{column}' not found in dataset.</p>"
-    
-    data = df if limit is None else df.head(limit)
+def line_figure(df, column: str, limit: int = DEFAULT_POINT_BUDGET, dark=False,
+                sampling: str = "extremes", seed: int = 42):
+    _check_columns(df, [column])
+    data = sample_frame(df, limit, sampling, column, seed)
     fig = px.line(
         data,
         x=data.index,
         y=column,
-        title=f"Line Plot: Index vs {column}",
+        title=f"Line Plot: Index vs {column}{_sample_note(data, df)}",
         labels={'x': 'Index', column: column},
+        render_mode=render_mode(len(data)),
         template="plotly_dark" if dark else "plotly_white"
     )
     fig.update_layout(margin=dict(t=40, l=40, r=20, b=40))
-    return to_html(fig, full_html=False)
+    return fig
 
 
-def make_two_column_scatter(df, x_col: str, y_col: str, limit: int = 100, dark=False) -> str:
-    if x_col not in df.columns or y_col not in df.columns:
-        return f"<p class='text-danger'>One or both columns not found: {x_col}, {y_col}</p>"
-
-    data = df if limit is None else df.head(limit)
-    fig = px.scatter(
-        data,
-        x=x_col,
-        y=y_col,
-        title=f"{x_col} vs {y_col}",
+def density_plot_figure(df, x_col: str, y_col: str, bins: int = DEFAULT_GRID, log: bool = True, dark=False):
+    _check_columns(df, [x_col, y_col])
+    fig = density_figure(
+        df[x_col], df[y_col], x_col, y_col,
+        bins=bins,
+        log=log,
         template="plotly_dark" if dark else "plotly_white"
     )
     fig.update_layout(margin=dict(t=40, l=40, r=20, b=40))
-    return to_html(fig, full_html=False)
-
-
-def make_two_column_histograms(df, cols: list, dark=False) -> list:
-    plots = []
-    for col in cols:
-        if col not in df.columns:
-            plots.append(f"<p class='text-danger'>Column '{col}' not found.</p>")
-            continue
-        fig = px.histogram(
-            df,
-            x=col,
-            nbins=20,
-            title=f"Histogram of {col}",
-            template="plotly_dark" if dark else "plotly_white"
-        )
-        fig.update_layout(margin=dict(t=40, l=40, r=20, b=40))
-        plots.append(to_html(fig, full_html=False))
-    return plots
-
-
-def make_two_column_lineplot(df, cols: list, limit: int = 100, dark=False) -> list:
-    plots = []
-    data = df if limit is None else df.head(limit)
-    for col in cols:
-        if col not in df.columns:
-            plots.append(f"<p class='text-danger'>Column '{col}' not found.</p>")
-            continue
-        fig = px.line(
-            data,
-            x=data.index,
-            y=col,
-            title=f"Line Plot: Index vs {col}",
-            labels={'x': 'Index', col: col},
-            template="plotly_dark" if dark else "plotly_white"
-        )
-        fig.update_layout(margin=dict(t=40, l=40, r=20, b=40))
-        plots.append(to_html(fig, full_html=False))
-    return plots
-
-
-# ---------- Main Generator ----------
-
-def generate_visualizations(selected_columns: list, plot_types: list, scatter_limit: int = 100, dark=True) -> list:
+    return fig
+
+
+def density_window(x_col: str, y_col: str, bins: int = DEFAULT_GRID, log: bool = True,
+                   x_range=None, y_range=None) -> dict:
+    """Density grid of the processing dataset restricted to a zoom window."""
+    df = load_column_pair(x_col, y_col)
+    return density_grid(df[x_col], df[y_col], bins, x_range, y_range, log)
+
+
+# ---------- Plot Specs ----------
+
+DEFAULT_SAMPLING = {"scatter": "uniform", "lineplot": "extremes"}   # used when no method is chosen
+
+
+def plot_specs(selected_columns: list, plot_types: list, scatter_limit: int = DEFAULT_POINT_BUDGET,
+               sampling: str | None = None, seed: int = 42,
+               density_bins: int = DEFAULT_GRID, density_log: bool = True) -> list[dict]:
     """
-    Generate Plotly HTML charts based on selected columns and plot types.
-    Supported plot_types: 'scatter', 'histogram', 'lineplot'
+    The plots a selection asks for, in page order.
+
+    Each spec is ``{"type", "cols", "params"}`` — exactly what
+    :func:`visualization_figure` needs to build the figure.  Without a
+    ``sampling`` method each plot type uses its ``DEFAULT_SAMPLING``.
     """
-    try:
+    def sample(kind: str) -> dict:
+        return {"limit": scatter_limit, "sampling": sampling or DEFAULT_SAMPLING[kind], "seed": seed}
+
+    specs = []
+    if len(selected_columns) == 1:
+        col = selected_columns[0]
+        if "scatter" in plot_types:
+            specs.append({"type": "scatter", "cols": [col], "params": sample("scatter")})
+        if "histogram" in plot_types:
+            specs.append({"type": "histogram", "cols": [col], "params": {"bins": 20}})
+        if "lineplot" in plot_types:
+            specs.append({"type": "lineplot", "cols": [col], "params": sample("lineplot")})
+
+    elif len(selected_columns) == 2:
+        col1, col2 = selected_columns
+        if "scatter" in plot_types:
+            specs.append({"type": "scatter", "cols": [col1, col2], "params": sample("scatter")})
+        if "density" in plot_types:
+            specs.append({"type": "density", "cols": [col1, col2],
+                          "params": {"bins": density_bins, "log": density_log}})
+        for col in (col1, col2) if "histogram" in plot_types else ():
+            specs.append({"type": "histogram", "cols": [col], "params": {"bins": 20}})
+        for col in (col1, col2) if "lineplot" in plot_types else ():
+            specs.append({"type": "lineplot", "cols": [col], "params": sample("lineplot")})
+    return specs
+
+
+def visualization_figure(df, plot_type: str, cols: list, params: dict, dark=True):
+    """Build the figure described by one of :func:`plot_specs`' entries."""
+    limit = params.get("limit", DEFAULT_POINT_BUDGET)
+    sampling = params.get("sampling") or DEFAULT_SAMPLING.get(plot_type, "uniform")
+    seed = params.get("seed", 42)
+    if plot_type == "scatter":
+        x_col, y_col = (None, cols[0]) if len(cols) == 1 else cols
+        return scatter_figure(df, y_col, x_col, limit, dark, sampling, seed)
+    if plot_type == "histogram":
+        return histogram_plot_figure(df, cols[0], params.get("bins", 20), dark)
+    if plot_type == "lineplot":
+        return line_figure(df, cols[0], limit, dark, sampling, seed)
+    if plot_type == "density":
+        return density_plot_figure(df, cols[0], cols[1], params.get("bins", DEFAULT_GRID),
+                                   params.get("log", True), dark)
+    raise ValueError(f"Unknown plot type '{plot_type}'.")
+
+
+def plot_url(spec: dict) -> str:
+    """Plot API URL serving the figure JSON of a spec."""
+    query = [("cols", c) for c in spec["cols"]]
+    query += [(k, str(v).lower() if isinstance(v, bool) else str(v)) for k, v in spec["params"].items()]
+    return f"/api/plots/visualize/{spec['type']}?{urlencode(query)}"
+
+
+def visualization_json(plot_type: str, cols: list, params: dict, dark=True, binary: bool = True) -> tuple[str, str]:
+    """
+    ``(etag, figure JSON)`` of one plot of the processing dataset, served from the plot cache.
+
+    Entries are keyed by the file's size and modification time, so a
+    revalidation or cache hit never parses the CSV; only a miss loads it.
+    """
+    path = get_processing_dataset_path()
+    if not path or not os.path.exists(path):
+        raise ValueError("Dataset is empty or could not be loaded.")
+
+    def build():
         df = load_cleaned_data()
         if df.empty:
-            return ["<p class='text-warning'>⚠️ Dataset is empty or could not be loaded.</p>"]
-
-        plots = []
-
-        if len(selected_columns) == 1:
-            col = selected_columns[0]
-            if "scatter" in plot_types:
-                plots.append(make_scatter(df, col, scatter_limit, dark))
-            if "histogram" in plot_types:
-                plots.append(make_histogram(df, col, dark=dark))
-            if "lineplot" in plot_types:
-                plots.append(make_lineplot(df, col, scatter_limit, dark))
-
-        elif len(selected_columns) == 2:
-            col1, col2 = selected_columns
-            if "scatter" in plot_types:
-                plots.append(make_two_column_scatter(df, col1, col2, scatter_limit, dark))
-            if "histogram" in plot_types:
-                plots.extend(make_two_column_histograms(df, [col1, col2], dark))
-            if "lineplot" in plot_types:
-                plots.extend(make_two_column_lineplot(df, [col1, col2], scatter_limit, dark))
-
-        return plots
-
-    except Exception as e:
-        return [f"<p class='text-danger'>Error generating plots: {e}</p>"]
+            raise ValueError("Dataset is empty or could not be loaded.")
+        _check_columns(df, cols)
+        return visualization_figure(df, plot_type, cols, params, dark)
+
+    # own namespace: content-versioned EDA entries of the same file would evict these
+    return cached_plot_json(os.path.basename(path), file_version(path), plot_type, cols,
+                            {**params, "dark": dark}, build, scope=":file", binary=binary)
@@ -0,0 +1,244 @@
+"""
+Wrapper-based feature selection.
+
+Three strategies search for a compact feature subset by cross-validating the
+chosen estimator on candidate subsets:
+
+* ``forward``  – greedily add the feature that helps most
+* ``backward`` – greedily drop the feature whose removal hurts least
+* ``rfe``      – recursive feature elimination by model importance
+
+Every (candidate subset × CV fold) fit is an independent joblib task, so the
+folds of one candidate and the candidates of one step all run concurrently on
+``n_jobs`` workers.  A search stops early when the best score has not improved
+by ``tol`` for ``patience`` steps or when the wall-clock ``time_budget`` runs
+out; the best subset seen so far is returned either way.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.compose import TransformedTargetRegressor
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import KFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .model_selection import SCALED_TARGET, available_models, single_threaded
+
+WRAPPER_METHODS = ("forward", "backward", "rfe")
+N_JOBS = -1                 # joblib workers for CV fits (-1 = all cores)
+SAMPLE_ROWS = 20_000        # searches run on a seeded row sample of large data
+DEFAULT_TIME_BUDGET = 60    # seconds
+WAVE_SECONDS = 0.5          # target duration of one parallel wave of fits
+
+
+def _estimator(key: str):
+    """The catalogue estimator behind a standard scaler (SVR / SGD also get a scaled target)."""
+    model = single_threaded(available_models()[key][1])     # fits already run one per worker
+    if key in SCALED_TARGET:
+        model = TransformedTargetRegressor(regressor=model, transformer=StandardScaler())
+    return make_pipeline(StandardScaler(), model)
+
+
+def _importances(pipeline) -> np.ndarray:
+    model = getattr(pipeline[-1], "regressor_", pipeline[-1])
+    if hasattr(model, "coef_"):
+        return np.abs(np.ravel(model.coef_))
+    if hasattr(model, "feature_importances_"):
+        return model.feature_importances_
+    raise ValueError("RFE needs a model exposing coef_ or feature_importances_ "
+                     "(Linear, Ridge or SGD Regression, Decision Tree or Random Forest).")
+
+
+def _fit_score(estimator, x, y, cols, train, test, scorer) -> float:
+    estimator.fit(x[np.ix_(train, cols)], y[train])
+    return scorer(estimator, x[np.ix_(test, cols)], y[test])
+
+
+class _Search:
+    """Shared CV evaluation, plateau detection and time budget of one search."""
+
+    def __init__(self, estimator, x, y, cv, scoring, n_jobs, time_budget, patience, tol):
+        self.estimator = estimator
+        self.x, self.y = x, y
+        self.folds = list(KFold(n_splits=cv, shuffle=True, random_state=42).split(x))
+        self.scorer = get_scorer(scoring)
+        self.parallel = Parallel(n_jobs=n_jobs)
+        self.wave = 2 * effective_n_jobs(n_jobs)
+        self.deadline = time.monotonic() + time_budget
+        self.patience, self.tol = patience, tol
+        self.best_score, self.best_subset, self.subset_score, self.stale = -np.inf, [], np.nan, 0
+        self.history = []
+        self.stopped = "completed"
+
+    def out_of_time(self) -> bool:
+        if time.monotonic() >= self.deadline:
+            self.stopped = "time budget"
+            return True
+        return False
+
+    def evaluate(self, subsets: list[list[int]]) -> np.ndarray | None:
+        """Mean CV score per subset, or None if the time budget ran out mid-way."""
+        tasks = [(cols, train, test) for cols in subsets for train, test in self.folds]
+        fold_scores = []
+        start = 0
+        while start < len(tasks):                           # budget is checked between waves
+            if self.out_of_time():
+                return None
+            began = time.monotonic()
+            fold_scores += self.parallel(
+                delayed(_fit_score)(clone(self.estimator), self.x, self.y, cols, train, test, self.scorer)
+                for cols, train, test in tasks[start:start + self.wave]
+            )
+            start += self.wave
+            if time.monotonic() - began < WAVE_SECONDS:     # cheap fits: dispatch bigger waves
+                self.wave *= 2
+        return np.asarray(fold_scores).reshape(len(subsets), len(self.folds)).mean(axis=1)
+
+    def record(self, subset: list[int], score: float, action: str, feature: str) -> bool:
+        """
+        Log a step; returns False once the score has plateaued.
+
+        A subset becomes the best one if it beats the best score by ``tol``, or
+        matches it within ``tol`` with fewer features (elimination progress).
+        """
+        self.history.append({"step": len(self.history) + 1, "action": action, "feature": feature,
+                             "n_features": len(subset), "cv_score": score})
+        improved = score > self.best_score + self.tol
+        leaner = score >= self.best_score - self.tol and len(subset) < len(self.best_subset)
+        if improved or leaner:
+            self.best_score = max(self.best_score, score)
+            self.best_subset, self.subset_score, self.stale = list(subset), score, 0
+            return True
+        self.stale += 1
+        if self.stale >= self.patience:
+            self.stopped = "score plateau"
+            return False
+        return True
+
+
+def _forward(search: _Search, names: list, n_features: int | None) -> None:
+    selected, remaining = [], list(range(len(names)))
+    while remaining and len(selected) < (n_features or len(names)):
+        scores = search.evaluate([selected + [j] for j in remaining])
+        if scores is None:
+            return
+        pick = remaining.pop(int(np.argmax(scores)))
+        selected.append(pick)
+        if not search.record(selected, float(scores.max()), "add", names[pick]):
+            return
+
+
+def _backward(search: _Search, names: list, n_features: int | None) -> None:
+    selected = list(range(len(names)))
+    full = search.evaluate([selected])
+    if full is None:
+        return
+    search.record(selected, float(full[0]), "start", "all features")
+    while len(selected) > (n_features or 1):
+        scores = search.evaluate([[c for c in selected if c != j] for j in selected])
+        if scores is None:
+            return
+        drop = selected.pop(int(np.argmax(scores)))
+        if not search.record(selected, float(scores.max()), "remove", names[drop]):
+            return
+
+
+def _rfe(search: _Search, names: list, n_features: int | None, step: float = 0.1) -> None:
+    n_features = n_features or 1
+    selected = list(range(len(names)))
+    removed = "all features"
+    while True:
+        score = search.evaluate([selected])
+        if score is None:
+            return
+        if not search.record(selected, float(score[0]), "eliminate" if search.history else "start", removed):
+            return
+        if len(selected) <= n_features:
+            return
+        model = clone(search.estimator).fit(search.x[:, selected], search.y)
+        k = min(max(1, int(step * len(selected))), len(selected) - n_features)
+        weakest = set(np.argsort(_importances(model))[:k])
+        removed = ", ".join(names[selected[i]] for i in sorted(weakest))
+        selected = [c for i, c in enumerate(selected) if i not in weakest]
+
+
+_STRATEGIES = {"forward": _forward, "backward": _backward, "rfe": _rfe}
+
+
+def wrapper_select(df: pd.DataFrame, target: str, method: str = "forward", model_key: str = "linear",
+                   features: list | None = None, n_features: int | None = None, cv: int = 5,
+                   scoring: str = "r2", n_jobs: int = N_JOBS, time_budget: float = DEFAULT_TIME_BUDGET,
+                   patience: int = 3, tol: float = 1e-3, sample_rows: int = SAMPLE_ROWS) -> dict:
+    """
+    Search for a compact, well-scoring feature subset.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset (unscaled; the estimator standardises internally).
+    target : str
+        Target column.
+    method : str
+        One of ``WRAPPER_METHODS``.
+    model_key : str
+        Key of ``model_selection.available_models``.
+    features : list, optional
+        Candidate features; defaults to every numeric column except the target.
+    n_features : int, optional
+        Stop once this many features are selected (forward) or left (backward / RFE);
+        by default forward may add every feature and elimination may go down to one.
+    cv : int
+        Number of CV folds.
+    scoring : str
+        scikit-learn scorer name; higher is better.
+    n_jobs : int
+        Parallel workers for (subset × fold) fits.
+    time_budget : float
+        Wall-clock seconds for the whole search.
+    patience, tol : int, float
+        Early stop after ``patience`` steps without progress: a score gain above
+        ``tol``, or (when eliminating) a smaller subset scoring within ``tol``.
+    sample_rows : int
+        Row sample used on large data.
+
+    Returns
+    -------
+    dict
+        ``selected`` (feature names of the best subset), ``score``, ``history``
+        (DataFrame of steps), ``stopped`` (reason) and ``elapsed`` seconds.
+    """
+    if method not in _STRATEGIES:
+        raise ValueError(f"Method must be one of {', '.join(WRAPPER_METHODS)}.")
+    if model_key not in available_models():
+        raise ValueError(f"Unknown model '{model_key}'.")
+    if target not in df.columns:
+        raise ValueError(f"Target '{target}' not found.")
+    names = features or [c for c in df.select_dtypes(include="number").columns if c != target]
+    if not names:
+        raise ValueError("No candidate features.")
+
+    data = df[names + [target]].dropna(subset=[target])
+    if len(data) > sample_rows:
+        data = data.sample(n=sample_rows, random_state=42)
+    x = data[names].to_numpy(dtype=np.float64, na_value=np.nan)
+    x = np.where(np.isnan(x), np.nan_to_num(np.nanmean(x, axis=0)), x)   # mean imputation
+    y = data[target].to_numpy(dtype=np.float64)
+
+    started = time.monotonic()
+    search = _Search(_estimator(model_key), x, y, cv, scoring, n_jobs, time_budget, patience, tol)
+    _STRATEGIES[method](search, names, n_features)
+    if not search.best_subset:
+        raise ValueError("The time budget ran out before the first step finished; raise it or use fewer rows.")
+
+    return {
+        "selected": [names[i] for i in search.best_subset],
+        "score": search.subset_score,
+        "history": pd.DataFrame(search.history),
+        "stopped": search.stopped,
+        "elapsed": time.monotonic() - started,
+    }
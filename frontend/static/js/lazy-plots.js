@@ -0,0 +1,59 @@
+// Lazily render plots served by the /api/plots endpoints.
+//
+// Markup: <div class="lazy-plot" data-src="/api/plots/..." data-config='{"displayModeBar": false}'></div>
+// Figures are fetched once the placeholder scrolls into view, after the page
+// has painted; plotly.js itself is only loaded when the first plot needs it.
+// A "plot:ready" event is dispatched on the div after Plotly.newPlot.
+(() => {
+  let plotlyLoading = null;
+
+  const loadPlotly = () => {
+    if (window.Plotly) return Promise.resolve(window.Plotly);
+    if (!plotlyLoading) {
+      plotlyLoading = new Promise((resolve, reject) => {
+        const s = document.createElement("script");
+        s.src = "/api/plots/plotly.js";
+        s.onload = () => resolve(window.Plotly);
+        s.onerror = reject;
+        document.head.appendChild(s);
+      });
+    }
+    return plotlyLoading;
+  };
+
+  const render = (div) => {
+    const config = Object.assign({ responsive: true }, JSON.parse(div.dataset.config || "{}"));
+    Promise.all([fetch(div.dataset.src).then(r => r.json()), loadPlotly()])
+      .then(([fig, Plotly]) => {
+        if (fig.error) throw new Error(fig.error);
+        div.classList.remove("lazy-plot-loading");
+        return Plotly.newPlot(div, fig.data, fig.layout, config);
+      })
+      .then(() => div.dispatchEvent(new CustomEvent("plot:ready", { bubbles: true })))
+      .catch(err => {
+        const p = document.createElement("p");     // the message may quote dataset column names
+        p.className = "text-danger p-2";
+        p.textContent = `Could not load plot: ${err.message}`;
+        div.replaceChildren(p);
+      });
+  };
+
+  const init = () => {
+    const divs = document.querySelectorAll(".lazy-plot[data-src]");
+    if (!("IntersectionObserver" in window)) return divs.forEach(render);
+    const observer = new IntersectionObserver((entries) => {
+      entries.forEach((entry) => {
+        if (!entry.isIntersecting) return;
+        observer.unobserve(entry.target);
+        render(entry.target);
+      });
+    }, { rootMargin: "200px" });
+    divs.forEach(div => {
+      div.classList.add("lazy-plot-loading");
+      observer.observe(div);
+    });
+  };
+
+  if (document.readyState === "loading") document.addEventListener("DOMContentLoaded", init);
+  else init();
+})();
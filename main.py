@@ -1,5 +1,9 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from backend.utils.compression import (
+    CompressionMiddleware,
+    ConditionalGetMiddleware,
+    PrecompressedStaticFiles,
+)
 from backend.routes import root_routes
 from backend.routes.regression import (
     upload_routes,
@@ -15,13 +19,19 @@ from backend.routes.regression import (
     regression_smoothing,
     eda_dashboard,
     categories_visualisation,
+    plot_api_routes,
 )
 
 
 app = FastAPI()
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
+# Response optimisation: 304s for unchanged responses, then brotli/gzip (outermost)
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(CompressionMiddleware)
+
+# Mount static files (cached plots have content-addressed names, so they never change)
+app.mount("/static", PrecompressedStaticFiles(directory="frontend/static",
+                                              immutable_prefixes=("plots/cache/",)), name="static")
 
 # Register routers
 app.include_router(root_routes.router)
@@ -37,4 +47,5 @@ app.include_router(regression_model_selection.router)
 app.include_router(regression_predication.router)
 app.include_router(regression_smoothing.router)
 app.include_router(eda_dashboard.router)
-app.include_router(categories_visualisation.router)
\ No newline at end of file
+app.include_router(categories_visualisation.router)
+app.include_router(plot_api_routes.router)
\ No newline at end of file